@@ -1403,6 +1403,7 @@ CREATE INDEX idx_sample_details_litho 					ON log.sample_log_details 				USING b
 --operation
 CREATE INDEX idx_vessel_activities_search 				ON operation.vessel_activities 			USING btree (id_vessel, id_order, id_task, code_activity);
 CREATE INDEX idx_vessel_positions_search 				ON operation.vessel_positions 			USING btree (id_vessel, id_activity);
+CREATE INDEX idx_vessel_positions_latest 				ON operation.vessel_positions 			USING btree (id_vessel, created_at DESC);
 CREATE INDEX idx_client_deposit_histories_search 		ON operation.client_deposit_histories 	USING btree (id_client);
 CREATE INDEX idx_payment_details_search 				ON operation.payment_details 				USING btree (id_payment, doc_no);
 CREATE INDEX idx_payment_search 						ON operation.payments 					USING btree (id_client, status);
@@ -1640,4 +1641,131 @@ CREATE TRIGGER trg_generate_code_vessels BEFORE INSERT ON operation.vessels FOR
 CREATE TRIGGER trg_generate_code_order_details BEFORE INSERT ON operation.order_details FOR EACH ROW WHEN (NEW.code_task IS NULL) EXECUTE FUNCTION operation.generate_code_auto();
 CREATE TRIGGER trg_generate_code_term BEFORE INSERT ON log.term_desc FOR EACH ROW WHEN (NEW.code_term IS NULL) EXECUTE FUNCTION operation.generate_code_auto();
 CREATE TRIGGER trg_generate_code_soil BEFORE INSERT ON log.soil_desc FOR EACH ROW WHEN (NEW.code_lithology IS NULL) EXECUTE FUNCTION operation.generate_code_auto();
-CREATE TRIGGER trg_generate_code_survey BEFORE INSERT ON log.surveis FOR EACH ROW WHEN (NEW.code_survey IS NULL) EXECUTE FUNCTION operation.generate_code_auto();
\ No newline at end of file
+CREATE TRIGGER trg_generate_code_survey BEFORE INSERT ON log.surveis FOR EACH ROW WHEN (NEW.code_survey IS NULL) EXECUTE FUNCTION operation.generate_code_auto();
+
+-- Views (aggregation pushdown)
+CREATE OR REPLACE VIEW operation.v_vessel_latest_activity AS
+SELECT DISTINCT ON (id_vessel) id_vessel, seq_activity, status
+FROM operation.vessel_activities
+ORDER BY id_vessel, seq_activity DESC;
+
+-- One index probe per vessel via idx_vessel_positions_latest: cost follows fleet size, not history size
+CREATE OR REPLACE VIEW operation.v_vessel_latest_position AS
+SELECT p.id, p.id_vessel, p.id_activity, p.latitude, p.longitude, p.speed, p.heading, p.created_at
+FROM operation.vessels v
+CROSS JOIN LATERAL (
+    SELECT vp.*
+    FROM operation.vessel_positions vp
+    WHERE vp.id_vessel = v.code_vessel
+    ORDER BY vp.created_at DESC
+    LIMIT 1
+) p;
+
+CREATE OR REPLACE VIEW operation.v_payment_industries AS
+SELECT p.id_order, p.total_amount, p.payment_date, p.status, c.industry
+FROM operation.payments p
+JOIN operation.orders  o ON o.code_order  = p.id_order
+JOIN operation.clients c ON c.code_client = o.id_client;
+
+-- Function: declarative aggregation (called via PostgREST RPC from db/connection.py::sb_aggregate)
+--   p_group_by : ["status"] or [{"col": "payment_date", "trunc": "month", "as": "month"}]
+--   p_metrics  : {"alias": ["sum", "total_amount"]}  -- count, count_distinct, sum, avg, min, max
+--   p_filters  : [["status", "eq", "Completed"]]      -- eq, neq, gt, gte, lt, lte, in
+-- Only the relations listed in step 0 can be aggregated. SECURITY DEFINER with a fixed
+-- search_path (every identifier is schema-qualified), so anon keys keep working.
+CREATE OR REPLACE FUNCTION operation.aggregate_rows(
+    p_schema   TEXT,
+    p_table    TEXT,
+    p_group_by JSONB DEFAULT '[]'::jsonb,
+    p_metrics  JSONB DEFAULT '{}'::jsonb,
+    p_filters  JSONB DEFAULT '[]'::jsonb
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_select TEXT[] := '{}';
+    v_group  TEXT[] := '{}';
+    v_where  TEXT[] := '{}';
+    v_item   JSONB;
+    v_key    TEXT;
+    v_expr   TEXT;
+    v_col    TEXT;
+    v_op     TEXT;
+    v_result JSONB;
+BEGIN
+    -- 0. Whitelisted relations (the ones db/repos aggregates); anything else is refused
+    IF p_schema || '.' || p_table NOT IN (
+        'operation.clients', 'operation.orders', 'operation.payments',
+        'operation.v_payment_industries', 'operation.v_vessel_latest_activity'
+    ) THEN
+        RAISE EXCEPTION 'aggregate_rows: relation %.% is not aggregatable', p_schema, p_table;
+    END IF;
+
+    -- 1. Group keys (plain columns or date_trunc buckets)
+    FOR v_item IN SELECT * FROM jsonb_array_elements(p_group_by) LOOP
+        IF jsonb_typeof(v_item) = 'string' THEN
+            v_key  := v_item #>> '{}';
+            v_expr := format('%I', v_key);
+        ELSE
+            IF v_item->>'trunc' NOT IN ('day', 'week', 'month', 'year') THEN
+                RAISE EXCEPTION 'aggregate_rows: unsupported trunc %', v_item->>'trunc';
+            END IF;
+            v_key  := COALESCE(v_item->>'as', v_item->>'col');
+            v_expr := format('date_trunc(%L, %I)', v_item->>'trunc', v_item->>'col');
+        END IF;
+        v_select := v_select || format('%s AS %I', v_expr, v_key);
+        v_group  := v_group  || v_expr;
+    END LOOP;
+
+    -- 2. Metrics (whitelisted aggregate functions only)
+    FOR v_key, v_item IN SELECT * FROM jsonb_each(p_metrics) LOOP
+        v_col  := v_item->>1;
+        v_expr := CASE v_item->>0
+            WHEN 'count'          THEN CASE WHEN v_col IS NULL THEN 'count(*)' ELSE format('count(%I)', v_col) END
+            WHEN 'count_distinct' THEN format('count(DISTINCT %I)', v_col)
+            WHEN 'sum'            THEN format('sum(%I)', v_col)
+            WHEN 'avg'            THEN format('avg(%I)', v_col)
+            WHEN 'min'            THEN format('min(%I)', v_col)
+            WHEN 'max'            THEN format('max(%I)', v_col)
+        END;
+        IF v_expr IS NULL THEN
+            RAISE EXCEPTION 'aggregate_rows: unsupported aggregate %', v_item->>0;
+        END IF;
+        v_select := v_select || format('%s AS %I', v_expr, v_key);
+    END LOOP;
+
+    IF cardinality(v_select) = 0 THEN
+        RAISE EXCEPTION 'aggregate_rows: nothing to select';
+    END IF;
+
+    -- 3. Filters (literals are quoted, Postgres coerces them to the column type)
+    FOR v_item IN SELECT * FROM jsonb_array_elements(p_filters) LOOP
+        v_col := v_item->>0;
+        IF v_item->>1 = 'in' THEN
+            v_where := v_where || format('%I = ANY(%L)', v_col,
+                ARRAY(SELECT jsonb_array_elements_text(v_item->2)));
+            CONTINUE;
+        END IF;
+        v_op := CASE v_item->>1
+            WHEN 'eq'  THEN '='  WHEN 'neq' THEN '<>'
+            WHEN 'gt'  THEN '>'  WHEN 'gte' THEN '>='
+            WHEN 'lt'  THEN '<'  WHEN 'lte' THEN '<='
+        END;
+        IF v_op IS NULL THEN
+            RAISE EXCEPTION 'aggregate_rows: unsupported operator %', v_item->>1;
+        END IF;
+        v_where := v_where || format('%I %s %L', v_col, v_op, v_item->>2);
+    END LOOP;
+
+    -- 4. Execute, return rows as a JSON array
+    EXECUTE format(
+        'SELECT COALESCE(jsonb_agg(to_jsonb(t)), ''[]''::jsonb) FROM (SELECT %s FROM %I.%I%s%s) t',
+        array_to_string(v_select, ', '), p_schema, p_table,
+        CASE WHEN cardinality(v_where) > 0 THEN ' WHERE '    || array_to_string(v_where, ' AND ') ELSE '' END,
+        CASE WHEN cardinality(v_group) > 0 THEN ' GROUP BY ' || array_to_string(v_group, ', ')   ELSE '' END
+    ) INTO v_result;
+    RETURN v_result;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER SET search_path = pg_catalog, pg_temp;
+
+REVOKE EXECUTE ON FUNCTION operation.aggregate_rows(TEXT, TEXT, JSONB, JSONB, JSONB) FROM PUBLIC;
+GRANT  EXECUTE ON FUNCTION operation.aggregate_rows(TEXT, TEXT, JSONB, JSONB, JSONB) TO anon, authenticated, service_role;
@@ -0,0 +1 @@
+"""benchmarks — offline performance suites (fake backend + synthetic data, see db/fake.py, db/datagen.py)"""
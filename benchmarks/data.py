@@ -0,0 +1,52 @@
+"""benchmarks/data.py — deterministic datasets per scale, served through the fake backend"""
+from __future__ import annotations
+import logging
+import os
+from dataclasses import replace
+from datetime import datetime, timezone
+import streamlit as st
+from db.datagen import Spec, generate, write_parquet
+
+_BUILD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "build", "bench")
+
+# ≈ total rows across all tables; the time-series tables carry most of it
+SCALES: dict[str, Spec] = {
+    "1k":   Spec(scale=1,  position_days=1,  position_interval=60, sensor_days=2,   order_days=90),
+    "100k": Spec(scale=1,  position_days=30, position_interval=15, sensor_days=200, order_days=730),
+    "1m":   Spec(scale=10, position_days=30, position_interval=15, sensor_days=200, order_days=730),
+}
+
+
+def dataset_dir(scale: str) -> str:
+    """Parquet directory for `scale`, generated on first use.
+
+    Data is anchored at today 00:00 UTC so the repos' "last N days" windows see the
+    same rows on every run; the directory is keyed by date for that reason.
+    """
+    end  = datetime.now(timezone.utc).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+    path = os.path.join(_BUILD_DIR, f"{scale}-{end:%Y%m%d}")
+    if not os.path.isdir(path):
+        tmp = path + ".tmp"
+        os.makedirs(tmp, exist_ok=True)
+        write_parquet(generate(replace(SCALES[scale], end=end)), tmp)
+        os.replace(tmp, path)
+    return path
+
+
+def use_dataset(scale: str) -> str:
+    """Point the app at the fake backend seeded with `scale` and drop every cached value."""
+    path = dataset_dir(scale)
+    os.environ["MARINE_DB_BACKEND"] = "fake"
+    os.environ["MARINE_FAKE_SEED"]  = path
+    os.environ["MARINE_WARMUP"]     = "off"        # measure the routes, not a background prefetch
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    return path
+
+
+def quiet_streamlit() -> None:
+    """Silence the "no runtime" warnings st.cache_* print when used outside `streamlit run`."""
+    st.logger.set_log_level(logging.ERROR)             # loggers created later, e.g. by AppTest runs
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
@@ -0,0 +1,165 @@
+"""benchmarks/harness.py — measurement, baselines and regression budgets shared by the suites"""
+from __future__ import annotations
+import gc
+import json
+import os
+import resource
+import statistics
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+
+BENCH_DIR     = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR  = os.path.join(BENCH_DIR, "baselines")
+BUDGETS_FILE  = os.path.join(BENCH_DIR, "budgets.json")
+_PAGE_MB      = os.sysconf("SC_PAGE_SIZE") / 2**20 if hasattr(os, "sysconf") else 0.0
+_SAMPLE_EVERY = 0.005   # seconds between RSS samples
+
+
+@dataclass
+class Result:
+    name: str
+    wall_ms: float          # median over the timed repeats
+    wall_min_ms: float
+    rss_delta_mb: float     # peak RSS during the call minus RSS before it
+    alloc_peak_mb: float    # tracemalloc peak of one extra (untimed) run
+    allocs: int             # live blocks allocated by that run
+    repeat: int
+    error: str | None = None
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_MB
+    except OSError:   # not Linux: fall back to the process high-water mark
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _RssSampler:
+    """Background thread tracking the peak RSS while a call runs."""
+
+    def __init__(self):
+        self.base = self.peak = _rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(_SAMPLE_EVERY):
+            self.peak = max(self.peak, _rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_mb())
+
+
+def measure(name: str, fn, *, repeat: int = 5, setup=None) -> Result:
+    """Time fn() `repeat` times (setup() before each run, untimed), then one traced run."""
+    times, rss = [], 0.0
+    try:
+        for _ in range(repeat):
+            if setup:
+                setup()
+            gc.collect()
+            with _RssSampler() as s:
+                t0 = time.perf_counter()
+                fn()
+                times.append((time.perf_counter() - t0) * 1000)
+            rss = max(rss, s.peak - s.base)
+        if setup:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            blocks  = len(tracemalloc.take_snapshot().traces)
+        finally:
+            tracemalloc.stop()
+    except Exception as e:
+        return Result(name, 0.0, 0.0, 0.0, 0.0, 0, repeat, error=f"{type(e).__name__}: {e}")
+    return Result(name, round(statistics.median(times), 3), round(min(times), 3), round(rss, 2),
+                  round(peak / 2**20, 3), blocks, repeat)
+
+
+# ── Baselines & budgets ──────────────────────────────────────────────────────
+def baseline_path(suite: str, scale: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{suite}-{scale}.json")
+
+
+def load_baseline(suite: str, scale: str) -> dict[str, dict]:
+    try:
+        with open(baseline_path(suite, scale), encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(suite: str, scale: str, results: list) -> str:
+    """Merge results into the stored baseline (a filtered run keeps the other entries)."""
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path   = baseline_path(suite, scale)
+    merged = {**load_baseline(suite, scale), **{r.name: asdict(r) for r in results if r.error is None}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"suite": suite, "scale": scale,
+                   "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": merged},
+                  f, indent=2, sort_keys=True)
+        f.write("\n")
+    return path
+
+
+def load_budgets(suite: str) -> dict:
+    """{"default": {...}, "functions": {name: {...}}} for one suite; see budgets.json."""
+    with open(BUDGETS_FILE, encoding="utf-8") as f:
+        return json.load(f)[suite]
+
+
+def _budget(budgets: dict, name: str) -> dict:
+    return {**budgets.get("default", {}), **budgets.get("functions", {}).get(name, {})}
+
+
+# metric → budget key of its absolute slack
+METRICS = {"wall_ms": "wall_slack_ms", "alloc_peak_mb": "alloc_slack_mb", "rss_delta_mb": "rss_slack_mb"}
+
+
+def compare(results: list, baseline: dict[str, dict], budgets: dict, metrics: dict = METRICS) -> list[str]:
+    """Regression messages; a metric regresses when it exceeds baseline × ratio + slack."""
+    problems = []
+    for r in results:
+        if r.error:
+            problems.append(f"{r.name}: gagal — {r.error}")
+            continue
+        base = baseline.get(r.name)
+        if base is None:
+            continue
+        b = _budget(budgets, r.name)
+        for metric, slack_key in metrics.items():
+            ratio = b.get(metric)
+            if ratio is None:
+                continue
+            limit = base[metric] * ratio + b.get(slack_key, 0.0)
+            if getattr(r, metric) > limit:
+                problems.append(f"{r.name}: {metric} {getattr(r, metric):.2f} > batas {limit:.2f} "
+                                f"(baseline {base[metric]:.2f} × {ratio})")
+    return problems
+
+
+def report(results: list[Result], baseline: dict[str, dict]) -> str:
+    """Plain-text table with the change against the baseline."""
+    head = f"{'function':<58} {'wall ms':>10} {'Δ base':>8} {'rss Δ MB':>9} {'alloc MB':>9} {'blocks':>9}"
+    lines = [head, "-" * len(head)]
+    for r in results:
+        if r.error:
+            lines.append(f"{r.name:<58} ERROR {r.error}")
+            continue
+        base  = baseline.get(r.name)
+        delta = f"{(r.wall_ms / base['wall_ms'] - 1) * 100:+.0f}%" if base and base["wall_ms"] else "—"
+        lines.append(f"{r.name:<58} {r.wall_ms:>10.2f} {delta:>8} {r.rss_delta_mb:>9.2f} "
+                     f"{r.alloc_peak_mb:>9.2f} {r.allocs:>9,}")
+    return "\n".join(lines)
@@ -0,0 +1,365 @@
+"""benchmarks/load.py — concurrent-session load tester for the Streamlit server
+
+    python -m benchmarks.load                                   # 30 sessions, 60 s, spawned server @ 1k
+    python -m benchmarks.load --sessions 60 --duration 300 --scale 100k
+    python -m benchmarks.load --url ws://localhost:8501 --pid 1234   # an already running server
+
+Every simulated operator opens the app websocket (/_stcore/stream) the way the
+browser does, logs in through the login form (check_login_working), then keeps
+clicking sidebar pages picked from a weighted mix with log-normal think times in
+between. A page view is timed from the rerun request to the script_finished message.
+
+With the default spawned server (offline backend seeded per --scale, entry script
+benchmarks/load_app.py) the report also carries server CPU/RSS sampled from /proc
+and st.cache_* hit rates plus DB requests from benchmarks/probe.py. For --url
+only CPU/RSS is available, and only when --pid is given.
+
+Report: throughput, latency percentiles overall and per page, server resources and
+cache statistics; printed and written as JSON to --out.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+import httpx
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from benchmarks.data import SCALES, dataset_dir
+
+_ROOT     = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_BUILD    = os.path.join(_ROOT, "build", "bench")
+_CLK_TCK  = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_MB  = os.sysconf("SC_PAGE_SIZE") / 2**20 if hasattr(os, "sysconf") else 0.0
+_DONE     = {ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR}
+
+# sidebar label → share of clicks; Monitoring and the map dominate real traffic
+PAGE_MIX = {
+    "🏠 Monitoring":  0.35,
+    "🗺️ Peta Kapal":  0.25,
+    "🌊 Lingkungan":  0.10,
+    "📈 Analitik":    0.08,
+    "👥 Klien":       0.06,
+    "🔔 Alert":       0.06,
+    "🗓️ Voyage":      0.04,
+    "📊 KPI":         0.04,
+    "🛠️ Maintenance": 0.02,
+}
+
+
+@dataclass
+class View:
+    page: str
+    started: float          # seconds since the test started
+    latency_ms: float
+    bytes: int
+    ok: bool
+
+
+@dataclass
+class Stats:
+    views: list[View] = field(default_factory=list)
+    logins: list[float] = field(default_factory=list)
+    failures: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+# ── Streamlit websocket client ───────────────────────────────────────────────
+class Session:
+    """One browser tab: a websocket plus the widget ids seen in the last runs."""
+
+    def __init__(self, ws):
+        self.ws      = ws
+        self.widgets: dict[str, str] = {}      # label → widget id (buttons, text inputs)
+        self.errors: list[str] = []
+
+    def _collect(self, msg: ForwardMsg) -> None:
+        if msg.WhichOneof("type") != "delta" or msg.delta.WhichOneof("type") != "new_element":
+            return
+        el   = msg.delta.new_element
+        kind = el.WhichOneof("type")
+        if kind in ("button", "text_input"):
+            w = getattr(el, kind)
+            self.widgets[w.label] = w.id
+        elif kind == "alert" and el.alert.format == el.alert.ERROR:
+            self.errors.append(el.alert.body)
+
+    async def rerun(self, widget_states: list[dict] | None = None, timeout: float = 120) -> tuple[float, int, bool]:
+        """Request a script run; (latency ms, bytes received, finished ok) once it completes."""
+        back = BackMsg()
+        back.rerun_script.query_string = ""
+        for state in widget_states or []:
+            w = back.rerun_script.widget_states.widgets.add()
+            for key, value in state.items():
+                setattr(w, key, value)
+        self.errors.clear()
+        t0, size = time.perf_counter(), 0
+        await self.ws.send(back.SerializeToString())
+        async with asyncio.timeout(timeout):
+            while True:
+                raw = await self.ws.recv()
+                size += len(raw)
+                msg = ForwardMsg()
+                msg.ParseFromString(raw)
+                self._collect(msg)
+                if msg.WhichOneof("type") == "script_finished" and msg.script_finished in _DONE:
+                    ok = msg.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY
+                    return (time.perf_counter() - t0) * 1000, size, ok
+
+    def button(self, label: str) -> str | None:
+        # "🔔 Alert (3)": labels may carry a counter suffix
+        return self.widgets.get(label) or next((i for l, i in self.widgets.items() if l.startswith(label)), None)
+
+
+async def operator(n: int, args, stats: Stats, t_start: float, stop_at: float) -> None:
+    rng = random.Random(args.seed + n)
+    await asyncio.sleep(args.ramp * n / max(args.sessions, 1))
+    url = args.url.rstrip("/") + "/_stcore/stream"
+    try:
+        async with websockets.connect(url, subprotocols=["streamlit"], max_size=None,
+                                      open_timeout=args.timeout) as ws:
+            s = Session(ws)
+            await s.rerun(timeout=args.timeout)
+            user_id, pass_id, submit = s.widgets.get("Username"), s.widgets.get("Password"), s.button("🚀")
+            if not (user_id and pass_id and submit):
+                stats.failures["login_form"] += 1
+                return
+            ms, _, ok = await s.rerun([{"id": user_id, "string_value": args.user},
+                                       {"id": pass_id, "string_value": args.password},
+                                       {"id": submit,  "trigger_value": True}], timeout=args.timeout)
+            if not ok or s.button(next(iter(PAGE_MIX))) is None:
+                stats.failures["login"] += 1
+                return
+            stats.logins.append(ms)
+            pages, weights = list(PAGE_MIX), list(PAGE_MIX.values())
+            while time.perf_counter() < stop_at:
+                await asyncio.sleep(min(rng.lognormvariate(args.think_mu, args.think_sigma), args.think_max))
+                if time.perf_counter() >= stop_at:
+                    break
+                page = rng.choices(pages, weights)[0]
+                wid  = s.button(page)
+                if wid is None:
+                    stats.failures[f"nav:{page}"] += 1
+                    continue
+                started = time.perf_counter() - t_start
+                ms, size, ok = await s.rerun([{"id": wid, "trigger_value": True}], timeout=args.timeout)
+                ok = ok and not s.errors
+                stats.views.append(View(page, round(started, 3), round(ms, 2), size, ok))
+    except (OSError, TimeoutError, websockets.WebSocketException) as e:
+        stats.failures[type(e).__name__] += 1
+
+
+# ── Server side ──────────────────────────────────────────────────────────────
+def _proc_sample(pid: int) -> tuple[float, float] | None:
+    """(cpu seconds, rss MB) of a process from /proc; None when unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as f:
+            rss = int(f.read().split()[1]) * _PAGE_MB
+    except (OSError, IndexError, ValueError):
+        return None
+    return (int(fields[11]) + int(fields[12])) / _CLK_TCK, rss
+
+
+async def sample_server(pid: int | None, samples: list, every: float = 1.0) -> None:
+    if pid is None:
+        return
+    prev = _proc_sample(pid)
+    while prev is not None:
+        await asyncio.sleep(every)
+        cur = _proc_sample(pid)
+        if cur is None:
+            return
+        samples.append({"cpu_pct": round((cur[0] - prev[0]) / every * 100, 1), "rss_mb": round(cur[1], 1)})
+        prev = cur
+
+
+def spawn_server(args) -> subprocess.Popen:
+    os.makedirs(_BUILD, exist_ok=True)
+    if os.path.exists(args.probe_file):          # a previous run's counters are not this server's baseline
+        os.remove(args.probe_file)
+    env = {**os.environ, "MARINE_DB_BACKEND": "fake", "MARINE_FAKE_SEED": dataset_dir(args.scale),
+           "MARINE_LOAD_PROBE": args.probe_file}
+    log = open(os.path.join(_BUILD, "load-server.log"), "w")
+    cmd = [sys.executable, "-m", "streamlit", "run", os.path.join(_ROOT, "benchmarks", "load_app.py"),
+           "--server.headless", "true", "--server.port", str(args.port), "--server.fileWatcherType", "none",
+           "--browser.gatherUsageStats", "false", "--logger.level", "error"]
+    return subprocess.Popen(cmd, cwd=_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_healthy(base: str, proc: subprocess.Popen | None, timeout: float = 60) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"server berhenti (exit {proc.returncode}), lihat build/bench/load-server.log")
+        try:
+            if httpx.get(f"{base}/_stcore/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"server tidak siap dalam {timeout:.0f} detik: {base}")
+
+
+def read_probe(path: str) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# ── Report ───────────────────────────────────────────────────────────────────
+def _pcts(values: list[float]) -> dict:
+    if not values:
+        return {}
+    qs = statistics.quantiles(values, n=100, method="inclusive") if len(values) > 1 else values * 99
+    return {"n": len(values), "p50": round(qs[49], 1), "p90": round(qs[89], 1), "p95": round(qs[94], 1),
+            "p99": round(qs[98], 1), "max": round(max(values), 1)}
+
+
+def _cache_delta(before: dict | None, after: dict | None) -> dict | None:
+    if not after or not after.get("cache_probe"):
+        return None
+    prev  = (before or {}).get("cache", {})
+    funcs = {}
+    for name, c in after["cache"].items():
+        p = prev.get(name, {"hits": 0, "misses": 0})
+        hits, misses = c["hits"] - p["hits"], c["misses"] - p["misses"]
+        if hits or misses:
+            funcs[name] = {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 3)}
+    hits, misses = sum(f["hits"] for f in funcs.values()), sum(f["misses"] for f in funcs.values())
+    return {
+        "hits": hits, "misses": misses,
+        "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+        "db_requests": after["db_requests"] - (before or {}).get("db_requests", 0),
+        "functions": dict(sorted(funcs.items(), key=lambda kv: -kv[1]["misses"])),
+        "warmup": after.get("warmup"),
+    }
+
+
+def build_report(args, stats: Stats, elapsed: float, samples: list, cache: dict | None) -> dict:
+    window = [v for v in stats.views if v.started >= args.ramp] or stats.views
+    span   = max(elapsed - args.ramp, 1e-9) if window is not stats.views else max(elapsed, 1e-9)
+    per_page = defaultdict(list)
+    for v in stats.views:
+        per_page[v.page].append(v.latency_ms)
+    return {
+        "config": {k: v for k, v in vars(args).items() if k not in ("password",)},
+        "elapsed_s": round(elapsed, 1),
+        "sessions_logged_in": len(stats.logins),
+        "views": len(stats.views),
+        "failed_views": sum(not v.ok for v in stats.views),
+        "failures": dict(stats.failures),
+        "throughput_vps": round(len(window) / span, 2),          # page views/s after the ramp-up
+        "latency_ms": _pcts([v.latency_ms for v in stats.views]),
+        "login_ms": _pcts(stats.logins),
+        "pages": {p: _pcts(l) for p, l in sorted(per_page.items(), key=lambda kv: -len(kv[1]))},
+        "mb_per_view": round(statistics.mean(v.bytes for v in stats.views) / 2**20, 3) if stats.views else None,
+        "server": {
+            "cpu_pct_mean": round(statistics.mean(s["cpu_pct"] for s in samples), 1),
+            "cpu_pct_max":  max(s["cpu_pct"] for s in samples),
+            "rss_mb_start": samples[0]["rss_mb"],
+            "rss_mb_peak":  max(s["rss_mb"] for s in samples),
+            "rss_mb_end":   samples[-1]["rss_mb"],
+        } if samples else None,
+        "cache": cache,
+    }
+
+
+def summary(rep: dict) -> str:
+    lat, lines = rep["latency_ms"], []
+    lines.append(f"sesi login {rep['sessions_logged_in']}/{rep['config']['sessions']}  ·  "
+                 f"{rep['views']} page view ({rep['failed_views']} gagal) dalam {rep['elapsed_s']} s  ·  "
+                 f"{rep['throughput_vps']} view/s")
+    if lat:
+        lines.append(f"latensi ms  p50 {lat['p50']}  p90 {lat['p90']}  p95 {lat['p95']}  "
+                     f"p99 {lat['p99']}  max {lat['max']}")
+    head = f"{'halaman':<18} {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8}"
+    lines += ["", head, "-" * len(head)]
+    for page, p in rep["pages"].items():
+        lines.append(f"{page:<18} {p['n']:>5} {p['p50']:>8.1f} {p['p95']:>8.1f} {p['p99']:>8.1f}")
+    if rep["server"]:
+        s = rep["server"]
+        lines.append(f"\nserver CPU rata-rata {s['cpu_pct_mean']}% (maks {s['cpu_pct_max']}%)  ·  "
+                     f"RSS {s['rss_mb_start']} → puncak {s['rss_mb_peak']} MB")
+    if rep["cache"]:
+        c = rep["cache"]
+        lines.append(f"cache hit rate {c['hit_rate']}  ({c['hits']} hit / {c['misses']} miss)  ·  "
+                     f"{c['db_requests']} request DB")
+        if c.get("warmup") and c["warmup"]["boot_ms"] is not None:
+            lines.append(f"warm-up saat boot {c['warmup']['boot_ms']:,.0f} ms "
+                         f"({len(c['warmup']['tasks'])} task, {c['warmup']['workers']} worker)")
+    if rep["failures"]:
+        lines.append(f"kegagalan: {rep['failures']}")
+    return "\n".join(lines)
+
+
+async def run(args) -> dict:
+    stats, samples = Stats(), []
+    before  = read_probe(args.probe_file) if args.probe_file else None
+    t_start = time.perf_counter()
+    stop_at = t_start + args.duration
+    sampler = asyncio.create_task(sample_server(args.pid, samples))
+    await asyncio.gather(*(operator(n, args, stats, t_start, stop_at) for n in range(args.sessions)))
+    elapsed = time.perf_counter() - t_start
+    sampler.cancel()
+    if args.probe_file:
+        await asyncio.sleep(1.5)                # let the probe dump its last counters
+    cache = _cache_delta(before, read_probe(args.probe_file)) if args.probe_file else None
+    return build_report(args, stats, elapsed, samples, cache)
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.split("\n\n")[0])
+    p.add_argument("--sessions", type=int, default=30)
+    p.add_argument("--duration", type=float, default=60, help="seconds of navigation per run")
+    p.add_argument("--ramp", type=float, default=10, help="seconds over which sessions connect")
+    p.add_argument("--think-mu", type=float, default=1.5, help="log-normal think time, mean of ln(s)")
+    p.add_argument("--think-sigma", type=float, default=0.6)
+    p.add_argument("--think-max", type=float, default=30)
+    p.add_argument("--user", default="USR0001", help="synthetic datasets: USR0001 is an Admin")
+    p.add_argument("--password", default="synthetic", help="synthetic datasets use 'synthetic'")
+    p.add_argument("--scale", choices=list(SCALES), default="1k", help="dataset of the spawned server")
+    p.add_argument("--port", type=int, default=8599)
+    p.add_argument("--url", help="ws://host:port of a running server instead of spawning one")
+    p.add_argument("--pid", type=int, help="server pid for CPU/RSS sampling with --url")
+    p.add_argument("--timeout", type=float, default=120, help="seconds per script run")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--out", default=os.path.join(_BUILD, "load.json"))
+    args = p.parse_args(argv)
+
+    proc = None
+    args.probe_file = None
+    if args.url is None:
+        args.url        = f"ws://127.0.0.1:{args.port}"
+        args.probe_file = os.path.join(_BUILD, f"load-probe-{args.port}.json")
+        proc            = spawn_server(args)
+        args.pid        = proc.pid
+    try:
+        wait_healthy(args.url.replace("ws", "http", 1), proc)
+        rep = asyncio.run(run(args))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(rep, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(summary(rep))
+    print(f"\nlaporan: {args.out}")
+    return 0 if rep["sessions_logged_in"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
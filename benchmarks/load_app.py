@@ -0,0 +1,12 @@
+"""benchmarks/load_app.py — main.py with the load probe installed; the entry script the load tester serves"""
+import os
+import runpy
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:          # `streamlit run` only puts benchmarks/ on the path
+    sys.path.insert(0, _ROOT)
+
+import benchmarks.probe  # noqa: E402,F401  (installs the counters once per process)
+
+runpy.run_path(os.path.join(_ROOT, "main.py"), run_name="__main__")
@@ -0,0 +1,221 @@
+"""benchmarks/pages.py — headless page-render benchmarks for every route in main.py
+
+    python -m benchmarks.pages                                  # all routes @ 1k
+    python -m benchmarks.pages --scale 100k --only monitoring --repeat 9
+    python -m benchmarks.pages --out build/bench/pages.json    # report location
+    python -m benchmarks.pages --update-baseline
+
+Each route is driven through streamlit.testing AppTest as a logged-in Admin on the
+offline backend (benchmarks/data.py). Per route:
+
+  cold_ms / cold_db_calls   first run after st.cache_data.clear() (a cache miss)
+  warm_ms / warm_db_calls   median of the following reruns (what a click costs)
+  delta_bytes / delta_msgs  serialized ForwardMsgs of the last run, i.e. what goes to the browser
+  elements                  element counts by type in the rendered tree
+
+The report is JSON keyed by the current git commit, so runs can be archived and
+diffed per commit. Exits 1 when a route exceeds its budget in budgets.json["pages"].
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+from benchmarks.data import SCALES, quiet_streamlit, use_dataset
+from benchmarks.harness import compare, load_baseline, load_budgets, save_baseline
+from db import metrics
+from core.pages import preload
+
+SUITE    = "pages"
+_ROOT    = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SCRIPT  = os.path.join(_ROOT, "main.py")
+_METRICS = {"cold_ms": "cold_slack_ms", "warm_ms": "warm_slack_ms",
+            "warm_db_calls": "db_slack_calls", "delta_bytes": "delta_slack_bytes"}
+
+# route (render function in main_app) → current_page value that selects it
+ROUTES = {
+    "render_monitoring_view":  "🏠 Monitoring",
+    "render_environment_page": "🌊 Lingkungan",
+    "render_map_content":      "🗺️ Peta Kapal",
+    "render_analytics_page":   "📈 Analitik",
+    "render_clients_page":     "👥 Klien",
+    "render_admin_page":       "👨‍💼 Admin",
+    "render_survey_page":      "📋 Survey",
+    "render_alerts_page":      "🔔 Alert",
+    "render_voyage_page":      "🗓️ Voyage",
+    "render_maintenance_page": "🛠️ Maintenance",
+    "render_kpi_dashboard":    "📊 KPI",
+    "render_client_portal":    "🌐 Portal Klien",
+}
+
+
+@dataclass
+class PageResult:
+    name: str
+    cold_ms: float = 0.0
+    warm_ms: float = 0.0
+    cold_db_calls: int = 0
+    warm_db_calls: int = 0
+    delta_bytes: int = 0
+    delta_msgs: int = 0
+    elements: dict[str, int] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)    # st.error / st.exception shown on the page
+    repeat: int = 0
+    error: str | None = None                           # the run itself failed
+
+
+# ── Capture ──────────────────────────────────────────────────────────────────
+@contextmanager
+def _capture_deltas(sink: list):
+    """Record the ForwardMsgs AppTest parses after each run (the last run's queue)."""
+    original = LocalScriptRunner.forward_msgs
+
+    def forward_msgs(self):
+        msgs = original(self)
+        sink[:] = msgs
+        return msgs
+
+    LocalScriptRunner.forward_msgs = forward_msgs
+    try:
+        yield sink
+    finally:
+        LocalScriptRunner.forward_msgs = original
+
+
+def _count_elements(node, counts: Counter) -> Counter:
+    for child in getattr(node, "children", {}).values():
+        counts[child.type] += 1
+        _count_elements(child, counts)
+    return counts
+
+
+def _new_app(page: str, timeout: float) -> AppTest:
+    at = AppTest.from_file(_SCRIPT, default_timeout=timeout)
+    at.session_state["logged_in"]    = True
+    at.session_state["username"]     = "admin"
+    at.session_state["user_role"]    = "Admin"
+    at.session_state["current_page"] = page
+    return at
+
+
+def _timed_run(at: AppTest) -> tuple[float, int]:
+    calls = metrics.request_count()
+    t0    = time.perf_counter()
+    at.run()
+    return (time.perf_counter() - t0) * 1000, metrics.request_count() - calls
+
+
+def run_route(name: str, page: str, repeat: int, timeout: float) -> PageResult:
+    msgs: list = []
+    res = PageResult(name, repeat=repeat)
+    try:
+        with _capture_deltas(msgs):
+            st.cache_data.clear()
+            at = _new_app(page, timeout)
+            res.cold_ms, res.cold_db_calls = _timed_run(at)
+            warm = [_timed_run(at) for _ in range(repeat)]
+    except Exception as e:
+        res.error = f"{type(e).__name__}: {e}"
+        return res
+    if warm:
+        res.warm_ms       = statistics.median(w[0] for w in warm)
+        res.warm_db_calls = max(w[1] for w in warm)
+    res.cold_ms     = round(res.cold_ms, 2)
+    res.warm_ms     = round(res.warm_ms, 2)
+    res.delta_msgs  = len(msgs)
+    res.delta_bytes = sum(m.ByteSize() for m in msgs)
+    counts = Counter()
+    for root in (at.main, at.sidebar):
+        _count_elements(root, counts)
+    res.elements = dict(sorted(counts.items()))
+    res.errors   = [str(e.value) for e in (*at.exception, *at.error)]
+    return res
+
+
+# ── Report ───────────────────────────────────────────────────────────────────
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def table(results: list[PageResult], baseline: dict[str, dict]) -> str:
+    head = (f"{'route':<26} {'cold ms':>9} {'warm ms':>9} {'Δ base':>7} {'db c/w':>7} "
+            f"{'delta KB':>9} {'elements':>9} {'err':>4}")
+    lines = [head, "-" * len(head)]
+    for r in results:
+        if r.error:
+            lines.append(f"{r.name:<26} ERROR {r.error}")
+            continue
+        base  = baseline.get(r.name)
+        delta = f"{(r.warm_ms / base['warm_ms'] - 1) * 100:+.0f}%" if base and base["warm_ms"] else "—"
+        lines.append(f"{r.name:<26} {r.cold_ms:>9.1f} {r.warm_ms:>9.1f} {delta:>7} "
+                     f"{f'{r.cold_db_calls}/{r.warm_db_calls}':>7} {r.delta_bytes / 1024:>9.1f} "
+                     f"{sum(r.elements.values()):>9} {len(r.errors):>4}")
+    return "\n".join(lines)
+
+
+def write_report(path: str, runs: dict[str, list[PageResult]]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    doc = {
+        "suite":       SUITE,
+        "commit":      _git_commit(),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scales":      {scale: {r.name: asdict(r) for r in results} for scale, results in runs.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.pages", description=__doc__.split("\n\n")[0])
+    p.add_argument("--scale", nargs="+", choices=list(SCALES), default=["1k"])
+    p.add_argument("--repeat", type=int, default=5, help="warm reruns per route")
+    p.add_argument("--only", help="substring filter on route names")
+    p.add_argument("--timeout", type=float, default=120, help="seconds per script run")
+    p.add_argument("--out", default=os.path.join(_ROOT, "build", "bench", "pages.json"))
+    p.add_argument("--update-baseline", action="store_true")
+    p.add_argument("--no-fail", action="store_true", help="report regressions without exit code 1")
+    args = p.parse_args(argv)
+
+    quiet_streamlit()
+    warnings.filterwarnings("ignore", category=UserWarning, module="folium")
+    routes  = {k: v for k, v in ROUTES.items() if not args.only or args.only in k}
+    budgets = load_budgets(SUITE)
+    runs, failed = {}, False
+    for scale in args.scale:
+        use_dataset(scale)
+        _new_app(ROUTES["render_monitoring_view"], args.timeout).run()   # imports + seed load, not a route's cost
+        preload()                       # page modules load lazily; in production the warmer does this
+        results  = [run_route(name, page, args.repeat, args.timeout) for name, page in routes.items()]
+        baseline = load_baseline(SUITE, scale)
+        runs[scale] = results
+        print(f"\n== {SUITE} @ {scale} ==")
+        print(table(results, baseline))
+        if args.update_baseline:
+            print(f"baseline disimpan: {save_baseline(SUITE, scale, results)}")
+            continue
+        problems = compare(results, baseline, budgets, _METRICS)
+        for msg in problems:
+            print(f"REGRESI {msg}")
+        failed |= bool(problems)
+    write_report(args.out, runs)
+    print(f"\nlaporan: {args.out}")
+    return 1 if failed and not args.no_fail else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""benchmarks/probe.py — server-side counters for the load tester (imported by benchmarks/load_app.py)
+
+Counts st.cache_data / st.cache_resource hits and misses per function and the
+number of DB requests, and dumps them as JSON to $MARINE_LOAD_PROBE every second.
+Installed once per process; Streamlit re-runs the entry script but keeps this module.
+"""
+from __future__ import annotations
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from db import metrics
+
+logger = logging.getLogger(__name__)
+
+_DUMP_EVERY = 1.0
+
+_lock  = threading.Lock()
+_cache: dict[str, list[int]] = defaultdict(lambda: [0, 0])     # qualname → [hits, misses]
+
+
+def _patch_cached_func() -> bool:
+    """Wrap CachedFunc's hit/miss handlers; False when this Streamlit lacks them."""
+    try:
+        from streamlit.runtime.caching.cache_utils import CachedFunc
+        hit, miss = CachedFunc._handle_cache_hit, CachedFunc._handle_cache_miss
+    except (ImportError, AttributeError):
+        logger.warning("probe: CachedFunc tidak dikenali, hit rate cache tidak tersedia")
+        return False
+
+    def _name(self) -> str:
+        fn = self._info.func
+        return f"{fn.__module__}.{fn.__qualname__}"
+
+    def handle_hit(self, *args, **kwargs):
+        with _lock:
+            _cache[_name(self)][0] += 1
+        return hit(self, *args, **kwargs)
+
+    def handle_miss(self, *args, **kwargs):
+        with _lock:
+            _cache[_name(self)][1] += 1
+        return miss(self, *args, **kwargs)
+
+    CachedFunc._handle_cache_hit  = handle_hit
+    CachedFunc._handle_cache_miss = handle_miss
+    return True
+
+
+def snapshot() -> dict:
+    with _lock:
+        cache = {k: {"hits": h, "misses": m} for k, (h, m) in _cache.items()}
+    warmup = sys.modules.get("core.services.warmup")    # imported by main.py on the first run
+    return {"ts": time.time(), "pid": os.getpid(), "cache_probe": _patched,
+            "db_requests": metrics.request_count(), "cache": cache,
+            "warmup": warmup.warmup_stats() if warmup else None}
+
+
+def _dump_loop(path: str) -> None:
+    while True:
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot(), f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.error("probe: gagal menulis %s: %s", path, e)
+        time.sleep(_DUMP_EVERY)
+
+
+_patched = _patch_cached_func()
+if os.environ.get("MARINE_LOAD_PROBE"):
+    threading.Thread(target=_dump_loop, args=(os.environ["MARINE_LOAD_PROBE"],),
+                     name="load-probe", daemon=True).start()
@@ -0,0 +1,140 @@
+"""benchmarks/repos.py — micro-benchmarks for db/repos/*.py and core/services/analytics.py
+
+    python -m benchmarks.repos                       # 1k + 100k, compare with baselines
+    python -m benchmarks.repos --scale 1m --only fleet
+    python -m benchmarks.repos --update-baseline     # record new baselines after an intended change
+
+Repo functions run against the fake backend seeded per scale (benchmarks/data.py). Before
+each timed run every cache layer of the function (L1 and the L2 disk cache) is cleared, so
+the number is a cold call with warm dependencies (dims, position store), as on a real
+cache miss; a @reads function without a cache layer to clear is an error, not a silent
+hit timing.
+Exits 1 when a function exceeds its budget in budgets.json.
+"""
+from __future__ import annotations
+import argparse
+import importlib
+import inspect
+import pkgutil
+import sys
+import numpy as np
+import pandas as pd
+from benchmarks.data import SCALES, quiet_streamlit, use_dataset
+from benchmarks.harness import Result, compare, load_baseline, load_budgets, measure, report, save_baseline
+from db.invalidation import _layers, tables_read
+
+SUITE = "repos"
+
+_WRITE_PREFIXES = ("create_", "update_", "delete_", "invalidate_")   # mutate the dataset; see load tests
+_ARGS = {
+    "db.repos.fleet.get_path_vessel":    ("VSL0001",),
+    "db.repos.environ.get_buoy_history": ("BY0001",),
+}
+_ROWS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def _origin(obj):
+    while hasattr(obj, "__wrapped__"):
+        obj = obj.__wrapped__
+    return obj
+
+
+def repo_cases() -> dict[str, tuple]:
+    """name → (fn, args) for every public read function defined in db/repos/*.py."""
+    import db.repos
+    cases = {}
+    for info in pkgutil.iter_modules(db.repos.__path__):
+        module = importlib.import_module(f"db.repos.{info.name}")
+        for name, obj in vars(module).items():
+            fn = _origin(obj)
+            if (name.startswith("_") or name.startswith(_WRITE_PREFIXES) or not inspect.isfunction(fn)
+                    or fn.__module__ != module.__name__):
+                continue
+            key = f"{module.__name__}.{name}"
+            required = [p for p in inspect.signature(fn).parameters.values() if p.default is p.empty]
+            if required and key not in _ARGS:
+                continue
+            cases[key] = (obj, _ARGS.get(key, ()))
+    return dict(sorted(cases.items()))
+
+
+def analytics_cases(scale: str) -> dict[str, tuple]:
+    """Inputs sized to the scale's row count, deterministic."""
+    from core.services import analytics
+    n   = _ROWS[scale]
+    rng = np.random.default_rng(7)
+    revenue = pd.DataFrame({
+        "month":   pd.date_range("2020-01-01", periods=n, freq="min"),
+        "revenue": rng.normal(5e8, 1e8, n).round(0),
+    })
+    numeric = pd.DataFrame(rng.normal(size=(n, 6)), columns=list("abcdef"))
+    clients = pd.DataFrame({"churn_risk": rng.choice(["Rendah", "Menengah", "Tinggi"], n)})
+    fleet   = {"total_vessels": 14, "maintenance": 5}
+    fin     = {"total_revenue": 1e9}
+    return {
+        "core.services.analytics.calculate_advanced_forecast": (analytics.calculate_advanced_forecast, (revenue, 6)),
+        "core.services.analytics.calculate_moving_average":    (analytics.calculate_moving_average, (revenue, "revenue", 3)),
+        "core.services.analytics.calculate_correlation":       (analytics.calculate_correlation, (numeric,)),
+        "core.services.analytics.generate_insights":           (analytics.generate_insights,
+                                                                (fleet, fin, "Admin", {}, clients)),
+    }
+
+
+def run_scale(scale: str, repeat: int, only: str | None) -> list[Result]:
+    use_dataset(scale)
+    cases = {**repo_cases(), **analytics_cases(scale)}
+    if only:
+        cases = {k: v for k, v in cases.items() if only in k}
+    for fn, args in cases.values():       # warm-up: loads the fake DB, dims, position store
+        try:
+            fn(*args)
+        except Exception:
+            pass
+    results = []
+    for name, (fn, args) in cases.items():
+        results.append(measure(name, lambda fn=fn, args=args: fn(*args), repeat=repeat, setup=_cold(name, fn)))
+    return results
+
+
+def _cold(name: str, fn):
+    """Setup clearing every cache layer of a cached (@reads) function; None when uncached."""
+    if not tables_read(name):                  # analytics, @typed-only repos: every call is cold
+        return None
+    clears = _layers(fn)
+    if not clears:
+        raise RuntimeError(f"{name}: tidak ada lapisan cache untuk dikosongkan, hasil akan mengukur cache hit")
+
+    def setup() -> None:
+        for clear in clears:
+            clear()
+    return setup
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.repos", description=__doc__.split("\n\n")[0])
+    p.add_argument("--scale", nargs="+", choices=list(SCALES), default=["1k", "100k"])
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--only", help="substring filter on function names")
+    p.add_argument("--update-baseline", action="store_true")
+    p.add_argument("--no-fail", action="store_true", help="report regressions without exit code 1")
+    args = p.parse_args(argv)
+
+    quiet_streamlit()
+    budgets, failed = load_budgets(SUITE), False
+    for scale in args.scale:
+        results  = run_scale(scale, args.repeat, args.only)
+        baseline = load_baseline(SUITE, scale)
+        print(f"\n== {SUITE} @ {scale} ==")
+        print(report(results, baseline))
+        if args.update_baseline:
+            print(f"baseline disimpan: {save_baseline(SUITE, scale, results)}")
+            continue
+        problems = compare(results, baseline, budgets)
+        for msg in problems:
+            print(f"REGRESI {msg}")
+        failed |= bool(problems)
+    return 1 if failed and not args.no_fail else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""core/assets.py — static asset registry for assets/css, assets/html and assets/static
+
+Every stylesheet, HTML template and JS plugin is read and minified once per process
+into an immutable registry keyed by its path under assets/ ("css/style.css",
+"html/vessel_card.html", "static/MovingMarker.js"); each entry carries a content hash.
+
+JS plugins are not inlined into every map: static_url() publishes a fingerprinted copy
+(static/MovingMarker.<hash>.js next to main.py) which Streamlit serves at /app/static/
+when server.enableStaticServing is on. A new file content gets a new URL, so the
+browser can cache the old one for as long as it likes.
+"""
+from __future__ import annotations
+import functools
+import hashlib
+import logging
+import os
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+_ROOT       = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ASSET_DIR  = os.path.join(_ROOT, "assets")
+_STATIC_DIR = os.path.join(_ROOT, "static")           # Streamlit's app static folder (next to main.py)
+_FOLDERS    = ("css", "html", "static")
+_KINDS      = {".css": "css", ".html": "html", ".js": "js"}
+
+_WS          = re.compile(r"\s+")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_PUNCT   = re.compile(r"\s*([{};,>])\s*")
+
+
+@dataclass(frozen=True)
+class Asset:
+    path: str           # relative to assets/
+    text: str           # minified content
+    digest: str         # sha1 of the file on disk, 10 hex chars
+    raw_bytes: int
+
+    @property
+    def fingerprinted(self) -> str:
+        """File name with the content hash, e.g. MovingMarker.3f2a9c01de.js."""
+        stem, ext = os.path.splitext(os.path.basename(self.path))
+        return f"{stem}.{self.digest}{ext}"
+
+
+def _minify(kind: str, text: str) -> str:
+    if kind == "css":
+        text = _WS.sub(" ", _CSS_COMMENT.sub("", text))
+        return _CSS_PUNCT.sub(r"\1", text).replace(";}", "}").strip()
+    if kind == "html":
+        return _WS.sub(" ", text).strip()
+    return text         # JS verbatim: collapsing lines would break // comments and ASI
+
+
+@functools.lru_cache(maxsize=1)
+def registry() -> Mapping[str, Asset]:
+    """All assets, loaded on the first call and never re-read (restart to pick up edits)."""
+    assets: dict[str, Asset] = {}
+    for folder in _FOLDERS:
+        directory = os.path.join(_ASSET_DIR, folder)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            kind = _KINDS.get(os.path.splitext(name)[1].lower())
+            if kind is None:
+                continue
+            with open(os.path.join(directory, name), "rb") as f:
+                raw = f.read()
+            path = f"{folder}/{name}"
+            assets[path] = Asset(path, _minify(kind, raw.decode("utf-8")),
+                                 hashlib.sha1(raw).hexdigest()[:10], len(raw))
+    logger.info("aset statis dimuat: %d file", len(assets))
+    return MappingProxyType(assets)
+
+
+def text(path: str) -> str:
+    """Minified content of an asset, "" when it does not exist."""
+    asset = registry().get(path)
+    return asset.text if asset is not None else ""
+
+
+@functools.lru_cache(maxsize=None)
+def static_url(path: str) -> str | None:
+    """URL of the fingerprinted copy under /app/static/, None when static serving is unavailable.
+
+    Callers fall back to inlining text(path) on None (static serving off, read-only
+    deploy, unknown asset).
+    """
+    asset = registry().get(path)
+    if asset is None or not st.get_option("server.enableStaticServing"):
+        return None
+    target = os.path.join(_STATIC_DIR, asset.fingerprinted)
+    try:
+        if not os.path.exists(target):
+            os.makedirs(_STATIC_DIR, exist_ok=True)
+            tmp = f"{target}.{os.getpid()}.tmp"       # several workers may publish at once
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(asset.text)
+            os.replace(tmp, target)
+    except OSError as e:
+        logger.warning("aset %s tidak bisa dipublikasikan: %s", path, e)
+        return None
+    base = (st.get_option("server.baseUrlPath") or "").strip("/")
+    return f"/{base}/app/static/{asset.fingerprinted}" if base else f"/app/static/{asset.fingerprinted}"
+
+
+def asset_stats() -> list[dict]:
+    """Per asset: size on disk, size served and content hash."""
+    return [{"path": a.path, "raw_bytes": a.raw_bytes, "bytes": len(a.text.encode("utf-8")), "digest": a.digest}
+            for a in registry().values()]
@@ -1,5 +1,6 @@
-import os
+import functools
 import streamlit as st
+from core import assets
 
 # ── Role constants ────────────────────────────────────────────────────────────
 ROLE_ADMIN      = "Admin"
@@ -10,28 +11,22 @@ ROLE_CLIENT     = "Client"
 
 ALL_ROLES = [ROLE_ADMIN, ROLE_OPERATIONS, ROLE_MARCOM, ROLE_FINANCE, ROLE_CLIENT]
 
-# ── Asset paths ───────────────────────────────────────────────────────────────
-_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-_CSS_DIR  = os.path.join(_BASE_DIR, "assets", "css")
-_HTML_DIR = os.path.join(_BASE_DIR, "assets", "html")
+# ── Global styles ─────────────────────────────────────────────────────────────
+_CSS_FILES = ["style.css", "loader.css", "map_style.css", "map.css", "global.css"]
 
 
-def _load_css(filename: str) -> str:
-    """Read a CSS file from assets/css/ and return its content."""
-    path = os.path.join(_CSS_DIR, filename)
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
-        return ""
+@functools.lru_cache(maxsize=1)
+def _global_css() -> str:
+    """All global stylesheets, minified and concatenated once per process (core/assets.py)."""
+    return "".join(assets.text(f"css/{f}") for f in _CSS_FILES)
 
 
 def inject_custom_css():
     """
     Inject all global CSS stylesheets into the Streamlit page.
-    Call once per render cycle (it is idempotent via Streamlit's markdown cache).
+    Call exactly once per run (main.py): Streamlit drops elements a rerun does not
+    emit again, so the style block has to be part of every run, but only once.
     """
-    css_files = ["style.css", "loader.css", "map_style.css", "map.css", "global.css"]
-    combined  = "\n".join(_load_css(f) for f in css_files)
-    if combined.strip():
+    combined = _global_css()
+    if combined:
         st.markdown(f"<style>{combined}</style>", unsafe_allow_html=True)
@@ -0,0 +1,83 @@
+"""core/pages.py — page registry: sidebar menu and lazy routing for main.py
+
+Every page is a (module, function) pair imported on its first visit, so a cold start
+only pays for the login page and the page the user opens (folium, plotly.express,
+altair and core.ui.maps stay unloaded until a page needs them). The registry is the
+single source of the menu order and the roles that see each entry.
+"""
+from __future__ import annotations
+import functools
+import importlib
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from core.config import ROLE_ADMIN, ROLE_OPERATIONS, ROLE_MARCOM, ROLE_FINANCE
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Page:
+    """One route: label (also the current_page value), render function, who sees it in the menu."""
+    label: str
+    module: str
+    func: str
+    roles: tuple[str, ...] | None = None     # None = every role
+    in_menu: bool = True
+
+
+_OPS      = (ROLE_ADMIN, ROLE_OPERATIONS)
+_BUSINESS = (ROLE_ADMIN, ROLE_MARCOM, ROLE_FINANCE)
+
+# menu order
+PAGES: tuple[Page, ...] = (
+    Page("🏠 Monitoring",   "core.views.monitoring",    "render_monitoring_view"),
+    Page("🌊 Lingkungan",   "core.views.environment",   "render_environment_page"),
+    Page("🗺️ Peta Kapal",  "core.ui.maps",             "render_map_content",      _OPS),
+    Page("🗓️ Voyage",      "core.views.voyage",        "render_voyage_page",      _OPS),
+    Page("🛠️ Maintenance", "core.views.maintenance",   "render_maintenance_page", _OPS),
+    Page("📋 Survey",       "core.views.survey",        "render_survey_page",      _OPS),
+    Page("👥 Klien",        "core.views.clients",       "render_clients_page",     _BUSINESS),
+    Page("📈 Analitik",     "core.views.analytics",     "render_analytics_page",   _BUSINESS),
+    Page("📊 KPI",          "core.views.kpi_dashboard", "render_kpi_dashboard",    _BUSINESS),
+    Page("👨‍💼 Admin",      "core.views.admin",         "render_admin_page",       (ROLE_ADMIN,)),
+    Page("🔔 Alert",        "core.views.alerts",        "render_alerts_page"),
+    Page("🌐 Portal Klien", "core.views.client_portal", "render_client_portal",    in_menu=False),
+)
+_BY_LABEL = {p.label: p for p in PAGES}
+
+
+@functools.lru_cache(maxsize=None)
+def menu_for(role: str | None) -> tuple[str, ...]:
+    """Labels of the sidebar entries visible to role, in menu order."""
+    return tuple(p.label for p in PAGES if p.in_menu and (p.roles is None or role in p.roles))
+
+
+def _view(page: Page):
+    if page.module not in sys.modules:
+        t0 = time.perf_counter()
+        module = importlib.import_module(page.module)
+        logger.info("halaman %s dimuat dalam %.0f ms", page.label, (time.perf_counter() - t0) * 1000)
+    else:
+        module = sys.modules[page.module]
+    return getattr(module, page.func)
+
+
+def render_page(label: str) -> bool:
+    """Import (first visit only) and render the page; False for an unknown label."""
+    page = _BY_LABEL.get(label)
+    if page is None:
+        return False
+    _view(page)()
+    return True
+
+
+def preload() -> int:
+    """Import every page module not loaded yet; returns how many were imported."""
+    loaded = 0
+    for page in PAGES:
+        if page.module not in sys.modules:
+            _view(page)
+            loaded += 1
+    return loaded
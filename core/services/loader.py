@@ -0,0 +1,130 @@
+"""core/services/loader.py — shared async data loader (declared needs, per-task deadlines, partial results)
+
+A need's deadline starts when its call starts running on the shared pool; time spent
+waiting for a worker is bounded separately by the same deadline (the queued call is
+then cancelled and never runs). Each load() runs at most MARINE_LOADER_FANOUT needs at
+once, so one session cannot take the whole pool, and a need whose previous call is
+still running past its deadline is not submitted again until that call returns.
+
+    MARINE_LOADER_WORKERS  shared worker threads (default 32)
+    MARINE_LOADER_FANOUT   concurrent needs per load() call (default 4)
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+logger = logging.getLogger(__name__)
+
+_WORKERS = int(os.environ.get("MARINE_LOADER_WORKERS", 32))
+_FANOUT  = int(os.environ.get("MARINE_LOADER_FANOUT", 4))
+
+
+@dataclass
+class Need:
+    """One data dependency of a page: fn(*args), with a fallback and a deadline (s)."""
+    fn: Callable[..., Any]
+    args: tuple = ()
+    default: Any = None
+    deadline: float = 15.0
+
+
+@dataclass
+class LoadResult:
+    data: dict[str, Any]
+    missing: list[str] = field(default_factory=list)   # keys that timed out or failed
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+
+class _Skipped(Exception):
+    """The need was not run: it queued past its deadline, or its previous call is stuck."""
+
+
+class _Engine:
+    """Event loop on a daemon thread plus a bounded worker pool, shared by all sessions."""
+
+    def __init__(self):
+        self.loop  = asyncio.new_event_loop()
+        self.pool  = ThreadPoolExecutor(max_workers=max(_WORKERS, 1), thread_name_prefix="loader")
+        self.stuck: set = set()            # (fn, args) still running past their deadline
+        threading.Thread(target=self.loop.run_forever, name="loader-loop", daemon=True).start()
+
+
+@st.cache_resource
+def _engine() -> _Engine:
+    return _Engine()
+
+
+async def _run(engine: _Engine, need: Need, ctx, slots: asyncio.Semaphore) -> Any:
+    loop = asyncio.get_running_loop()
+    key  = (need.fn, need.args)
+    if key in engine.stuck:
+        raise _Skipped("panggilan sebelumnya masih berjalan")
+    started = asyncio.Event()
+
+    def _call():
+        loop.call_soon_threadsafe(started.set)
+        # Workers inherit the caller's script context (st.cache_data, secrets, ...).
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return need.fn(*need.args)
+
+    queued_until = loop.time() + need.deadline
+    try:
+        await asyncio.wait_for(slots.acquire(), timeout=need.deadline)
+    except asyncio.TimeoutError:
+        raise _Skipped("antrean melewati deadline") from None
+    try:
+        job = engine.pool.submit(_call)
+        try:
+            await asyncio.wait_for(started.wait(), timeout=max(queued_until - loop.time(), 0))
+        except asyncio.TimeoutError:
+            if job.cancel():
+                raise _Skipped("antrean melewati deadline") from None
+        # the deadline counts from here, when a worker is actually running the call
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job), timeout=need.deadline)
+        except asyncio.TimeoutError:
+            engine.stuck.add(key)          # a thread can't be stopped: keep it from being stacked up
+            job.add_done_callback(lambda _: engine.stuck.discard(key))
+            raise
+    finally:
+        slots.release()
+
+
+async def _gather(engine: _Engine, needs: dict[str, Need], ctx) -> LoadResult:
+    keys    = list(needs)
+    slots   = asyncio.Semaphore(max(_FANOUT, 1))
+    outcome = await asyncio.gather(*(_run(engine, needs[k], ctx, slots) for k in keys),
+                                   return_exceptions=True)
+    result = LoadResult(data={})
+    for key, value in zip(keys, outcome):
+        if isinstance(value, BaseException):
+            reason = "timeout" if isinstance(value, asyncio.TimeoutError) else value
+            logger.error("Gagal saat memuat data bagian [%s]: %s", key, reason)
+            result.data[key] = needs[key].default
+            result.missing.append(key)
+        else:
+            result.data[key] = value
+    return result
+
+
+def load(needs: dict[str, Need]) -> LoadResult:
+    """Run needs concurrently (up to _FANOUT at a time); partial results once every deadline is met or hit."""
+    if not needs:
+        return LoadResult(data={})
+    engine = _engine()
+    future = asyncio.run_coroutine_threadsafe(
+        _gather(engine, needs, get_script_run_ctx()), engine.loop)
+    # worst case: a need queues for its whole deadline, then runs for it
+    return future.result(timeout=2 * max(n.deadline for n in needs.values()) + 1)
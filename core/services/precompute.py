@@ -0,0 +1,29 @@
+"""core/services/precompute.py — cached derived artifacts shared by the views and the warm-up job"""
+import pandas as pd
+import streamlit as st
+from db.invalidation import reads
+from db.repos.environ import get_data_water
+from db.repos.finance import get_revenue_analysis
+from core.services.analytics import calculate_advanced_forecast
+
+
+@reads("operation.payments")
+@st.cache_data(ttl=300)
+def revenue_forecast(months: int = 6) -> pd.DataFrame:
+    """Linear revenue forecast over get_revenue_analysis(), computed once per TTL for all sessions."""
+    rev = get_revenue_analysis()
+    if rev.empty:
+        return pd.DataFrame()
+    rev["revenue"] = rev["revenue"].astype(float)
+    return calculate_advanced_forecast(rev, months=months)
+
+
+@reads("ocean.buoy_sensor_histories", "ocean.buoys", "operation.sites")
+@st.cache_data(ttl=300)
+def water_daily_means(param: str) -> dict:
+    """{UTC date: daily mean of param} over get_data_water() — the calendar heatmap's input."""
+    df = get_data_water()
+    if df.empty or param not in df.columns:
+        return {}
+    values = df[param].astype("float64")
+    return values.groupby(df["latest_timestamp"].dt.date).mean().dropna().to_dict()
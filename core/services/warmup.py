@@ -0,0 +1,194 @@
+"""core/services/warmup.py — startup cache warmer and scheduled precompute job
+
+At server start the hot repo queries and derived artifacts are fetched in background
+threads, highest priority first, so the first login lands on warm caches. Tasks with
+``every`` are re-run on that period (just past their cache TTL) so the refresh miss is
+paid here instead of by a user — but only while somebody reads the key: a task whose
+function was not called with its args outside the warm-up within MARINE_WARMUP_IDLE
+seconds is skipped, so an idle server puts no load on the database.
+
+    MARINE_WARMUP          "off" disables the job (default on)
+    MARINE_WARMUP_WORKERS  concurrent tasks (default 4)
+    MARINE_WARMUP_MAX_PRIO run only tasks with priority <= this (default 2 = all)
+    MARINE_WARMUP_IDLE     re-warm only keys requested within this many seconds (default 900)
+
+Timings are exposed through warmup_stats() (admin Performance tab, load-test probe).
+"""
+from __future__ import annotations
+import heapq
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+import streamlit as st
+from db.disk_cache import warm_start
+from db.repos.client import get_clients_summary, get_client_reliability_scoring
+from db.repos.environ import (
+    get_data_water, get_buoy_fleet, get_environmental_anomalies, get_environmental_compliance_dashboard,
+)
+from db.repos.finance import (
+    get_financial_metrics, get_order_stats, get_revenue_analysis, get_revenue_cycle_metrics,
+)
+from db.repos.fleet import (
+    get_fleet_status, get_vessel_position, get_operational_anomalies, get_fleet_daily_activity,
+    get_vessel_utilization_stats, get_logistics_performance,
+)
+from db.repos.settings import get_system_settings
+from db.invalidation import last_requested
+from core.services.precompute import revenue_forecast, water_daily_means
+from core.pages import preload
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Task:
+    """One warm-up job: fn(*args). Lower priority runs first; every=None runs at boot only."""
+    name: str
+    fn: Callable[..., Any]
+    args: tuple = ()
+    priority: int = 1
+    every: float | None = None
+
+
+@dataclass
+class TaskStats:
+    name: str
+    priority: int
+    runs: int = 0
+    skipped: int = 0            # scheduled rounds left out because nobody read the key
+    errors: int = 0
+    last_ms: float = 0.0
+    total_ms: float = 0.0
+    last_run: float | None = None
+    last_error: str | None = None
+
+
+# 0 = the landing page (monitoring) · 1 = other pages and derived artifacts
+# 2 = slow reports and the imports of page modules nobody has opened yet
+TASKS: list[Task] = [
+    Task("fleet_status",        get_fleet_status,           priority=0, every=61),
+    Task("vessel_position",     get_vessel_position,        priority=0, every=31),
+    Task("clients_summary",     get_clients_summary,        priority=0, every=301),
+    Task("revenue_cycle",       get_revenue_cycle_metrics,  priority=0),   # swr refreshes itself
+    Task("financial_metrics",   get_financial_metrics,      priority=0, every=301),
+    Task("order_stats",         get_order_stats,            priority=0, every=301),
+    Task("system_settings",     get_system_settings,        priority=0, every=61),
+    Task("operational_anomaly", get_operational_anomalies,  priority=0, every=61),
+    Task("fleet_daily",         get_fleet_daily_activity,   priority=0, every=301),
+    Task("data_water",          get_data_water,             priority=1, every=61),
+    Task("revenue_analysis",    get_revenue_analysis,       priority=1),
+    Task("revenue_forecast",    revenue_forecast, (6,),     priority=1, every=301),
+    Task("environ_anomaly",     get_environmental_anomalies, priority=1, every=301),
+    Task("buoy_fleet",          get_buoy_fleet,             priority=1),
+    *[Task(f"heatmap_{p}",      water_daily_means, (p,),    priority=1, every=301)
+      for p in ("salinitas", "turbidity", "oxygen", "current", "tide", "density")],
+    Task("utilization",         get_vessel_utilization_stats, priority=2),
+    Task("logistics",           get_logistics_performance,  priority=2),
+    Task("client_reliability",  get_client_reliability_scoring, priority=2),
+    Task("env_compliance",      get_environmental_compliance_dashboard, priority=2),
+    Task("page_modules",        preload,                    priority=2),   # views not visited yet
+]
+
+
+class Warmer:
+    """Runs TASKS once at boot (priority order, bounded pool), then on their schedules."""
+
+    def __init__(self, tasks: list[Task], workers: int, idle: float = 900):
+        self.tasks   = tasks
+        self.workers = max(workers, 1)
+        self.idle    = idle
+        self.pool    = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="warmup")
+        self._lock   = threading.Lock()
+        self._stats  = {t.name: TaskStats(t.name, t.priority) for t in tasks}
+        self._busy: set[str] = set()
+        self.boot_ms: float | None = None
+        self.l2_restored = 0
+
+    def _run(self, task: Task) -> None:
+        with self._lock:
+            if task.name in self._busy:         # previous round still fetching: skip, don't pile up
+                return
+            self._busy.add(task.name)
+        t0 = time.perf_counter()
+        error = None
+        try:
+            task.fn(*task.args)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.warning("warm-up %s gagal: %s", task.name, e)
+        ms = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self._busy.discard(task.name)
+            s = self._stats[task.name]
+            s.runs    += 1
+            s.last_ms  = round(ms, 1)
+            s.total_ms = round(s.total_ms + ms, 1)
+            s.last_run = time.time()
+            if error:
+                s.errors    += 1
+                s.last_error = error
+
+    def _wanted(self, task: Task) -> bool:
+        """Whether a user read task.fn(*task.args) within the last `idle` seconds."""
+        last = last_requested(f"{task.fn.__module__}.{task.fn.__qualname__}", task.args)
+        return last is not None and time.monotonic() - last <= self.idle
+
+    def boot(self) -> None:
+        t0 = time.perf_counter()
+        self.l2_restored = warm_start()
+        # one priority level at a time: level 0 is warm before level 1 starts competing for the DB
+        for prio in sorted({t.priority for t in self.tasks}):
+            wait([self.pool.submit(self._run, t) for t in self.tasks if t.priority == prio])
+        self.boot_ms = round((time.perf_counter() - t0) * 1000, 1)
+        logger.info("warm-up selesai: %d task dalam %.0f ms (L2: %d key)",
+                    len(self.tasks), self.boot_ms, self.l2_restored)
+
+    def schedule(self) -> None:
+        now   = time.monotonic()
+        queue = [(now + t.every, i) for i, t in enumerate(self.tasks) if t.every]
+        heapq.heapify(queue)
+        while queue:
+            due, i = heapq.heappop(queue)
+            time.sleep(max(due - time.monotonic(), 0))
+            task = self.tasks[i]
+            if self._wanted(task):
+                self.pool.submit(self._run, task)
+            else:
+                with self._lock:
+                    self._stats[task.name].skipped += 1
+            heapq.heappush(queue, (max(due + task.every, time.monotonic()), i))
+
+    def start(self) -> None:
+        def main():
+            self.boot()
+            self.schedule()
+        threading.Thread(target=main, name="warmup", daemon=True).start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            tasks = [asdict(s) for s in self._stats.values()]
+        return {"boot_ms": self.boot_ms, "l2_restored": self.l2_restored, "workers": self.workers,
+                "tasks": sorted(tasks, key=lambda s: (s["priority"], s["name"]))}
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmer() -> Warmer | None:
+    """Start the process-wide warm-up job once; None when disabled."""
+    if os.environ.get("MARINE_WARMUP", "on").strip().lower() in ("off", "0", "false"):
+        return None
+    max_prio = int(os.environ.get("MARINE_WARMUP_MAX_PRIO", 2))
+    warmer   = Warmer([t for t in TASKS if t.priority <= max_prio],
+                      int(os.environ.get("MARINE_WARMUP_WORKERS", 4)),
+                      float(os.environ.get("MARINE_WARMUP_IDLE", 900)))
+    warmer.start()
+    return warmer
+
+
+def warmup_stats() -> dict | None:
+    """Boot duration and per-task timings and skips of the running warm-up job (None when off)."""
+    warmer = start_warmer()
+    return warmer.stats() if warmer is not None else None
@@ -1,8 +1,12 @@
 """core/services/weather.py — OpenWeather API Integration"""
 import streamlit as st
+import pandas as pd
 import random
 from typing import Dict, Any
 
+WEATHER_GRID_DEG = 0.25     # one forecast cell (~28 km); vessels in the same cell share a lookup
+_WEATHER_FIELDS  = ["condition", "icon", "temperature", "wind_speed", "wind_deg", "wave_height"]
+
 
 @st.cache_data(ttl=900)
 def get_vessel_weather(lat: float, lon: float) -> Dict[str, Any]:
@@ -27,3 +31,17 @@ def get_vessel_weather(lat: float, lon: float) -> Dict[str, Any]:
         "wind_deg": random.randint(0, 359),
         "wave_height": round(random.uniform(0.5, 3.5), 1) # meters
     }
+
+
+def fleet_weather(lat: pd.Series, lon: pd.Series) -> pd.DataFrame:
+    """
+    Weather for many positions at once, one row per input row (same index).
+    Positions are snapped to the WEATHER_GRID_DEG grid and get_vessel_weather runs once
+    per distinct cell, so a fleet costs as many lookups as the cells it occupies.
+    """
+    if lat.empty:
+        return pd.DataFrame(columns=_WEATHER_FIELDS, index=lat.index)
+    cells = list(zip(((lat / WEATHER_GRID_DEG).round() * WEATHER_GRID_DEG).round(4).tolist(),
+                     ((lon / WEATHER_GRID_DEG).round() * WEATHER_GRID_DEG).round(4).tolist()))
+    by_cell = {cell: get_vessel_weather(*cell) for cell in dict.fromkeys(cells)}
+    return pd.DataFrame([by_cell[cell] for cell in cells], index=lat.index)
@@ -1,84 +1,167 @@
 import streamlit as st
 import pandas as pd
-from core.ui.helpers import load_html, get_status_color
+from core.ui.helpers import get_status_color
+from core.ui.templates import Raw, get_template, render, render_rows
+
+def _sparkline_svg(data, color):
+    """Mini line chart (inline SVG, one line) for a metric card."""
+    width, height = 80, 24
+    mx, mn = max(data), min(data)
+    rng = (mx - mn) if (mx - mn) != 0 else 1
+    pts_str = " ".join(f"{(i / (len(data) - 1)) * width},{height - (((val - mn) / rng) * height)}"
+                       for i, val in enumerate(data))
+    return Raw(f'<svg width="100%" height="100%" viewBox="-2 -2 {width+4} {height+4}" preserveAspectRatio="none">'
+               f'<polyline fill="none" stroke="{color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" '
+               f'points="{pts_str}" style="filter: drop-shadow(0px 2px 4px {color}66);"/></svg>')
+
 
 def render_metric_card(label, value, delta=None, color="green", help_text=None, sparkline_data=None):
     """Merender kartu metrik dengan opsi sparkline (line chart mini)."""
-    html_template = load_html("metric_card_simple.html")
-    if not html_template:
+    template = get_template("metric_card_simple.html")
+    if template is None:
         st.error("Template kartu metrik hilang")
         return
 
-    # Generate SVG Sparkline if data is provided
-    sparkline_svg = ""
-    if sparkline_data and len(sparkline_data) > 1:
-        # Simple SVG line chart generation
-        width, height = 80, 24
-        mx, mn = max(sparkline_data), min(sparkline_data)
-        rng = (mx - mn) if (mx - mn) != 0 else 1
-        
-        points = []
-        for i, val in enumerate(sparkline_data):
-            x = (i / (len(sparkline_data) - 1)) * width
-            y = height - (((val - mn) / rng) * height)
-            points.append(f"{x},{y}")
-            
-        pts_str = " ".join(points)
-        sparkline_svg = f"""
-        <svg width="100%" height="100%" viewBox="-2 -2 {width+4} {height+4}" preserveAspectRatio="none">
-            <polyline fill="none" stroke="{color}" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" points="{pts_str}" 
-                      style="filter: drop-shadow(0px 2px 4px {color}66);"/>
-        </svg>
-        """
-
-    card_html = html_template.replace("{label}", str(label)) \
-                             .replace("{value}", str(value)) \
-                             .replace("{delta}", str(delta) if delta else "") \
-                             .replace("{color}", color) \
-                             .replace("{sparkline}", sparkline_svg) \
-                             .replace("{help_text}", help_text if help_text else "") \
-                             .replace("{display_info}", "block" if help_text else "none")
-
-    st.markdown(card_html.replace("\n", " ").strip(), unsafe_allow_html=True)
+    sparkline_svg = _sparkline_svg(sparkline_data, color) if sparkline_data and len(sparkline_data) > 1 else ""
+    st.markdown(template.render({
+        "label":        label,
+        "value":        value,
+        "delta":        delta if delta else "",
+        "color":        color,
+        "sparkline":    sparkline_svg,
+        "help_text":    help_text if help_text else "",
+        "display_info": "block" if help_text else "none",
+    }), unsafe_allow_html=True)
+
+
+def _vessel_card_fields(df: pd.DataFrame, highlighted: bool = False) -> pd.DataFrame:
+    """Placeholder columns of vessel_card.html for every row of a position frame, column-wise."""
+    status = df["Status"] if "Status" in df.columns else pd.Series("", index=df.index)
+    color  = status.astype("category").map(get_status_color).astype(object).fillna(get_status_color(None))
+    return pd.DataFrame({
+        "v_id":         df["code_vessel"] if "code_vessel" in df.columns else "Unknown",
+        "v_name":       df["Vessel Name"] if "Vessel Name" in df.columns else "Unknown",
+        "v_speed":      df["speed"].fillna(0) if "speed" in df.columns else 0,
+        "status_text":  status.astype(object).fillna("").astype(str).str.upper(),
+        "status_color": color,
+        "status_bg":    color + "20",
+        "bg_color":     "linear-gradient(135deg, " + color + "22 0%, rgba(17, 24, 39, 0.9) 100%)",
+        "border_color": color if highlighted else color + "40",
+        "box_shadow":   "0 4px 15px " + color + "25" if highlighted else "none",
+    }, index=df.index)
+
 
 def render_vessel_card(row, status_color, highlighted=False):
-    v_name = row.get('Vessel Name', 'Unknown')
     v_id = row.get('code_vessel', 'Unknown')
-    v_speed = row.get('speed', 0)
-    bg_color = f"linear-gradient(135deg, {status_color}22 0%, rgba(17, 24, 39, 0.9) 100%)"
-    border_color = status_color if highlighted else f"{status_color}40"
-    box_shadow = f"0 4px 15px {status_color}25" if highlighted else "none"
-    status_bg = f"{status_color}20"
-    
-    html = load_html("vessel_card.html")
-
-    if html:
-        status_text = str(row.get("Status", "")).upper()
-        card_html = html.replace("{bg_color}", bg_color).replace("{border_color}", border_color)\
-                        .replace("{box_shadow}", box_shadow).replace("{v_id}", str(v_id))\
-                        .replace("{v_name}", str(v_name)).replace("{status_bg}", status_bg)\
-                        .replace("{status_color}", status_color).replace("{status_text}", status_text)\
-                        .replace("{v_speed}", str(v_speed))
-        st.markdown(card_html, unsafe_allow_html=True)
-    
+    template = get_template("vessel_card.html")
+    if template is not None:
+        st.markdown(template.render({
+            "v_id":         v_id,
+            "v_name":       row.get('Vessel Name', 'Unknown'),
+            "v_speed":      row.get('speed', 0),
+            "status_text":  str(row.get("Status", "")).upper(),
+            "status_color": status_color,
+            "status_bg":    f"{status_color}20",
+            "bg_color":     f"linear-gradient(135deg, {status_color}22 0%, rgba(17, 24, 39, 0.9) 100%)",
+            "border_color": status_color if highlighted else f"{status_color}40",
+            "box_shadow":   f"0 4px 15px {status_color}25" if highlighted else "none",
+        }), unsafe_allow_html=True)
+
     # Wrap the button and add spacer
     if st.button("📍 Lokasi", key=f"btn_{v_id}_{row.get('Last Update', '')}", width='stretch'):
         st.session_state["search_select"] = v_id
     st.markdown("<div style='height: 5px;'></div>", unsafe_allow_html=True)
 
-def render_vessel_list_column(title, df, icon="⚓", height=650):
+
+def render_vessel_cards(df: pd.DataFrame) -> None:
+    """All vessel cards of df as one markdown element (one pass over the frame, one delta)."""
+    cards = render_rows("vessel_card.html", _vessel_card_fields(df))
+    st.markdown(f'<div class="vessel-card-list">{cards}</div>', unsafe_allow_html=True)
+
+
+# ── Windowed vessel list ─────────────────────────────────────────────────────
+VESSEL_PAGE_SIZE = 20
+
+# label → (column, ascending)
+_VESSEL_SORTS = {
+    "🕒 Update terbaru": ("Last Update", False),
+    "🔤 ID kapal":       ("code_vessel", True),
+    "🚢 Nama kapal":     ("Vessel Name", True),
+    "⚡ Kecepatan":      ("speed",       False),
+}
+
+
+def vessel_window(df: pd.DataFrame, query: str = "", sort: str = "🕒 Update terbaru",
+                  page: int = 0, size: int = VESSEL_PAGE_SIZE) -> tuple[pd.DataFrame, int, int]:
+    """Filter (ID / name, case-insensitive), sort and slice a position frame.
+
+    Returns (rows of the page, number of matching rows, page index actually shown —
+    clamped when the filter left fewer pages than requested).
+    """
+    query = (query or "").strip()
+    if query:
+        mask = df["code_vessel"].astype(str).str.contains(query, case=False, regex=False)
+        if "Vessel Name" in df.columns:
+            mask |= df["Vessel Name"].astype(str).str.contains(query, case=False, regex=False)
+        df = df[mask]
+    column, ascending = _VESSEL_SORTS.get(sort, _VESSEL_SORTS["🕒 Update terbaru"])
+    if column in df.columns:
+        df = df.sort_values(column, ascending=ascending, kind="stable", na_position="last")
+    total = len(df)
+    page  = min(max(page, 0), max((total - 1) // size, 0))
+    return df.iloc[page * size:(page + 1) * size], total, page
+
+
+def _locate_vessel(key):
+    st.session_state["search_select"] = st.session_state[key]
+    st.session_state[key] = None
+
+
+def _reset_page(key):
+    st.session_state[key] = 0
+
+
+def _turn_page(key, step):
+    st.session_state[key] = st.session_state.get(key, 0) + step
+
+
+def render_vessel_list_column(title, df, icon="⚓", height=650, page_size=VESSEL_PAGE_SIZE):
+    """Vessel cards of one column: filter, sort and page server-side, render only the visible page."""
     st.markdown(f"<h4 style='text-align: center; margin-bottom: 10px;'>{icon} {title}</h4>", unsafe_allow_html=True)
-    if not df.empty:
+    if df.empty:
         with st.container(height=height):
-            for _, row in df.iterrows():
-                render_vessel_card(row, get_status_color(row.get('Status', 'active')), highlighted=False)
-    else:
-        with st.container(height=height):
-             st.info(f"Tidak ada kapal {title.lower()}.")
+            st.info(f"Tidak ada kapal {title.lower()}.")
+        return
+
+    key, page_key = f"vessels_{title}", f"vessels_{title}_page"
+    query = st.text_input("Cari kapal", key=f"{key}_query", placeholder="🔎 ID / nama kapal",
+                          label_visibility="collapsed", on_change=_reset_page, args=(page_key,))
+    sort  = st.selectbox("Urutkan", list(_VESSEL_SORTS), key=f"{key}_sort", label_visibility="collapsed",
+                         on_change=_reset_page, args=(page_key,))
+    visible, total, page = vessel_window(df, query, sort, st.session_state.get(page_key, 0), page_size)
+    st.session_state[page_key] = page
+
+    if not visible.empty:
+        st.selectbox("📍 Lokasi", visible["code_vessel"].astype(str).tolist(), index=None, key=f"{key}_locate",
+                     placeholder="📍 Lokasi kapal…", label_visibility="collapsed",
+                     on_change=_locate_vessel, args=(f"{key}_locate",))
+    with st.container(height=height):
+        if visible.empty:
+            st.info("Tidak ada kapal yang cocok.")
+        else:
+            render_vessel_cards(visible)
+
+    if total > page_size:
+        last = (total - 1) // page_size
+        prev, info, nxt = st.columns([1, 2, 1], vertical_alignment="center")
+        prev.button("◀", key=f"{key}_prev", disabled=page == 0, on_click=_turn_page, args=(page_key, -1))
+        info.caption(f"{page * page_size + 1}–{min((page + 1) * page_size, total)} dari {total}")
+        nxt.button("▶", key=f"{key}_next", disabled=page >= last, on_click=_turn_page, args=(page_key, 1))
+
 
 def render_vessel_detail_section(row):
     """Merender tampilan detail untuk satu kapal yang dipilih."""
-    from db.repositories.fleet_repo import get_path_vessel
+    from db.repos.fleet import get_path_vessel
     v_name = str(row.get('code_vessel', 'Unknown'))
     if 'Vessel Name' in row: v_name = str(row.get('Vessel Name'))
     
@@ -101,18 +184,12 @@ def render_vessel_detail_section(row):
     
     c1, c2 = st.columns(2)
     with c1:
-        html = load_html("vessel_detail_general.html")
-        if html:
-            st.markdown(html.replace("{v_name}", v_name).replace("{v_flag}", v_flag)
-                            .replace("{v_id}", v_id).replace("{v_mmsi}", "-")
-                            .replace("{v_callsign}", "-").replace("{v_type}", "-"), unsafe_allow_html=True)
+        st.markdown(render("vessel_detail_general.html", v_name=v_name, v_flag=v_flag, v_id=v_id,
+                           v_mmsi="-", v_callsign="-", v_type="-"), unsafe_allow_html=True)
     with c2:
-        html = load_html("vessel_detail_ais.html")
-        if html:
-            st.markdown(html.replace("{status}", status).replace("{mins_ago}", str(mins_ago))
-                            .replace("{lat:.4f}", f"{lat:.4f}").replace("{lon:.4f}", f"{lon:.4f}")
-                            .replace("{speed}", str(speed)).replace("{course}", str(heading))
-                            .replace("{draught}", "-").replace("{destination}", "-").replace("{eta}", "-"), unsafe_allow_html=True)
+        st.markdown(render("vessel_detail_ais.html", status=status, mins_ago=mins_ago, lat=lat, lon=lon,
+                           speed=speed, course=heading, draught="-", destination="-", eta="-"),
+                    unsafe_allow_html=True)
 
     st.markdown("<br>", unsafe_allow_html=True)
     
@@ -1,21 +1,9 @@
-import os
-import re
-import folium
+from core import assets
 
 
 def load_html(filename):
-    """Memuat template HTML dari folder assets, dikompresi ke satu baris."""
-    try:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        parent_dir = os.path.dirname(current_dir)
-        project_dir = os.path.dirname(parent_dir)
-        file_path   = os.path.join(project_dir, "assets", "html", filename)
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        content = re.sub(r'\s+', ' ', content).strip()  # Fixed: was r'\\s+' which never matched
-        return content
-    except FileNotFoundError:
-        return ""
+    """Template HTML dari assets/html, dikompresi ke satu baris (dibaca sekali per proses)."""
+    return assets.text(f"html/{filename}")
 
 
 def get_status_color(status):
@@ -49,6 +37,7 @@ def create_google_arrow_icon(heading, fill_color, size=15):
     svg = """<svg width="{w}" height="{h}" viewBox="0 0 {w} {h}" style="filter: drop-shadow(1px 1px 2px rgba(0,0,0,0.5));"><g transform="rotate({rot}, {w2}, {h2})"><path d="M {w2},0 L {w},{h} L {w2},{h75} L 0,{h} Z" fill="{fc}" stroke="white" stroke-width="1.5" stroke-linejoin="round"/><circle cx="{w2}" cy="{h75}" r="{r}" fill="white" opacity="0.8"/></g></svg>"""
     svg = svg.format(w=width, h=height, rot=heading, w2=width/2, h2=height/2,
                      h75=height*0.75, fc=fill_color, r=width*0.05)
+    import folium
     return folium.DivIcon(html=svg, icon_size=(width, height), icon_anchor=(width/2, height/2))
 
 
@@ -57,21 +46,29 @@ def create_circle_icon(fill_color, size=10):
     d = size * 2
     svg = """<svg width="{d}" height="{d}" viewBox="0 0 {d} {d}" style="filter: drop-shadow(1px 1px 2px rgba(0,0,0,0.5));"><circle cx="{d2}" cy="{d2}" r="{r}" fill="{fc}" stroke="white" stroke-width="2"/></svg>"""
     svg = svg.format(d=d, d2=d/2, r=d/2-2, fc=fill_color)
+    import folium
     return folium.DivIcon(html=svg, icon_size=(d, d), icon_anchor=(d/2, d/2))
 
 
-def create_dredger_icon(heading=0, fill_color="#2DD4BF", size=26):
-    """Membuat ikon SVG kapal keruk (dredger) yang berputar sesuai heading."""
+def dredger_svg(heading=0, fill_color="#2DD4BF", size=26):
+    """SVG kapal keruk (dredger) yang diputar sesuai heading (heading boleh berupa token teks)."""
     w = size * 2
     h = size * 2
     svg = """<svg width="{w}" height="{h}" viewBox="0 0 {w} {h}" style="filter:drop-shadow(0 2px 5px rgba(0,0,0,0.6));" xmlns="http://www.w3.org/2000/svg"><g transform="rotate({rot},{w2},{h2})"><rect x="{w22}" y="{h42}" width="{w56}" height="{h36}" rx="3" fill="{fc}" stroke="white" stroke-width="1.5"/><polygon points="{w50},{h18} {w22},{h42} {w78},{h42}" fill="{fc}" stroke="white" stroke-width="1.5"/><rect x="{w38}" y="{h50}" width="{w24}" height="{h16}" rx="2" fill="rgba(255,255,255,0.25)" stroke="rgba(255,255,255,0.4)" stroke-width="1"/><line x1="{w62}" y1="{h55}" x2="{w82}" y2="{h38}" stroke="#E9C46A" stroke-width="2" stroke-linecap="round"/><circle cx="{w82}" cy="{h36}" r="{w06}" fill="#D4A373" stroke="white" stroke-width="1"/><line x1="{w35}" y1="{h78}" x2="{w35}" y2="{h92}" stroke="#38BDF8" stroke-width="2.5" stroke-linecap="round"/><circle cx="{w50}" cy="{h22}" r="{w04}" fill="white" opacity="0.9"/></g></svg>"""
     svg = svg.format(w=w, h=h, rot=heading, w2=w/2, h2=h/2, fc=fill_color,
                      w22=w*0.22, h42=h*0.42, w56=w*0.56, h36=h*0.36,
                      w50=w*0.5, h18=h*0.18, w78=w*0.78, w38=w*0.38,
-                     h50=h*0.50, w24=w*0.24, h16=h*0.16, w62=w*0.62,
+                     h50=h*0.50, w24=w*0.24, h16=h*0.16, w62=w*0.62, h38=h*0.38,
                      h55=h*0.55, w82=w*0.82, w06=w*0.06, w35=w*0.35,
                      h78=h*0.78, h92=h*0.92, h22=h*0.22, w04=w*0.04)
-    return folium.DivIcon(html=svg, icon_size=(w, h), icon_anchor=(w/2, h/2))
+    return svg
+
+
+def create_dredger_icon(heading=0, fill_color="#2DD4BF", size=26):
+    """Membuat ikon SVG kapal keruk (dredger) yang berputar sesuai heading."""
+    import folium
+    d = size * 2
+    return folium.DivIcon(html=dredger_svg(heading, fill_color, size), icon_size=(d, d), icon_anchor=(d/2, d/2))
 
 
 def create_sand_marker_icon(size=14):
@@ -79,6 +76,7 @@ def create_sand_marker_icon(size=14):
     d = size * 2
     svg = """<svg width="{d}" height="{d}" viewBox="0 0 {d} {d}" style="filter:drop-shadow(0 1px 3px rgba(0,0,0,0.5));"><circle cx="{d2}" cy="{d2}" r="{r}" fill="#E9C46A" stroke="#D4A373" stroke-width="2" opacity="0.92"/><text x="{d2}" y="{y}" text-anchor="middle" font-size="{fs}px" fill="#090e18" font-family="Arial">&#9888;</text></svg>"""
     svg = svg.format(d=d, d2=d/2, r=d/2-2, y=d/2+4, fs=int(d*0.45))
+    import folium
     return folium.DivIcon(html=svg, icon_size=(d, d), icon_anchor=(d/2, d/2))
 
 
@@ -87,6 +85,7 @@ def create_dumping_icon(size=14):
     d = size * 2
     svg = """<svg width="{d}" height="{d}" viewBox="0 0 {d} {d}" style="filter:drop-shadow(0 1px 3px rgba(0,0,0,0.5));"><polygon points="{d2},2 {d_2},{d_2} 2,{d_2}" fill="#F97316" stroke="white" stroke-width="1.5" opacity="0.92"/><text x="{d2}" y="{d_4}" text-anchor="middle" font-size="{fs}px" fill="white" font-family="Arial">D</text></svg>"""
     svg = svg.format(d=d, d2=d/2, d_2=d-2, d_4=d-4, fs=int(d*0.4))
+    import folium
     return folium.DivIcon(html=svg, icon_size=(d, d), icon_anchor=(d/2, d/2))
 
 
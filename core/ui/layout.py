@@ -3,6 +3,7 @@ import time
 import streamlit as st
 from core.config import ROLE_ADMIN, ROLE_OPERATIONS, ROLE_MARCOM, ROLE_FINANCE
 from core.services.alert import get_unacknowledged_count
+from core.pages import menu_for
 
 
 def _get_brand():
@@ -82,17 +83,7 @@ def sidebar_nav():
         unread = get_unacknowledged_count()
         alert_label = f"🔔 Alert ({unread})" if unread > 0 else "🔔 Alert"
 
-        menu = ["🏠 Monitoring", "🌊 Lingkungan"]
-        if role in [ROLE_ADMIN, ROLE_OPERATIONS]:
-            menu.extend(["🗺️ Peta Kapal", "🗓️ Voyage", "🛠️ Maintenance", "📋 Survey"])
-        if role in [ROLE_ADMIN, ROLE_MARCOM, ROLE_FINANCE]:
-            menu.extend(["👥 Klien", "📈 Analitik"])
-        if role in [ROLE_ADMIN, ROLE_FINANCE, ROLE_MARCOM]:
-            menu.append("📊 KPI")
-        if role == ROLE_ADMIN:
-            menu.append("👨‍💼 Admin")
-        # Alert always visible to all roles
-        menu.append(alert_label)
+        menu = [alert_label if label == "🔔 Alert" else label for label in menu_for(role)]
 
         for item in menu:
             # Match current page even if alert label has count suffix
@@ -1,9 +1,11 @@
-from core.ui.helpers import get_status_color, create_google_arrow_icon, create_dredger_icon, create_sand_marker_icon, create_dumping_icon
+from core.ui.helpers import get_status_color, create_google_arrow_icon, create_sand_marker_icon, create_dumping_icon
 from core.ui.cards import render_vessel_list_column, render_vessel_detail_section
 from db.repos.fleet import get_vessel_position, get_path_vessel
-from core.config import inject_custom_css
+from core import assets
 from folium.plugins import MarkerCluster, HeatMap
-from folium import Element
+from folium import Element, MacroElement
+from folium.elements import JSCSSMixin
+from jinja2 import Template
 from streamlit_folium import st_folium
 
 import folium
@@ -46,6 +48,16 @@ def _calc_durations(rows: list, max_total_ms: int = 25000) -> list:
 # ---------------------------------------------------------------------------
 # Add static path + animated moving marker to map
 # ---------------------------------------------------------------------------
+class _MovingMarkerJS(JSCSSMixin, MacroElement):
+    """Script link to the published Leaflet.MovingMarker plugin (header / st_folium js_links)."""
+    _template = Template("")
+
+    def __init__(self, url):
+        super().__init__()
+        self._name      = "MovingMarkerJS"
+        self.default_js = [("leaflet_moving_marker", url)]
+
+
 def add_history_path_to_map(m, path_df, fill_color, v_id_str, show_timelapse=False):
     if path_df.empty:
         return
@@ -86,20 +98,13 @@ def add_history_path_to_map(m, path_df, fill_color, v_id_str, show_timelapse=Fal
 
     map_id = m.get_name()
 
-    # Read MovingMarker.js source to inline it — eliminates any CDN / static-serve race
-    import os as _os
-    _plugin_path = _os.path.join(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))),
-                                 "static", "MovingMarker.js")
-    try:
-        with open(_plugin_path, "r", encoding="utf-8") as _f:
-            _moving_marker_src = _f.read()
-    except FileNotFoundError:
-        # Fallback: load from parent project dir
-        _fallback = _os.path.join(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__)))),
-                                  "MovingMarker.js")
-        with open(_fallback, "r", encoding="utf-8") as _f:
-            _moving_marker_src = _f.read()
-
+    # Leaflet.MovingMarker: cached static file when the app serves /app/static, else inlined
+    plugin_url = assets.static_url("static/MovingMarker.js")
+    if plugin_url:
+        _MovingMarkerJS(plugin_url).add_to(m)
+        _moving_marker_src = ""
+    else:
+        _moving_marker_src = assets.text("static/MovingMarker.js")
 
     hud_html = f"""
     <style>
@@ -156,8 +161,8 @@ def add_history_path_to_map(m, path_df, fill_color, v_id_str, show_timelapse=Fal
 
     <script>
     /*
-     * Inline Leaflet.MovingMarker — waits for L to be defined before
-     * registering the plugin, then initialises the animation immediately.
+     * Leaflet.MovingMarker — waits for L (and, when served as a static
+     * file, for the plugin script) before initialising the animation.
      * This avoids the "typeof L === undefined" race condition.
      */
     (function waitForLeaflet() {{
@@ -165,10 +170,13 @@ def add_history_path_to_map(m, path_df, fill_color, v_id_str, show_timelapse=Fal
             return setTimeout(waitForLeaflet, 60);
         }}
 
-        // ── Register MovingMarker plugin inline (no external script src) ────
+        // ── Register MovingMarker plugin inline (fallback without static serving) ──
         if (!L.Marker.movingMarker) {{
             {_moving_marker_src}
         }}
+        if (!L.Marker.movingMarker) {{
+            return setTimeout(waitForLeaflet, 60);
+        }}
 
         // ── Resolve the Folium map instance ─────────────────────────────────
         function getMap() {{
@@ -283,7 +291,6 @@ def add_history_path_to_map(m, path_df, fill_color, v_id_str, show_timelapse=Fal
 # ---------------------------------------------------------------------------
 def render_map_content():
     st.title("🗺️ Peta Posisi Kapal")
-    inject_custom_css()
 
     if "search_select" not in st.session_state:
         st.session_state["search_select"] = None
@@ -292,9 +299,9 @@ def render_map_content():
 
     maint_df = active_df = pd.DataFrame()
     if not df.empty:
-        df['status_lower'] = df['Status'].astype(str).str.lower()
-        maint_df  = df[df['status_lower'].str.contains('maintenance|repair|mtc', na=False)]
-        active_df = df[~df['status_lower'].str.contains('maintenance|repair|mtc', na=False)]
+        in_maint  = df['Status'].astype(str).str.lower().str.contains('maintenance|repair|mtc', na=False)
+        maint_df  = df[in_maint]
+        active_df = df[~in_maint]
 
     # 1:1:1 ratio or adjust based on preference, map in center needs more space usually. Let's make it [1, 2, 1]
     tab1, tab2, tab3 = st.columns([1, 2.5, 1])
@@ -523,7 +530,7 @@ def _interp_colorscale(scale, t):
 
 
 def calendar_heatmap(df, date_col, value_col, title="",
-                     color_scale=None, height=None, year=None, month=None):
+                     color_scale=None, height=None, year=None, month=None, daily_means=None):
     """
     GitHub Contribution Graph–style calendar heatmap (full year).
 
@@ -556,7 +563,9 @@ def calendar_heatmap(df, date_col, value_col, title="",
 
     # ── Aggregate daily means for the full year ───────────────────────────────
     daily: dict = {}
-    if not df.empty and value_col in df.columns and date_col in df.columns:
+    if daily_means is not None:         # precomputed {date: mean} (core/services/precompute.py)
+        daily = {d: v for d, v in daily_means.items() if d.year == year}
+    elif not df.empty and value_col in df.columns and date_col in df.columns:
         work = df[[date_col, value_col]].copy()
         work[date_col]  = pd.to_datetime(work[date_col],  errors="coerce")
         work[value_col] = pd.to_numeric(work[value_col],  errors="coerce")
@@ -1033,39 +1042,10 @@ def render_bathymetric_map(
 
 
 
-    # ── Dredger vessel markers ────────────────────────────────────────────────
+    # ── Dredger vessel layer (one GeoJSON, icons drawn in the browser) ──────
     if vessel_df is not None and not vessel_df.empty:
-        lat_col = next((c for c in ["latitude","lat"] if c in vessel_df.columns), "latitude")
-        lon_col = next((c for c in ["longitude","lon","lng"] if c in vessel_df.columns), "longitude")
-        hdg_col = next((c for c in ["heading","course"] if c in vessel_df.columns), None)
-        id_col  = next((c for c in ["code_vessel","vessel_id","id"] if c in vessel_df.columns), None)
-
-        from core.services.weather import get_vessel_weather
-        
-        vessel_group = folium.FeatureGroup(name="⛏️ Kapal Keruk (Dredger)", show=True)
-        for _, row in vessel_df.iterrows():
-            try:
-                lat = float(row[lat_col]); lon = float(row[lon_col])
-                hdg = float(row[hdg_col]) if hdg_col else 0
-                vid = str(row[id_col]) if id_col else "—"
-                
-                # Fetch mini weather
-                w = get_vessel_weather(lat, lon)
-                
-                folium.Marker(
-                    [lat, lon],
-                    icon=create_dredger_icon(heading=hdg, fill_color="#2DD4BF", size=22),
-                    tooltip=folium.Tooltip(
-                        f"<div style='font-family:Outfit,sans-serif;background:#0e1824;"
-                        f"color:#2DD4BF;padding:8px 12px;border-radius:8px;"
-                        f"border:1px solid rgba(45,212,191,0.3);font-size:0.82rem;'>"
-                        f"<b>⛏️ {vid}</b><br>Hdg: {hdg:.0f}°<hr style='margin:4px 0; border:none; border-top:1px solid #1e293b;'/>"
-                        f"Cuaca: {w['icon']} {w['condition']} ({w['temperature']}°C)<br>Ombak: {w['wave_height']}m | Angin: {w['wind_speed']}kn</div>", sticky=True),
-                    popup=folium.Popup(f"<b>Kapal Keruk: {vid}</b>", max_width=200),
-                ).add_to(vessel_group)
-            except Exception:
-                continue
-        vessel_group.add_to(m)
+        from core.ui.vessel_layer import vessel_layer
+        vessel_layer(vessel_df, "⛏️ Kapal Keruk (Dredger)").add_to(m)
 
     # ── LayerControl ──────────────────────────────────────────────────────────
     folium.LayerControl(collapsed=True, position="topright").add_to(m)
@@ -0,0 +1,101 @@
+"""core/ui/templates.py — compiled HTML card templates from assets/html with escaping
+
+    html = render("vessel_card.html", v_id="KM-01", v_name="Bahari", ...)
+    html = render_rows("vessel_card.html", frame)          # a whole column, one string
+
+Each template is compiled once per process into literal chunks and fields, so filling
+it is one pass instead of a str.replace per placeholder. Placeholders are ``{name}`` or
+``{name:spec}`` (format spec applied before escaping); a brace not directly followed by
+a name, such as a CSS block in an inline <style>, stays literal. Values are
+HTML-escaped unless wrapped in Raw, which is for markup built by our own code only.
+"""
+from __future__ import annotations
+import functools
+import html
+import re
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+import pandas as pd
+from core import assets
+
+_FIELD = re.compile(r"\{([A-Za-z_]\w*)(?::([^{}\s]*))?\}")
+
+
+class Raw(str):
+    """Trusted markup: inserted into a template as-is."""
+
+
+def _escape(value) -> str:
+    return value if isinstance(value, Raw) else html.escape(str(value), quote=True)
+
+
+@dataclass(frozen=True)
+class Template:
+    name: str
+    literals: tuple[str, ...]                 # one more than fields
+    fields: tuple[tuple[str, str], ...]       # (name, format spec)
+
+    @classmethod
+    def compile(cls, name: str, source: str) -> "Template":
+        literals, fields, pos = [], [], 0
+        for m in _FIELD.finditer(source):
+            literals.append(source[pos:m.start()])
+            fields.append((m.group(1), m.group(2) or ""))
+            pos = m.end()
+        literals.append(source[pos:])
+        return cls(name, tuple(literals), tuple(fields))
+
+    def render(self, values: Mapping) -> str:
+        """Fill every placeholder from values; a missing name raises KeyError."""
+        out = [self.literals[0]]
+        for (name, spec), literal in zip(self.fields, self.literals[1:]):
+            value = values[name]
+            out.append(_escape(format(value, spec) if spec else value))
+            out.append(literal)
+        return "".join(out)
+
+    def render_rows(self, frame: pd.DataFrame, raw: Iterable[str] = (), **constants) -> list[str]:
+        """One filled template per row of frame, built column by column.
+
+        Placeholders are looked up in frame's columns, then in constants (same value for
+        every row, escaped once). Columns listed in raw are inserted unescaped. Each
+        field is formatted and escaped once per column, then rows are joined in one zip.
+        """
+        raw, n = set(raw), len(frame)
+        done: dict[tuple[str, str], list[str]] = {}
+        parts = [[self.literals[0]] * n]
+        for key, literal in zip(self.fields, self.literals[1:]):
+            if key not in done:
+                name, spec = key
+                if name in frame.columns:
+                    values = frame[name].tolist()
+                    if spec:
+                        values = [format(v, spec) for v in values]
+                    done[key] = [str(v) for v in values] if name in raw else [_escape(v) for v in values]
+                else:
+                    value = format(constants[name], spec) if spec else constants[name]
+                    done[key] = [str(value) if name in raw else _escape(value)] * n
+            parts.append(done[key])
+            parts.append([literal] * n)
+        return ["".join(row) for row in zip(*parts)]
+
+
+@functools.lru_cache(maxsize=None)
+def get_template(name: str) -> Template | None:
+    """Compiled assets/html/<name>, None when the file does not exist."""
+    source = assets.text(f"html/{name}")
+    return Template.compile(name, source) if source else None
+
+
+def render(name: str, **values) -> str:
+    """Filled template, "" when it does not exist."""
+    template = get_template(name)
+    return template.render(values) if template is not None else ""
+
+
+def render_rows(name: str, frame: pd.DataFrame, raw: Iterable[str] = (), **constants) -> str:
+    """All rows of frame through one template, concatenated (for a single st.markdown)."""
+    template = get_template(name)
+    if template is None or frame.empty:
+        return ""
+    return "".join(template.render_rows(frame, raw, **constants))
@@ -0,0 +1,99 @@
+"""core/ui/vessel_layer.py — the whole fleet as one GeoJSON layer with icons drawn in the browser
+
+    vessel_layer(vessel_df, "⛏️ Kapal Keruk (Dredger)").add_to(m)
+
+vessel_features() turns the vessel frame into a single FeatureCollection column by
+column: position, id, heading and the weather of its grid cell become properties, no
+markup. The dredger SVG is sent once as a template; a shared pointToLayer rotates it per
+feature from properties.hdg and a shared onEachFeature binds the tooltip and popup, so
+the page grows by one small feature per vessel instead of one SVG icon, tooltip and
+popup per vessel.
+"""
+from __future__ import annotations
+import json
+import folium
+import pandas as pd
+from folium.utilities import JsCode
+from core.services.weather import fleet_weather
+from core.ui.helpers import dredger_svg
+
+_LAT = ("latitude", "lat")
+_LON = ("longitude", "lon", "lng")
+_HDG = ("heading", "course")
+_ID  = ("code_vessel", "vessel_id", "id")
+
+_HDG_TOKEN = "HDG"          # replaced by properties.hdg in the browser
+
+
+def _column(df: pd.DataFrame, names: tuple[str, ...]) -> str | None:
+    return next((c for c in names if c in df.columns), None)
+
+
+def vessel_features(df: pd.DataFrame) -> dict:
+    """FeatureCollection of the vessels with a valid position (rows without one are left out)."""
+    lat_col, lon_col = (_column(df, _LAT), _column(df, _LON)) if df is not None else (None, None)
+    if lat_col is None or lon_col is None or df.empty:
+        return {"type": "FeatureCollection", "features": []}
+    hdg_col, id_col = _column(df, _HDG), _column(df, _ID)
+
+    lat = pd.to_numeric(df[lat_col], errors="coerce")
+    lon = pd.to_numeric(df[lon_col], errors="coerce")
+    ok  = lat.notna() & lon.notna()
+    if not ok.any():                           # e.g. new vessels without a position yet
+        return {"type": "FeatureCollection", "features": []}
+    lat, lon = lat[ok], lon[ok]
+    hdg = (pd.to_numeric(df.loc[ok, hdg_col], errors="coerce").fillna(0).round() % 360
+           if hdg_col else pd.Series(0, index=lat.index)).astype(int)
+    ids = df.loc[ok, id_col].astype(str) if id_col else pd.Series("—", index=lat.index)
+    wx  = fleet_weather(lat, lon)
+
+    features = [
+        {"type": "Feature",
+         "geometry": {"type": "Point", "coordinates": [x, y]},
+         "properties": {"id": i, "hdg": h, "icon": ic, "cond": c, "temp": t, "wave": wv, "wind": wn}}
+        for x, y, i, h, ic, c, t, wv, wn in zip(
+            lon.round(6).tolist(), lat.round(6).tolist(), ids.tolist(), hdg.tolist(),
+            wx["icon"].tolist(), wx["condition"].tolist(), wx["temperature"].tolist(),
+            wx["wave_height"].tolist(), wx["wind_speed"].tolist())
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+# ── Shared browser-side style functions ─────────────────────────────────────
+_POINT_TO_LAYER = """
+function(feature, latlng) {
+    return L.marker(latlng, {icon: L.divIcon({
+        html: %(svg)s.split(%(token)s).join(feature.properties.hdg),
+        className: "empty", iconSize: [%(d)d, %(d)d], iconAnchor: [%(r)g, %(r)g]
+    })});
+}
+"""
+
+_ON_EACH_FEATURE = """
+function(feature, layer) {
+    var p = feature.properties;
+    var esc = function(v) {
+        return String(v).replace(/[&<>"']/g, function(c) { return "&#" + c.charCodeAt(0) + ";"; });
+    };
+    layer.bindTooltip(
+        "<div style='font-family:Outfit,sans-serif;background:#0e1824;color:%(color)s;padding:8px 12px;"
+        + "border-radius:8px;border:1px solid rgba(45,212,191,0.3);font-size:0.82rem;'>"
+        + "<b>⛏️ " + esc(p.id) + "</b><br>Hdg: " + p.hdg + "°"
+        + "<hr style='margin:4px 0; border:none; border-top:1px solid #1e293b;'/>"
+        + "Cuaca: " + esc(p.icon) + " " + esc(p.cond) + " (" + p.temp + "°C)<br>"
+        + "Ombak: " + p.wave + "m | Angin: " + p.wind + "kn</div>",
+        {sticky: true});
+    layer.bindPopup("<b>Kapal Keruk: " + esc(p.id) + "</b>", {maxWidth: 200});
+}
+"""
+
+
+def vessel_layer(df: pd.DataFrame, name: str, fill_color: str = "#2DD4BF", size: int = 22,
+                 show: bool = True) -> folium.GeoJson:
+    """One GeoJson overlay (its own LayerControl entry) with a rotated dredger icon per vessel."""
+    d = size * 2
+    point_to_layer = _POINT_TO_LAYER % {"svg": json.dumps(dredger_svg(_HDG_TOKEN, fill_color, size)),
+                                        "token": json.dumps(_HDG_TOKEN), "d": d, "r": d / 2}
+    on_each_feature = _ON_EACH_FEATURE % {"color": fill_color}
+    return folium.GeoJson(vessel_features(df), name=name, show=show,
+                          pointToLayer=JsCode(point_to_layer), onEachFeature=JsCode(on_each_feature))
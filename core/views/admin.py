@@ -5,6 +5,13 @@ from db.repos.user import (
     update_password
 )
 from db.repos.settings import get_logs
+from db.metrics import recent_queries, top_queries, latency_histogram
+from db.singleflight import flight_stats
+from db.frame_cache import get_frame_cache
+from db.invalidation import dependency_stats
+from db.disk_cache import get_disk_cache
+from core.services.warmup import warmup_stats
+from core.assets import asset_stats
 from core.config import ROLE_ADMIN, ROLE_OPERATIONS, ROLE_MARCOM, ROLE_FINANCE
 
 
@@ -51,7 +58,6 @@ def _render_add_user_panel():
                 success, msg = create_new_user(new_user, new_pass, new_role)
                 if success:
                     st.success(msg)
-                    st.cache_data.clear()
                     st.session_state.admin_panel = None
                     st.rerun()
                 else:
@@ -100,7 +106,6 @@ def _render_edit_user_panel(user_row):
         if new_role   != current_role:   update_user_role(user_row['username'], new_role)
         if new_status != current_status: update_user_status(user_row['username'], new_status)
         st.success("✅ Pengguna berhasil diperbarui!")
-        st.cache_data.clear()
         st.session_state.admin_panel = None
         st.rerun()
     if c2.button("↩️ Batal"):
@@ -130,7 +135,6 @@ def _render_delete_user_panel(username):
         if st.button("🗑️ Ya, Hapus", type="primary"):
             if delete_user(username):
                 st.success(f"Pengguna {username} berhasil dihapus.")
-                st.cache_data.clear()
                 st.session_state.admin_panel = None
                 st.rerun()
             else:
@@ -165,7 +169,7 @@ def render_user_management_tab():
         from core.ui.helpers import render_beautiful_table
         
         users_disp = users_df[['username', 'role', 'user_status', 'last_login']].copy()
-        users_disp['last_login'] = pd.to_datetime(users_disp['last_login']).dt.strftime('%d %b, %H:%M')
+        users_disp['last_login'] = users_disp['last_login'].dt.strftime('%d %b, %H:%M')
         users_disp.rename(columns={
             "username": "ID Pengguna",
             "role": "Peran",
@@ -248,13 +252,84 @@ def render_audit_tab():
         from core.ui.helpers import render_beautiful_table
         df_disp = df.copy()
         if 'changed_at' in df_disp.columns:
-            df_disp['changed_at'] = pd.to_datetime(df_disp['changed_at']).dt.strftime('%d %b %Y, %H:%M')
+            df_disp['changed_at'] = df_disp['changed_at'].dt.strftime('%d %b %Y, %H:%M')
             df_disp.rename(columns={"changed_at": "Timestamp"}, inplace=True)
         render_beautiful_table(df_disp)
     else:
         st.info("Tidak ada log audit ditemukan.")
 
 
+def render_performance_tab():
+    _section_header("⏱️", "Performa Query", "Latensi & volume setiap panggilan Supabase (proses ini)")
+    recent = recent_queries()
+    if recent.empty:
+        st.info("Belum ada query yang tercatat sejak server dimulai.")
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Query Tercatat", f"{len(recent):,}")
+    c2.metric("Total Data",     f"{recent['bytes'].sum() / 1_048_576:,.2f} MB")
+    c3.metric("Latensi p50",    f"{recent['latency_ms'].median():,.0f} ms")
+    c4.metric("Latensi p95",    f"{recent['latency_ms'].quantile(0.95):,.0f} ms")
+
+    by = st.radio("Urutkan berdasarkan", ["Total waktu", "Total bytes"], horizontal=True)
+    st.dataframe(top_queries(by="bytes" if by == "Total bytes" else "latency_ms"),
+                 width='stretch', hide_index=True)
+
+    _section_header("📊", "Histogram Latensi", "Jumlah request per tabel dan rentang latensi (ms)")
+    st.dataframe(latency_histogram(), width='stretch')
+
+    flights = pd.DataFrame(flight_stats())
+    if not flights.empty:
+        _section_header("🔀", "Coalescing Cache", "Pemanggil yang menunggu fetch yang sedang berjalan")
+        st.dataframe(flights, width='stretch', hide_index=True)
+
+    cache = get_frame_cache()
+    fs    = cache.stats()
+    _section_header("🧊", "Shared Frame Cache", "Frame read-only yang dipakai bersama semua sesi")
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Memori", f"{fs['bytes'] / 1_048_576:,.1f} / {cache.budget / 1_048_576:,.0f} MB")
+    c2.metric("Entri",  f"{fs['entries']:,}")
+    c3.metric("Hit Rate", f"{fs['hits'] / max(fs['hits'] + fs['misses'], 1):.0%}")
+    c4.metric("Eviksi", f"{fs['evictions']:,}")
+    usage = pd.DataFrame(cache.usage())
+    if not usage.empty:
+        st.dataframe(usage, width='stretch', hide_index=True)
+
+    l2 = get_disk_cache()
+    if l2 is not None:
+        ls = l2.stats()
+        _section_header("💽", "L2 Disk Cache", f"Cache persisten lintas restart & worker ({ls['path']})")
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Ukuran", f"{ls['bytes'] / 1_048_576:,.1f} / {l2.budget / 1_048_576:,.0f} MB")
+        c2.metric("Entri",  f"{ls['entries']:,}")
+        c3.metric("Hit",    f"{ls['hits']:,}")
+
+    warm = warmup_stats()
+    if warm is not None:
+        _section_header("🔥", "Warm-up Cache", "Prefetch query & artefak turunan saat boot dan terjadwal")
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Durasi Boot", f"{warm['boot_ms']:,.0f} ms" if warm["boot_ms"] is not None else "berjalan…")
+        c2.metric("Task",        f"{len(warm['tasks'])} · {warm['workers']} worker")
+        c3.metric("Key L2 Dipulihkan", f"{warm['l2_restored']:,}")
+        st.dataframe(pd.DataFrame(warm["tasks"]).drop(columns=["last_run"]), width='stretch', hide_index=True)
+
+    _section_header("🧩", "Aset Statis", "CSS, template HTML dan plugin JS — dimuat & diminifikasi sekali per proses")
+    assets_df = pd.DataFrame(asset_stats())
+    c1, c2 = st.columns(2)
+    c1.metric("File", f"{len(assets_df):,}")
+    c2.metric("Ukuran Disajikan", f"{assets_df['bytes'].sum() / 1024:,.1f} KB",
+              delta=f"{(assets_df['bytes'].sum() - assets_df['raw_bytes'].sum()) / 1024:,.1f} KB", delta_color="inverse")
+    with st.expander("🧾 Daftar Aset"):
+        st.dataframe(assets_df, width='stretch', hide_index=True)
+
+    _section_header("🏷️", "Invalidasi Cache", "Versi tiap tabel (jumlah write) dan cache yang membacanya")
+    st.dataframe(pd.DataFrame(dependency_stats()), width='stretch', hide_index=True)
+
+    with st.expander("🧾 Query Terakhir"):
+        st.dataframe(recent.iloc[::-1].head(200), width='stretch', hide_index=True)
+
+
 def render_admin_page():
     st.markdown("""
         <div class="page-header">
@@ -266,8 +341,9 @@ def render_admin_page():
         </div>
     """, unsafe_allow_html=True)
 
-    tab1, tab2, tab3 = st.tabs(["👤 Manajemen Pengguna", "🔐 Pengaturan Akun", "📜 Log Audit"])
+    tab1, tab2, tab3, tab4 = st.tabs(["👤 Manajemen Pengguna", "🔐 Pengaturan Akun", "📜 Log Audit", "⏱️ Performance"])
 
     with tab1: render_user_management_tab()
     with tab2: render_settings_tab()
     with tab3: render_audit_tab()
+    with tab4: render_performance_tab()
@@ -5,9 +5,11 @@ import plotly.graph_objects as go
 from db.repos.finance import get_financial_metrics, get_revenue_analysis, get_order_stats, get_revenue_cycle_metrics
 from db.repos.client import get_client_stats
 from db.repos.fleet import get_logistics_performance, get_fleet_daily_activity
-from core.services.analytics import calculate_advanced_forecast, calculate_correlation, calculate_moving_average
+from core.services.analytics import calculate_correlation, calculate_moving_average
+from core.services.precompute import revenue_forecast
 from core.ui.charts import apply_chart_style, seabed_crosssection_chart, dredging_gantt_chart, water_quality_scatter
 from core.services.ai import MarineAIAnalyst
+from core.services.loader import Need, load
 
 # --- FRAGMENTS FOR GRANULAR UPDATES ---
 try:
@@ -32,9 +34,12 @@ def _section_header(icon: str, title: str, subtitle: str = ""):
 @fragment
 def render_overview_strip():
     """High-density metric strip for executive overview."""
-    fin = get_financial_metrics()
-    orders = get_order_stats()
-    clients = get_client_stats()
+    data = load({
+        "fin":     Need(get_financial_metrics, default={}),
+        "orders":  Need(get_order_stats,       default={}),
+        "clients": Need(get_client_stats,      default={}),
+    })
+    fin, orders, clients = data["fin"], data["orders"], data["clients"]
 
     rev = float(fin.get('total_revenue', 0))
     rev_delta = float(fin.get('delta_revenue', 0.0))
@@ -61,7 +66,7 @@ def render_revenue_forecast():
         rev_df['upper_bound'] = rev_df['revenue']
         rev_df['revenue'] = rev_df['revenue'].astype(float)
 
-        forecast_df = calculate_advanced_forecast(rev_df, months=6)
+        forecast_df = revenue_forecast(6)
 
         if not forecast_df.empty:
             combined_df = pd.concat([rev_df, forecast_df])
@@ -125,6 +130,9 @@ def render_revenue_forecast():
 @fragment
 def render_correlation_section():
     rev_df = get_revenue_cycle_metrics()
+    as_of  = get_revenue_cycle_metrics.as_of()
+    if as_of is not None:
+        st.caption(f"🕒 Data per {as_of.astimezone():%d %b %Y %H:%M}")
 
     if not rev_df.empty:
         corr_cols = ['avg_days_to_cash', 'realized_revenue', 'total_orders', 'paid_count']
@@ -216,6 +216,9 @@ def render_clients_page():
         _section_header("🏆", "Skor Reliabilitas Klien",
                          "Penilaian berdasarkan LTV & kecepatan pembayaran")
         rel_df = get_client_reliability_scoring()
+        as_of  = get_client_reliability_scoring.as_of()
+        if as_of is not None:
+            st.caption(f"🕒 Data per {as_of.astimezone():%d %b %Y %H:%M}")
         if rel_df.empty:
             st.info("Data reliabilitas belum tersedia.")
         else:
@@ -6,7 +6,8 @@ from db.repos.environ import (
     get_environmental_compliance_dashboard
 )
 from core.ui.maps import calendar_heatmap
-from core.ui.helpers import load_html
+from core.services.precompute import water_daily_means
+from core.ui.templates import render
 from core.ui.charts import gauge_chart
 from core.ui.cards import render_metric_card
 from core.services.ai import MarineAIAnalyst
@@ -68,7 +69,7 @@ def _show_hourly_detail_modal(df: pd.DataFrame, param: str, date_str: str, date_
         unsafe_allow_html=True,
     )
 
-    hourly_df = df.copy()
+    hourly_df = df[[date_col, param]].copy() if {date_col, param} <= set(df.columns) else df
     if not hourly_df.empty and date_col in hourly_df.columns:
         hourly_df[date_col] = pd.to_datetime(hourly_df[date_col], errors="coerce")
         hourly_df["_date"] = hourly_df[date_col].dt.strftime("%Y-%m-%d")
@@ -124,7 +125,7 @@ def _show_hourly_detail_modal(df: pd.DataFrame, param: str, date_str: str, date_
 # ─────────────────────────────────────────────────────────────────────────────
 
 def _render_heatmap_card(df, param: str, date_col="latest_timestamp", height=190,
-                         key_suffix="", year=None, month=None):
+                         key_suffix="", year=None, month=None, daily_means=None):
     """Render GitHub-style yearly heatmap dan kembalikan tanggal yang diklik (atau None)."""
     meta   = _PARAM_META.get(param, {"label": param, "unit": "", "color": None})
     label  = meta["label"]
@@ -140,7 +141,8 @@ def _render_heatmap_card(df, param: str, date_col="latest_timestamp", height=190
         unsafe_allow_html=True,
     )
 
-    fig   = calendar_heatmap(df, date_col, param, color_scale=cscale, height=height, year=year)
+    fig   = calendar_heatmap(df, date_col, param, color_scale=cscale, height=height, year=year,
+                             daily_means=daily_means)
     key   = f"heatmap_{param}_{key_suffix}" if key_suffix else f"heatmap_{param}"
     event = st.plotly_chart(
         fig,
@@ -210,9 +212,6 @@ def render_environ_heatmap():
             elif itype == "positive": st.success(msg)
             else:                     st.info(msg)
 
-    if not df.empty and "latest_timestamp" in df.columns:
-        df["latest_timestamp"] = pd.to_datetime(df["latest_timestamp"])
-
     cat = st.radio("Pilih Kategori", ["Kualitas Air", "Oseanografi"], horizontal=True)
     st.markdown("<div style='height:4px'></div>", unsafe_allow_html=True)
 
@@ -224,23 +223,23 @@ def render_environ_heatmap():
     if cat == "Kualitas Air":
         col1, col2 = st.columns(2, gap="medium")
         with col1:
-            sel = _render_heatmap_card(df, "salinitas", year=year)
+            sel = _render_heatmap_card(df, "salinitas", year=year, daily_means=water_daily_means("salinitas"))
             if sel: _show_hourly_detail_modal(df, "salinitas", sel)
         with col2:
-            sel = _render_heatmap_card(df, "turbidity", year=year)
+            sel = _render_heatmap_card(df, "turbidity", year=year, daily_means=water_daily_means("turbidity"))
             if sel: _show_hourly_detail_modal(df, "turbidity", sel)
-        sel = _render_heatmap_card(df, "oxygen", year=year)
+        sel = _render_heatmap_card(df, "oxygen", year=year, daily_means=water_daily_means("oxygen"))
         if sel: _show_hourly_detail_modal(df, "oxygen", sel)
 
     else:  # Oseanografi
         col1, col2 = st.columns(2, gap="medium")
         with col1:
-            sel = _render_heatmap_card(df, "current", year=year)
+            sel = _render_heatmap_card(df, "current", year=year, daily_means=water_daily_means("current"))
             if sel: _show_hourly_detail_modal(df, "current", sel)
         with col2:
-            sel = _render_heatmap_card(df, "tide", year=year)
+            sel = _render_heatmap_card(df, "tide", year=year, daily_means=water_daily_means("tide"))
             if sel: _show_hourly_detail_modal(df, "tide", sel)
-        sel = _render_heatmap_card(df, "density", year=year)
+        sel = _render_heatmap_card(df, "density", year=year, daily_means=water_daily_means("density"))
         if sel: _show_hourly_detail_modal(df, "density", sel)
 
 
@@ -265,7 +264,6 @@ def view_buoy_detail(b_id, name):
     hist_df = get_buoy_history(b_id)
 
     if not hist_df.empty:
-        hist_df["created_at"] = pd.to_datetime(hist_df["created_at"])
         min_date = hist_df["created_at"].min()
         max_date = hist_df["created_at"].max()
 
@@ -278,8 +276,8 @@ def view_buoy_detail(b_id, name):
         filtered_df = hist_df.copy()
         if isinstance(d, (list, tuple)) and len(d) == 2:
             filtered_df = hist_df[
-                (hist_df["created_at"] >= pd.to_datetime(d[0])) &
-                (hist_df["created_at"] <  pd.to_datetime(d[1]) + pd.Timedelta(days=1))
+                (hist_df["created_at"] >= pd.Timestamp(d[0], tz="UTC")) &
+                (hist_df["created_at"] <  pd.Timestamp(d[1], tz="UTC") + pd.Timedelta(days=1))
             ]
 
         if not filtered_df.empty:
@@ -367,7 +365,7 @@ def render_buoy_monitoring():
                     loc     = buoy.get("location") or "Lokasi ?"
                     status  = buoy["status"]
                     batt    = buoy.get("battery", "-")
-                    last_up = pd.to_datetime(buoy.get("last_update"), errors="coerce")
+                    last_up = buoy.get("last_update")
                     fmt_update = last_up.strftime("%d %b %H:%M") if pd.notnull(last_up) else "-"
 
                     if status == "Maintenance":
@@ -383,19 +381,10 @@ def render_buoy_monitoring():
                         bg_gradient  = "linear-gradient(145deg,rgba(100,116,139,0.08),rgba(10,16,32,0.85))"
                         border_color = "rgba(100,116,139,0.18)"
 
-                    html_template = load_html("buoy_card.html")
-                    if html_template:
-                        card_html = (html_template
-                            .replace("{b_id}",         str(b_id))
-                            .replace("{loc}",           str(loc))
-                            .replace("{status}",        str(status))
-                            .replace("{status_color}",  status_color)
-                            .replace("{bg_gradient}",   bg_gradient)
-                            .replace("{border_color}",  border_color)
-                            .replace("{batt}",          str(batt))
-                            .replace("{fmt_update}",    str(fmt_update))
-                        )
-                        st.markdown(card_html, unsafe_allow_html=True)
+                    st.markdown(render("buoy_card.html", b_id=b_id, loc=loc, status=status,
+                                       status_color=status_color, bg_gradient=bg_gradient,
+                                       border_color=border_color, batt=batt, fmt_update=fmt_update),
+                                unsafe_allow_html=True)
 
                     if st.button("Detail 🔍", key=f"btn_detail_{b_id}"):
                         st.session_state["buoy_detail_id"]   = b_id
@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from concurrent.futures import ThreadPoolExecutor
 
 from core.ui.cards import render_metric_card, render_vessel_list_column, render_vessel_card, render_dredging_kpi
 from core.ui.charts import apply_chart_style, gauge_chart, kpi_progress_bar
@@ -11,55 +10,33 @@ from db.repos.finance import get_order_stats, get_financial_metrics, get_revenue
 from db.repos.client import get_clients_summary
 from db.repos.settings import get_system_settings
 from core.services.ai import MarineAIAnalyst
+from core.services.loader import Need, load
 from core.config import ROLE_ADMIN, ROLE_FINANCE, ROLE_MARCOM, ROLE_OPERATIONS
 
-import threading
 import logging
 from typing import Dict, Any
-from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 logger = logging.getLogger(__name__)
 
 def _load_dashboard_data(role: str) -> Dict[str, Any]:
-    """Fire off all data fetches in parallel for maximum responsiveness."""
-    results = {
-        "fleet": {}, "orders": {}, "financial": {}, "settings": {},
-        "clients": pd.DataFrame(), "anomalies": pd.DataFrame(), "revenue": pd.DataFrame()
-    }
-
-    task_defs = {
-        "fleet":     get_fleet_status,
-        "orders":    get_order_stats,
-        "settings":  get_system_settings,
-        "clients":   get_clients_summary,
-        "anomalies": get_operational_anomalies,
-        "fleet_daily": get_fleet_daily_activity,
+    """Load every dashboard section concurrently; slow sections fall back to empty."""
+    needs = {
+        "fleet":       Need(get_fleet_status,          default={}),
+        "orders":      Need(get_order_stats,           default={}),
+        "settings":    Need(get_system_settings,       default={}),
+        "clients":     Need(get_clients_summary,       default=pd.DataFrame()),
+        "anomalies":   Need(get_operational_anomalies, default=pd.DataFrame()),
+        "fleet_daily": Need(get_fleet_daily_activity,  default=pd.DataFrame()),
     }
     if role in [ROLE_ADMIN, ROLE_FINANCE, ROLE_MARCOM]:
-        task_defs["financial"] = get_financial_metrics
-        task_defs["revenue"]   = get_revenue_analysis
-        task_defs["rev_cycle"] = get_revenue_cycle_metrics
-
-    # Capture the Streamlit script context from the main thread so it can
-    # be propagated to worker threads — prevents "missing ScriptRunContext" warnings.
-    ctx = get_script_run_ctx()
-
-    def _run(fn):
-        """Wrap fn so the worker thread inherits the Streamlit script context."""
-        def _inner():
-            add_script_run_ctx(threading.current_thread(), ctx)
-            return fn()
-        return _inner
-
-    with ThreadPoolExecutor(max_workers=6) as pool:
-        futures = {key: pool.submit(_run(fn)) for key, fn in task_defs.items()}
-        for key, future in futures.items():
-            try:
-                results[key] = future.result(timeout=15)
-            except Exception as e:
-                logger.error("Gagal saat memuat data bagian [%s]: %s", key, e)
-
-    return results
+        needs["financial"] = Need(get_financial_metrics,     default={})
+        needs["revenue"]   = Need(get_revenue_analysis,      default=pd.DataFrame())
+        needs["rev_cycle"] = Need(get_revenue_cycle_metrics, default=pd.DataFrame())
+
+    loaded = load(needs)
+    if loaded.missing:
+        st.toast(f"⏳ Sebagian data belum tersedia: {', '.join(loaded.missing)}")
+    return {"financial": {}, "revenue": pd.DataFrame(), **loaded.data}
 
 
 # ── AI insight banner ──────────────────────────────────────────────────────────
@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from db.repos.survey import get_all_surveys, create_survey_report
-from db.connection import get_supabase
+from db.repos.dims import get_sites, get_vessels
 from core.ui.cards import render_metric_card
 
 
@@ -99,10 +99,8 @@ def render_create_survey_form():
                     help="Di-generate otomatis berdasarkan tanggal dan waktu. Bisa diubah jika diperlukan."
                 )
 
-                sb = get_supabase()
-                sites_resp = sb.schema("operation").table("sites")\
-                    .select("code_site, location").eq("status", "Active").execute()
-                sites_df = pd.DataFrame(sites_resp.data)
+                sites_df = get_sites()
+                sites_df = sites_df[sites_df["status"] == "Active"].reset_index()
                 if not sites_df.empty:
                     sites_df["label"] = sites_df["code_site"] + " - " + sites_df["location"]
                 site_opts   = sites_df["code_site"].tolist() if not sites_df.empty else []
@@ -113,9 +111,8 @@ def render_create_survey_form():
                     format_func=lambda x: site_labels[site_opts.index(x)] if x in site_opts else x
                 )
 
-                vessels_resp = sb.schema("operation").table("vessels")\
-                    .select("code_vessel, name").eq("status", "Active").execute()
-                vessels_df = pd.DataFrame(vessels_resp.data)
+                vessels_df = get_vessels()
+                vessels_df = vessels_df[vessels_df["status"] == "Active"].reset_index()
                 vessel_opts   = vessels_df["code_vessel"].tolist() if not vessels_df.empty else []
                 vessel_labels = vessels_df["name"].tolist()        if not vessels_df.empty else []
                 id_vessel = st.selectbox(
@@ -151,7 +148,6 @@ def render_create_survey_form():
                     success, msg = create_survey_report(data)
                     if success:
                         st.success(f"✅ {msg}")
-                        st.cache_data.clear()
                         st.rerun()
                     else:
                         st.error(f"❌ Gagal: {msg}")
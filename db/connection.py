@@ -1,16 +1,198 @@
+import io
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Iterator
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from supabase import create_client, Client
+from db.schemas import ARROW_TYPES
+from db.metrics import attach
+
+
+def _backend() -> str:
+    """"supabase" (default) or "fake": env MARINE_DB_BACKEND, else secrets DB_ACCESS.backend."""
+    env = os.environ.get("MARINE_DB_BACKEND")
+    if env:
+        return env.strip().lower()
+    try:
+        return str(st.secrets.DB_ACCESS.get("backend", "supabase")).lower()
+    except Exception:
+        return "supabase"
 
 
 @st.cache_resource
 def get_supabase() -> Client:
-    """Return a cached Supabase client instance."""
+    """Return a cached Supabase client instance (db/fake.py when the backend is "fake")."""
+    if _backend() == "fake":
+        from db.fake import create_fake_client
+        return create_fake_client()
     return create_client(
         st.secrets.DB_ACCESS.DATABASE_URL,
         st.secrets.DB_ACCESS.database,
     )
 
 
+@st.cache_resource
+def _schema_client(schema: str):
+    """One PostgREST client per schema, so its httpx connection pool is reused.
+
+    Client.schema() builds a fresh client (and a fresh HTTP/2 session) on every call.
+    """
+    client = get_supabase().schema(schema)
+    attach(client.session)
+    return client
+
+
 def sb_table(schema: str, table: str):
     """Shorthand: get_supabase().schema(schema).table(table)."""
-    return get_supabase().schema(schema).table(table)
+    return _schema_client(schema).table(table)
+
+
+def sb_rpc(schema: str, fn: str, params: dict | None = None):
+    """Shorthand: get_supabase().schema(schema).rpc(fn, params).execute().data."""
+    return _schema_client(schema).rpc(fn, params or {}).execute().data
+
+
+def sb_aggregate(schema: str, table: str, metrics: dict,
+                 group_by=(), filters=()) -> list[dict]:
+    """Push GROUP BY / COUNT / SUM down to Postgres (operation.aggregate_rows).
+
+    metrics  : {"alias": ("sum", "col")} — count, count_distinct, sum, avg, min, max
+    group_by : ["col"] atau [("month", "col")] untuk bucket date_trunc
+    filters  : [("col", "eq"|"neq"|"gt"|"gte"|"lt"|"lte"|"in", value)]
+
+    schema.table harus ada di whitelist fungsi (assets/sql/table.sql, juga _AGGREGATABLE di
+    db/fake.py); relasi baru perlu didaftarkan di kedua tempat.
+    """
+    return sb_rpc("operation", "aggregate_rows", {
+        "p_schema":   schema,
+        "p_table":    table,
+        "p_group_by": [g if isinstance(g, str) else {"trunc": g[0], "col": g[1], "as": g[0]}
+                       for g in group_by],
+        "p_metrics":  {alias: [m[0], m[1] if len(m) > 1 else None]
+                       for alias, m in metrics.items()},
+        "p_filters":  [[col, op, val] for col, op, val in filters],
+    }) or []
+
+
+def sb_csv(query, table: str) -> pd.DataFrame:
+    """Execute query as text/csv and parse it with pyarrow using ARROW_TYPES[table].
+
+    table is "schema.table"; timestamps come back as datetime64[ns, UTC], codes as categoricals.
+    """
+    text = query.csv().execute().data
+    if not text:
+        return pd.DataFrame()
+    types = ARROW_TYPES.get(table, {})
+    # Postgres `timestamp` has no offset: parse naive, then pin to UTC.
+    parse = {c: pa.timestamp(t.unit) if pa.types.is_timestamp(t) and t.tz else t
+             for c, t in types.items()}
+    tbl = pa_csv.read_csv(io.BytesIO(text.encode()),
+        convert_options=pa_csv.ConvertOptions(column_types=parse, strings_can_be_null=True))
+    for i, name in enumerate(tbl.column_names):
+        t = types.get(name)
+        if t is not None and pa.types.is_timestamp(t) and t.tz:
+            tbl = tbl.set_column(i, name, pc.assume_timezone(tbl.column(i), t.tz))
+    return tbl.to_pandas()
+
+# ── Keyset streaming ─────────────────────────────────────────────────────────
+_DONE = object()
+
+
+def _apply_filters(query, filters):
+    for col, op, val in filters:
+        query = getattr(query, "in_" if op == "in" else op)(col, val)
+    return query
+
+
+def keyset_pages(schema: str, table: str, select: str, filters, page_size: int,
+                 key: str) -> Iterator[list[dict]]:
+    """Yield raw row pages ordered by (key, id); each page resumes after the last row seen.
+
+    filters are (col, op, value) tuples as in sb_stream; the table needs an ``id`` column
+    as tie-breaker. sb_stream builds its DataFrame chunks on top of this.
+    """
+    cursor = None
+    while True:
+        query = _apply_filters(sb_table(schema, table).select(select), filters)
+        if cursor is not None:
+            ts, last_id = cursor
+            query = query.or_(f'{key}.gt."{ts}",and({key}.eq."{ts}",id.gt.{last_id})')
+        rows = query.order(key).order("id").limit(page_size).execute().data or []
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        cursor = (rows[-1][key], rows[-1]["id"])
+
+
+def sb_stream(schema: str, table: str, columns: str, filters=(), *,
+              key: str = "created_at", page_size: int = 1_000,
+              start: datetime | None = None, end: datetime | None = None,
+              parallel: int = 1) -> Iterator[pd.DataFrame]:
+    """Stream a query as DataFrame chunks, paging by (key, id) keyset — no row cap.
+
+    filters  : [("col", "eq"|"neq"|"gt"|"gte"|"lt"|"lte"|"in", value)]
+    parallel : > 1 splits [start, end) into that many key ranges, read concurrently;
+               chunks then arrive in completion order, with at most 2 × parallel buffered.
+    """
+    wanted = [c.strip() for c in columns.split(",")]
+    select = ", ".join(dict.fromkeys([*wanted, key, "id"]))
+    filters = list(filters)
+    if start is not None:
+        filters.append((key, "gte", start.isoformat()))
+    if end is not None:
+        filters.append((key, "lt", end.isoformat()))
+
+    if parallel <= 1 or start is None or end is None:
+        for rows in keyset_pages(schema, table, select, filters, page_size, key):
+            yield pd.DataFrame(rows)[wanted]
+        return
+
+    step   = (end - start) / parallel
+    bounds = [(start + step * i, start + step * (i + 1)) for i in range(parallel)]
+    pages: queue.Queue = queue.Queue(maxsize=2 * parallel)
+    stop  = threading.Event()
+    ctx   = get_script_run_ctx()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker(lo: datetime, hi: datetime):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        try:
+            part = [*filters, (key, "gte", lo.isoformat()), (key, "lt", hi.isoformat())]
+            for rows in keyset_pages(schema, table, select, part, page_size, key):
+                if not _put(rows):
+                    return
+            _put(_DONE)
+        except Exception as e:
+            _put(e)
+
+    threads = [threading.Thread(target=_worker, args=b, daemon=True) for b in bounds]
+    for t in threads:
+        t.start()
+    try:
+        remaining = len(threads)
+        while remaining:
+            item = pages.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield pd.DataFrame(item)[wanted]
+    finally:
+        stop.set()
@@ -0,0 +1,441 @@
+"""db/datagen.py — synthetic dataset generator for load testing
+
+    python -m db.datagen --scale 10 --format copy --out build/synth
+    python -m db.datagen --vessels 500 --position-interval 5 --sensor-days 1095 --format parquet
+
+Scale multiplies the entity counts of dummy_data.sql (vessels, buoys, clients, order rate);
+the history windows and reporting intervals set the row counts of the time-series tables.
+Formats: sql (multi-row INSERT), copy (psql COPY … FROM stdin) or parquet (one
+<schema>.<table>.parquet per table). All three load into Postgres or db/fake.py.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import functools
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+_PORTS = [  # name, city, state, lat, lon
+    ("Tanjung Priok",  "Jakarta Utara", "DKI Jakarta",     -6.10, 106.88),
+    ("Tanjung Perak",  "Surabaya",      "Jawa Timur",      -7.21, 112.73),
+    ("Tanjung Emas",   "Semarang",      "Jawa Tengah",     -6.95, 110.42),
+    ("Belawan",        "Medan",         "Sumatera Utara",   3.79,  98.69),
+    ("Makassar",       "Makassar",      "Sulawesi Selatan", -5.13, 119.41),
+    ("Balikpapan",     "Balikpapan",    "Kalimantan Timur", -1.27, 116.81),
+    ("Benoa",          "Denpasar",      "Bali",            -8.75, 115.21),
+    ("Bitung",         "Bitung",        "Sulawesi Utara",   1.44, 125.19),
+    ("Sorong",         "Sorong",        "Papua Barat",     -0.88, 131.25),
+    ("Dumai",          "Dumai",         "Riau",             1.69, 101.45),
+]
+_INDUSTRIES = ["Construction", "Port Operator", "Government", "Oil & Gas", "Mining", "Logistics"]
+_REGIONS    = ["Java", "Sumatra", "Kalimantan", "Sulawesi", "Papua", "National"]
+_ROLES      = ["Admin", "Operations", "Finance", "MarCom", "Surveyor", "Captain", "Crew", "Manager"]
+_FLAGS      = ["Indonesia", "Singapore", "Panama", "Malaysia", "Liberia"]
+_SITE_TYPES = ["Dredging", "Reclamation", "Survey", "Monitoring"]
+_TRACK_RADIUS = 0.5   # degrees
+
+# status → (next statuses, mean duration in hours, speed range in knots)
+_ACTIVITY = {
+    "Preparation":     (["Dredging", "Delivering"],                   12, (0, 1)),
+    "Dredging":        (["Settling", "Delivering"],                   72, (1, 3)),
+    "Settling":        (["Delivering", "Discharge Cargo"],            24, (0, 1)),
+    "Delivering":      (["Discharge Cargo"],                          30, (7, 12)),
+    "Discharge Cargo": (["Returning", "Idle"],                        10, (0, 2)),
+    "Returning":       (["Preparation", "Idle", "Maintenance"],       30, (7, 11)),
+    "Idle":            (["Preparation"],                              36, (0, 0)),
+    "Maintenance":     (["Docking", "Preparation"],                   96, (0, 0)),
+    "Docking":         (["Preparation"],                              48, (0, 0)),
+}
+
+
+@dataclass
+class Spec:
+    """Dataset parameters; counts are the dummy_data.sql volumes times ``scale``."""
+    scale: float = 1.0
+    vessels: int | None = None
+    buoys: int | None = None
+    clients: int | None = None
+    position_days: int = 30          # vessel track history
+    position_interval: int = 15      # minutes between position reports
+    sensor_days: int = 365           # buoy sensor history
+    sensor_interval: int = 60        # minutes between sensor readings
+    order_days: int = 730            # order / payment history
+    orders_per_month: float = 6.0    # before scale and seasonality
+    seed: int = 42
+    end: datetime | None = None      # last timestamp (UTC, naive); default: today 00:00
+
+    def count(self, explicit: int | None, base: int) -> int:
+        return explicit if explicit is not None else max(1, round(base * self.scale))
+
+
+def _codes(prefix: str, n: int, width: int = 4) -> np.ndarray:
+    return np.array([f"{prefix}{i:0{width}d}" for i in range(1, n + 1)], dtype=object)
+
+
+def _pick(rng: np.random.Generator, items, n: int, p=None) -> np.ndarray:
+    return np.asarray(items, dtype=object)[rng.choice(len(items), size=n, p=p)]
+
+
+# ── Dimensions ───────────────────────────────────────────────────────────────
+def _dimensions(spec: Spec, rng: np.random.Generator, end: datetime) -> dict[str, pd.DataFrame]:
+    n_vessels = spec.count(spec.vessels, 14)
+    n_buoys   = spec.count(spec.buoys, 12)
+    n_clients = spec.count(spec.clients, 10)
+    n_users   = max(5, round(20 * spec.scale))
+    n_partner = max(2, n_vessels // 5)
+    n_sites   = max(3, n_buoys // 3)
+    n_contact = n_clients + n_users + n_partner
+    created   = end - pd.Timedelta(days=spec.order_days)
+
+    contacts = pd.DataFrame({
+        "code_contact": _codes("CT", n_contact),
+        "phone":  [f"021{rng.integers(1_000_000, 9_999_999)}" for _ in range(n_contact)],
+        "email":  [f"contact{i}@marineweb.id" for i in range(1, n_contact + 1)],
+        "mobile": [f"08{rng.integers(100_000_000, 999_999_999)}" for _ in range(n_contact)],
+        "created_at": created,
+    })
+    cc = contacts["code_contact"].to_numpy()
+    method_payments = pd.DataFrame({
+        "code_methodpay":   _codes("MP", 5, 3),
+        "transaction_name": ["Bank Transfer IDR", "Bank Transfer USD", "Petty Cash",
+                             "Corporate Cheque", "Letter of Credit"],
+        "bank_name":        ["Bank Mandiri", "BCA", "Finance Dept", "Bank BRI", "BNI 46"],
+    })
+    clients = pd.DataFrame({
+        "code_client": _codes("CL", n_clients),
+        "name":     [f"PT Klien Bahari {i}" for i in range(1, n_clients + 1)],
+        "industry": _pick(rng, _INDUSTRIES, n_clients),
+        "region":   _pick(rng, _REGIONS, n_clients),
+        "deposit":  rng.integers(5, 300, n_clients) * 1_000_000.0,
+        "id_contact": cc[:n_clients],
+        "status":   _pick(rng, ["Active", "Inactive"], n_clients, p=[0.9, 0.1]),
+        "created_at": created,
+    })
+    users = pd.DataFrame({
+        "id_contact": cc[n_clients:n_clients + n_users],
+        "code_user":  _codes("USR", n_users),
+        "name":     [f"Pengguna {i}" for i in range(1, n_users + 1)],
+        "citizen":  "Indonesia",
+        "role":     np.r_[np.array(["Admin"], dtype=object), _pick(rng, _ROLES, n_users - 1)],
+        "status":   _pick(rng, ["Active", "Inactive"], n_users, p=[0.9, 0.1]),
+        "organs":   _pick(rng, ["Internal", "Field", "Vessel"], n_users),
+        "created_at": created,
+    })
+    user_managements = pd.DataFrame({
+        "id_user":    users["code_user"],
+        "password":   "synthetic",
+        "status":     users["status"],
+        "last_login": end - pd.to_timedelta(rng.integers(0, 30 * 24, n_users), unit="h"),
+        "created_at": created,
+    })
+    partners = pd.DataFrame({
+        "id_contact":   cc[n_clients + n_users:],
+        "code_partner": _codes("PT", n_partner),
+        "name":     [f"PT Mitra Samudera {i}" for i in range(1, n_partner + 1)],
+        "industry": _pick(rng, ["Logistics", "Supply", "Marine"], n_partner),
+        "status":   "Active",
+        "created_at": created,
+    })
+    port_idx = rng.integers(0, len(_PORTS), n_sites)
+    ports    = [_PORTS[i] for i in port_idx]
+    sites = pd.DataFrame({
+        "code_site": _codes("ST", n_sites),
+        "type":      _pick(rng, _SITE_TYPES, n_sites),
+        "location":  [f"Area Kerja {p[0]} {i}" for i, p in enumerate(ports, 1)],
+        "city":      [p[1] for p in ports],
+        "state":     [p[2] for p in ports],
+        "zip":       [f"{rng.integers(10_000, 99_999)}" for _ in range(n_sites)],
+        "country":   "Indonesia",
+        "port":      [p[0] for p in ports],
+        "latitude":  np.round([p[3] + rng.normal(0, 0.05) for p in ports], 5),
+        "longitude": np.round([p[4] + rng.normal(0, 0.05) for p in ports], 5),
+        "status":    _pick(rng, ["Active", "Inactive"], n_sites, p=[0.85, 0.15]),
+        "created_at": created,
+    })
+    vessels = pd.DataFrame({
+        "id_partner":  _pick(rng, partners["code_partner"], n_vessels),
+        "code_vessel": _codes("VSL", n_vessels),
+        "flag":   _pick(rng, _FLAGS, n_vessels, p=[0.6, 0.15, 0.1, 0.1, 0.05]),
+        "name":   [f"MV Nusantara {i}" for i in range(1, n_vessels + 1)],
+        "status": _pick(rng, ["Active", "Maintenance", "Idle", "Inactive"], n_vessels,
+                        p=[0.8, 0.1, 0.05, 0.05]),
+        "created_at": created,
+    })
+    site_of = rng.integers(0, n_sites, n_buoys)
+    buoys = pd.DataFrame({
+        "id_site":   sites["code_site"].to_numpy()[site_of],
+        "code_buoy": _codes("BY", n_buoys),
+        "longitude": np.round(sites["longitude"].to_numpy()[site_of] + rng.normal(0, 0.01, n_buoys), 5),
+        "latitude":  np.round(sites["latitude"].to_numpy()[site_of] + rng.normal(0, 0.01, n_buoys), 5),
+        "status":    _pick(rng, ["Active", "MTC", "Inactive"], n_buoys, p=[0.85, 0.1, 0.05]),
+        "last_mtc":  end - pd.to_timedelta(rng.integers(1, 90, n_buoys), unit="D"),
+        "created_at": created,
+    })
+    return {
+        "operation.contacts": contacts, "operation.method_payments": method_payments,
+        "operation.clients": clients, "operation.users": users,
+        "operation.user_managements": user_managements, "operation.partners": partners,
+        "operation.sites": sites, "operation.vessels": vessels, "ocean.buoys": buoys,
+    }
+
+
+# ── Orders / payments (seasonal revenue) ─────────────────────────────────────
+def _orders(spec: Spec, rng: np.random.Generator, end: datetime, dims: dict) -> dict[str, pd.DataFrame]:
+    days   = pd.date_range(end=end, periods=spec.order_days, freq="D")
+    season = 1 + 0.35 * np.sin(2 * np.pi * (days.month.to_numpy() - 3) / 12)   # peak mid-year
+    growth = np.linspace(0.8, 1.2, len(days))
+    lam    = spec.orders_per_month * spec.scale / 30 * season * growth
+    per_day = rng.poisson(lam)
+    n = int(per_day.sum())
+    order_date = np.repeat(days.to_numpy(), per_day) + pd.to_timedelta(rng.integers(8, 17, n), unit="h")
+    lead     = pd.to_timedelta(rng.integers(14, 60, n), unit="D")
+    slip     = pd.to_timedelta(np.round(rng.normal(1, 4, n)).astype(int), unit="D")
+    required = order_date + lead
+    actual   = required + slip
+    age      = (pd.Timestamp(end) - pd.DatetimeIndex(order_date)).days
+    status   = np.where(actual <= end, "Completed", np.where(age < 7, "Open", "On Progress"))
+    port     = rng.integers(0, len(_PORTS), n)
+    quantity = rng.integers(20, 600, n) * 100
+    codes    = _codes("ORD", n, 6)
+
+    orders = pd.DataFrame({
+        "id_client":  _pick(rng, dims["operation.clients"]["code_client"], n),
+        "code_order": codes,
+        "order_date": order_date,
+        "required_delivery_date":  required,
+        "priority":   _pick(rng, ["High", "Medium", "Low"], n, p=[0.25, 0.5, 0.25]),
+        "quantity":   quantity,
+        "special_requirements": _pick(rng, ["Capital Dredging", "Maintenance Dredging",
+                                            "Sand Fill Construction", "Survey"], n),
+        "scheduled_delivery_date": required,
+        "actual_delivery_date":    actual,
+        "destination": [_PORTS[i][0] for i in port],
+        "destination_longitude": [_PORTS[i][4] for i in port],
+        "destination_latitude":  [_PORTS[i][3] for i in port],
+        "status":     status,
+        "created_at": order_date,
+    })
+    sand = (quantity * rng.uniform(0.6, 0.9, n)).astype(int)
+    order_details = pd.DataFrame({
+        "id_order":  codes,
+        "id_vessel": _pick(rng, dims["operation.vessels"]["code_vessel"], n),
+        "code_task": _codes("TSK", n, 6),
+        "sand_quantity": sand,
+        "clay_quantity": quantity - sand,
+        "status": status,
+        "created_at": order_date,
+    })
+    # one payment per order that has started delivering; Hold while the order is running
+    paid = status != "Open"
+    pay_date = np.where(status[paid] == "Completed",
+                        actual[paid] + pd.to_timedelta(rng.integers(0, 21, int(paid.sum())), unit="D"),
+                        order_date[paid] + pd.to_timedelta(3, unit="D"))
+    pay_date = np.minimum(pay_date, np.datetime64(end))
+    m = int(paid.sum())
+    price = rng.uniform(8_000, 15_000, m) * season[days.searchsorted(order_date[paid].normalize())]
+    payments = pd.DataFrame({
+        "id_client":    orders["id_client"].to_numpy()[paid],
+        "id_order":     codes[paid],
+        "id_methodpay": _pick(rng, dims["operation.method_payments"]["code_methodpay"], m),
+        "code_payment": _codes("PAY", m, 6),
+        "total_amount": np.round(quantity[paid] * price, -3),
+        "payment_date": pay_date,
+        "payment_number": [f"INV{i:08d}" for i in range(1, m + 1)],
+        "status": np.where(status[paid] == "Completed",
+                           _pick(rng, ["Completed", "Failed"], m, p=[0.95, 0.05]), "Hold"),
+        "created_at": pay_date,
+    })
+    return {"operation.orders": orders, "operation.order_details": order_details,
+            "operation.payments": payments}
+
+
+# ── Vessel activities and tracks ─────────────────────────────────────────────
+def _activities(spec: Spec, rng: np.random.Generator, end: datetime, vessels: pd.DataFrame) -> pd.DataFrame:
+    start = pd.Timestamp(end) - pd.Timedelta(days=max(spec.position_days, 30))
+    frames = []
+    seq = 0
+    for code in vessels["code_vessel"]:
+        t, status, rows = start, "Preparation", []
+        while t < end:
+            _, mean_h, _ = _ACTIVITY[status]
+            dur = pd.Timedelta(hours=float(rng.gamma(4, mean_h / 4)))
+            rows.append((status, t, t + dur))
+            t += dur
+            nxt = _ACTIVITY[status][0]
+            status = nxt[rng.integers(len(nxt))]
+        seq_no = np.arange(1, len(rows) + 1)
+        frames.append(pd.DataFrame({
+            "code_activity": [f"ACT{seq + i:07d}" for i in seq_no],
+            "id_vessel": code,
+            "seq_activity": [f"{i:03d}" for i in seq_no],
+            "start_date": [r[1] for r in rows],
+            "end_date": [r[2] for r in rows],
+            "estimate_date": [r[2] for r in rows],
+            "status": [r[0] for r in rows],
+        }))
+        seq += len(rows)
+    acts = pd.concat(frames, ignore_index=True)
+    # the running activity has no end yet
+    last = acts.groupby("id_vessel")["start_date"].transform("max") == acts["start_date"]
+    acts.loc[last, "end_date"] = pd.NaT
+    acts["created_at"] = acts["start_date"]
+    return acts
+
+
+def _positions(spec: Spec, rng: np.random.Generator, end: datetime,
+               vessels: pd.DataFrame, acts: pd.DataFrame) -> pd.DataFrame:
+    stamps = pd.date_range(end=end, periods=spec.position_days * 24 * 60 // spec.position_interval,
+                           freq=f"{spec.position_interval}min").to_numpy()
+    frames = []
+    speed_range = {s: v[2] for s, v in _ACTIVITY.items()}
+    for code, va in acts.groupby("id_vessel", sort=False):
+        home = _PORTS[rng.integers(len(_PORTS))]
+        idx  = np.clip(np.searchsorted(va["start_date"].to_numpy(), stamps, side="right") - 1, 0, None)
+        stat = va["status"].to_numpy()[idx]
+        lo   = np.array([speed_range[s][0] for s in stat])
+        hi   = np.array([speed_range[s][1] for s in stat])
+        speed = np.round(lo + rng.random(len(stamps)) * (hi - lo))
+        step  = speed * spec.position_interval / 60 / 60      # knots → degrees, roughly
+        heading = np.cumsum(rng.normal(0, 25, len(stamps))) % 360
+        rad = np.deg2rad(heading)
+        # fold the random walk into a ±_TRACK_RADIUS° box so long tracks stay near the home port
+        lat = home[3] + _TRACK_RADIUS * np.sin(np.cumsum(step * np.cos(rad)) / _TRACK_RADIUS)
+        lon = home[4] + _TRACK_RADIUS * np.sin(np.cumsum(step * np.sin(rad)) / _TRACK_RADIUS)
+        frames.append(pd.DataFrame({
+            "id_vessel": code,
+            "id_activity": va["code_activity"].to_numpy()[idx],
+            "longitude": np.round(lon, 5),
+            "latitude":  np.round(lat, 5),
+            "speed":     speed.astype(int),
+            "heading":   heading.astype(int),
+            "note":      stat,
+            "created_at": stamps,
+        }))
+    return pd.concat(frames, ignore_index=True).sort_values("created_at", kind="stable", ignore_index=True)
+
+
+def _sensors(spec: Spec, rng: np.random.Generator, end: datetime, buoys: pd.DataFrame) -> pd.DataFrame:
+    stamps = pd.date_range(end=end, periods=spec.sensor_days * 24 * 60 // spec.sensor_interval,
+                           freq=f"{spec.sensor_interval}min")
+    hours  = (stamps - stamps[0]).total_seconds().to_numpy() / 3600
+    doy    = stamps.dayofyear.to_numpy()
+    n      = len(stamps)
+    frames = []
+    for code in buoys["code_buoy"]:
+        turb = rng.lognormal(2.7, 0.35, n) * (1 + 0.4 * np.sin(2 * np.pi * (doy - 15) / 365))
+        spike = rng.random(n) < 0.002                        # dredging plume events
+        turb[spike] *= rng.uniform(3, 6, int(spike.sum()))
+        frames.append(pd.DataFrame({
+            "id_buoy":   code,
+            "salinitas": np.round(32 + 1.5 * np.sin(2 * np.pi * doy / 365) + rng.normal(0, 0.6, n)).astype(int),
+            "turbidity": np.round(turb).astype(int),
+            "current":   np.clip(np.round(rng.gamma(2, 0.6, n)), 0, 6).astype(int),
+            "oxygen":    np.clip(np.round(6.5 - 0.05 * turb / 10 + rng.normal(0, 0.5, n)), 2, 9).astype(int),
+            "tide":      np.round(110 + 80 * np.sin(2 * np.pi * hours / 12.42) + rng.normal(0, 5, n)).astype(int),
+            "density":   np.round(1022 + rng.normal(0, 1, n)).astype(int),
+            "created_at": stamps,
+        }))
+    return pd.concat(frames, ignore_index=True).sort_values("created_at", kind="stable", ignore_index=True)
+
+
+def generate(spec: Spec) -> dict[str, pd.DataFrame]:
+    """Build every table as a DataFrame keyed "schema.table", in foreign-key load order."""
+    rng = np.random.default_rng(spec.seed)
+    end = spec.end or datetime.now(timezone.utc).replace(tzinfo=None, hour=0, minute=0,
+                                                          second=0, microsecond=0)
+    tables = _dimensions(spec, rng, end)
+    tables.update(_orders(spec, rng, end, tables))
+    acts = _activities(spec, rng, end, tables["operation.vessels"])
+    tables["operation.vessel_activities"] = acts
+    tables["operation.vessel_positions"]  = _positions(spec, rng, end, tables["operation.vessels"], acts)
+    tables["ocean.buoy_sensor_histories"] = _sensors(spec, rng, end, tables["ocean.buoys"])
+    return tables
+
+
+# ── Writers ──────────────────────────────────────────────────────────────────
+_TS_OUT = "%Y-%m-%d %H:%M:%S"
+
+
+def _sql_literals(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(s):
+        out = "'" + s.dt.strftime(_TS_OUT) + "'"
+    elif pd.api.types.is_numeric_dtype(s):
+        out = s.astype(str)
+    else:
+        out = "'" + s.astype(str).str.replace("'", "''", regex=False) + "'"
+    return out.where(s.notna(), "NULL")
+
+
+def write_sql(tables: dict[str, pd.DataFrame], path: str, batch: int = 1_000) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("-- Synthetic dataset (db/datagen.py)\n")
+        for name, df in tables.items():
+            cols = ", ".join(df.columns)
+            lits = [_sql_literals(df[c]) for c in df.columns]
+            rows = "(" + functools.reduce(lambda a, b: a + "," + b, lits) + ")"
+            for i in range(0, len(rows), batch):
+                f.write(f"INSERT INTO {name} ({cols}) VALUES\n")
+                f.write(",\n".join(rows.iloc[i:i + batch]) + ";\n")
+
+
+def _copy_escape(v) -> str:
+    # COPY text format: backslash, tab and newline are backslash-escaped
+    return str(v).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def write_copy(tables: dict[str, pd.DataFrame], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("-- Synthetic dataset (db/datagen.py) — load with: psql -f\n")
+        for name, df in tables.items():
+            f.write(f"COPY {name} ({', '.join(df.columns)}) FROM stdin;\n")
+            text = df.select_dtypes(include="object").columns
+            df = df.assign(**{c: df[c].map(_copy_escape, na_action="ignore") for c in text})
+            df.to_csv(f, sep="\t", header=False, index=False, na_rep="\\N",
+                      date_format=_TS_OUT, quoting=csv.QUOTE_NONE, lineterminator="\n")
+            f.write("\\.\n\n")
+
+
+def write_parquet(tables: dict[str, pd.DataFrame], out_dir: str) -> None:
+    for name, df in tables.items():
+        df.to_parquet(os.path.join(out_dir, f"{name}.parquet"), index=False)
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m db.datagen", description=__doc__.split("\n\n")[0])
+    p.add_argument("--out", default=os.path.join("build", "synth"), help="output directory")
+    p.add_argument("--format", choices=("sql", "copy", "parquet"), default="copy")
+    p.add_argument("--scale", type=float, default=1.0, help="entity multiplier vs dummy_data.sql")
+    p.add_argument("--vessels", type=int)
+    p.add_argument("--buoys", type=int)
+    p.add_argument("--clients", type=int)
+    p.add_argument("--position-days", type=int, default=Spec.position_days)
+    p.add_argument("--position-interval", type=int, default=Spec.position_interval, help="minutes")
+    p.add_argument("--sensor-days", type=int, default=Spec.sensor_days)
+    p.add_argument("--sensor-interval", type=int, default=Spec.sensor_interval, help="minutes")
+    p.add_argument("--order-days", type=int, default=Spec.order_days)
+    p.add_argument("--orders-per-month", type=float, default=Spec.orders_per_month)
+    p.add_argument("--seed", type=int, default=Spec.seed)
+    p.add_argument("--end", type=datetime.fromisoformat, help="last timestamp, e.g. 2025-01-01")
+    args = p.parse_args(argv)
+
+    spec = Spec(**{k: v for k, v in vars(args).items() if k not in ("out", "format")})
+    tables = generate(spec)
+    os.makedirs(args.out, exist_ok=True)
+    if args.format == "parquet":
+        write_parquet(tables, args.out)
+        target = args.out
+    else:
+        target = os.path.join(args.out, "seed.sql" if args.format == "sql" else "seed.copy.sql")
+        (write_sql if args.format == "sql" else write_copy)(tables, target)
+    for name, df in tables.items():
+        print(f"{name:<34} {len(df):>12,}")
+    print(f"Total {sum(len(df) for df in tables.values()):,} baris → {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""db/disk_cache.py — persistent L2 cache behind the in-memory repo caches
+
+    @reads("operation.orders")
+    @st.cache_data(ttl=300)       # L1: per process
+    @persist(ttl=300)             # L2: SQLite on disk, shared by every worker and restart
+    @typed
+    def get_x() -> pd.DataFrame: ...
+
+An L1 miss asks L2 before Supabase. Entries expire `ttl` seconds after the fetch, so
+a copy read from disk is never older than the function's own TTL (L1 may keep it for
+one more TTL, as it would after any fetch). DataFrames are stored as Arrow IPC
+(categoricals, float32 and UTC timestamps survive the round trip), everything else
+pickled. The file is bounded by $MARINE_L2_MB (default 512) with LRU eviction.
+
+Keys carry a salt of _SCHEMA_VERSION and the db/ sources, so a deploy never reads
+frames of the old shape. Writes bump a per-table version kept in the same file; a
+fetch stores its result only if none of its @reads tables moved while it ran, in any
+worker, so a fetch racing a write cannot put the stale frame back.
+
+Enabled only for the Supabase backend: the offline backend is an in-memory database
+per process, so its results must not outlive it. $MARINE_L2_PATH overrides the file
+location (default build/cache/l2.sqlite); "off" disables L2.
+"""
+from __future__ import annotations
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+from db.invalidation import generation, on_invalidate, tables_read
+
+logger = logging.getLogger(__name__)
+
+_ROOT      = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PATH      = os.environ.get("MARINE_L2_PATH", os.path.join(_ROOT, "build", "cache", "l2.sqlite"))
+_BUDGET_MB = float(os.environ.get("MARINE_L2_MB", 512))
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS entries (
+    key       TEXT PRIMARY KEY,
+    name      TEXT NOT NULL,
+    args      TEXT NOT NULL,
+    kind      TEXT NOT NULL,
+    payload   BLOB NOT NULL,
+    nbytes    INTEGER NOT NULL,
+    fetched   REAL NOT NULL,
+    expires   REAL NOT NULL,
+    accessed  REAL NOT NULL,
+    hits      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_name     ON entries(name);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed);
+CREATE TABLE IF NOT EXISTS versions (
+    tbl       TEXT PRIMARY KEY,
+    version   INTEGER NOT NULL
+);
+"""
+# Bump when a stored value changes shape for a reason the source digest below can't see
+# (pandas/pyarrow upgrade, serialization format).
+_SCHEMA_VERSION = 2
+
+
+# ── Serialization ────────────────────────────────────────────────────────────
+def _dump(value) -> tuple[str, bytes]:
+    if isinstance(value, pd.DataFrame):
+        try:
+            table = pa.Table.from_pandas(value, preserve_index=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):      # mixed-type object columns (JSON blobs)
+            table = None
+        if table is not None:
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return "arrow", sink.getvalue().to_pybytes()
+    return "pickle", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load(kind: str, payload: bytes):
+    if kind == "arrow":
+        return pa.ipc.open_stream(payload).read_all().to_pandas()
+    return pickle.loads(payload)
+
+
+# ── Store ────────────────────────────────────────────────────────────────────
+class DiskCache:
+    """SQLite-backed key/value store with per-entry expiry and an LRU byte budget."""
+
+    def __init__(self, path: str, budget_bytes: int):
+        self.path   = path
+        self.budget = budget_bytes
+        self._lock  = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")        # other workers read while one writes
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_DDL)
+
+    def get(self, key: str):
+        """Return (value, fetched_at) of a fresh entry, else None."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT kind, payload, fetched FROM entries WHERE key = ? AND expires > ?",
+                                   (key, now)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE entries SET accessed = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        return _load(row[0], row[1]), row[2]
+
+    def versions(self, tables: tuple[str, ...]) -> dict[str, int]:
+        """Shared write versions of tables (every worker bumps the same rows)."""
+        if not tables:
+            return {}
+        with self._lock:
+            rows = self._db.execute(f"SELECT tbl, version FROM versions WHERE tbl IN ({','.join('?' * len(tables))})",
+                                    tables).fetchall()
+        return {t: dict(rows).get(t, 0) for t in tables}
+
+    def bump(self, tables: tuple[str, ...]) -> None:
+        with self._lock:
+            self._db.executemany("INSERT INTO versions VALUES (?, 1) "
+                                 "ON CONFLICT(tbl) DO UPDATE SET version = version + 1", [(t,) for t in tables])
+
+    def put(self, key: str, name: str, args: str, value, ttl: float,
+            seen: dict[str, int] | None = None) -> bool:
+        """Store value unless a table in seen was written (by any worker) since those versions were read."""
+        kind, payload = _dump(value)
+        if len(payload) > self.budget:
+            return False
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")            # version check and insert as one step
+            try:
+                if seen:
+                    rows = dict(self._db.execute(
+                        f"SELECT tbl, version FROM versions WHERE tbl IN ({','.join('?' * len(seen))})",
+                        tuple(seen)).fetchall())
+                    if any(rows.get(t, 0) != v for t, v in seen.items()):
+                        self._db.execute("COMMIT")
+                        return False
+                self._db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                                 (key, name, args, kind, payload, len(payload), now, now + ttl, now))
+                self._evict()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return True
+
+    def _evict(self) -> None:
+        self._db.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),))
+        total = self._db.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+        if total <= self.budget:
+            return
+        excess = total - self.budget
+        for key, nbytes in self._db.execute("SELECT key, nbytes FROM entries ORDER BY accessed").fetchall():
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            excess -= nbytes
+            if excess <= 0:
+                break
+
+    def drop(self, name: str) -> None:
+        """Forget every entry of one function."""
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE name = ?", (name,))
+
+    def hot(self, limit: int) -> list[tuple[str, str]]:
+        """(name, args JSON) of the most used fresh entries, for warm starts."""
+        with self._lock:
+            return self._db.execute("SELECT name, args FROM entries WHERE expires > ? "
+                                    "ORDER BY hits DESC, accessed DESC LIMIT ?",
+                                    (time.time(), limit)).fetchall()
+
+    def stats(self) -> dict:
+        with self._lock:
+            n, size, hits = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0), COALESCE(SUM(hits), 0) FROM entries").fetchone()
+        return {"path": self.path, "entries": n, "bytes": size, "hits": hits}
+
+
+@st.cache_resource
+def get_disk_cache() -> DiskCache | None:
+    """Return the process-wide L2 store, or None when L2 is off for this backend."""
+    from db.connection import _backend
+    if _PATH.lower() in ("", "off", "0") or _backend() != "supabase":
+        return None
+    try:
+        return DiskCache(_PATH, int(_BUDGET_MB * 2**20))
+    except sqlite3.Error as e:
+        logger.error("L2 cache %s tidak bisa dibuka: %s", _PATH, e)
+        return None
+
+
+# ── Decorator ────────────────────────────────────────────────────────────────
+_persisted: dict[str, object] = {}      # qualname → persist wrapper, for warm_start()
+
+
+@functools.lru_cache(maxsize=1)
+def _salt() -> str:
+    """Digest of _SCHEMA_VERSION and every db/ source file.
+
+    A deploy that changes any repo function, a helper it calls, COLUMN_DTYPES or the
+    wire readers (sb_csv, sb_stream) gets new keys, so frames of the old shape are
+    never read back.
+    """
+    h = hashlib.sha1(str(_SCHEMA_VERSION).encode())
+    db_dir = os.path.join(_ROOT, "db")
+    for folder, dirs, files in sorted(os.walk(db_dir)):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(folder, name)
+                h.update(os.path.relpath(path, db_dir).encode())
+                with open(path, "rb") as f:
+                    h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+def _bump_shared(tables) -> None:
+    store = get_disk_cache()
+    if store is not None:
+        store.bump(tuple(tables))
+
+
+on_invalidate(_bump_shared)
+
+
+def persist(ttl: float):
+    """Back a repo function with the on-disk L2 cache (see module docstring)."""
+    def decorator(fn):
+        name   = f"{fn.__module__}.{fn.__qualname__}"
+        prefix = f"{name}@{_salt()}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            store = get_disk_cache()
+            if store is None:
+                return fn(*args, **kwargs)
+            arg_key = json.dumps([args, kwargs], default=str, sort_keys=True)
+            key     = f"{prefix}|{arg_key}"
+            try:
+                hit = store.get(key)
+            except (sqlite3.Error, pa.ArrowException, pickle.UnpicklingError) as e:
+                logger.warning("L2 baca %s gagal: %s", name, e)
+                hit = None
+            if hit is not None:
+                return hit[0]
+            gen = generation(name)
+            try:
+                seen = store.versions(tables_read(name))
+            except sqlite3.Error as e:
+                logger.warning("L2 versi %s gagal: %s", name, e)
+                return fn(*args, **kwargs)
+            value = fn(*args, **kwargs)
+            if generation(name) == gen:      # this process: no write since the fetch started
+                try:
+                    store.put(key, name, arg_key, value, ttl, seen)   # every process: same, in the file
+                except (sqlite3.Error, pickle.PicklingError, TypeError) as e:
+                    logger.warning("L2 tulis %s gagal: %s", name, e)
+            return value
+
+        def clear_l2():
+            store = get_disk_cache()
+            if store is not None:
+                store.drop(name)
+
+        # not .clear: st.cache_data copies the wrapped function's __dict__ over its own methods
+        wrapper.clear_l2 = clear_l2
+        _persisted[name] = wrapper
+        return wrapper
+    return decorator
+
+
+def warm_start(limit: int = 50) -> int:
+    """Replay the hottest fresh L2 keys through their public functions to fill L1.
+
+    Resolves each stored name to the outermost cached function (module attribute), so
+    the call lands in st.cache_data / shared_frame as a normal miss served from disk.
+    Returns the number of keys restored.
+    """
+    store = get_disk_cache()
+    if store is None:
+        return 0
+    restored = 0
+    for name, arg_key in store.hot(limit):
+        if name not in _persisted:
+            continue
+        module, _, attr = name.rpartition(".")
+        fn = getattr(__import__(module, fromlist=[attr]), attr, None)
+        try:
+            args, kwargs = json.loads(arg_key)
+            fn(*args, **kwargs)
+            restored += 1
+        except Exception as e:
+            logger.warning("warm start %s gagal: %s", name, e)
+    logger.info("L2 warm start: %d key dipulihkan", restored)
+    return restored
@@ -0,0 +1,904 @@
+"""db/fake.py — in-memory Supabase stand-in (SQLite) for offline benchmarks and tests
+
+Builds every table from assets/sql/table.sql, loads assets/sql/dummy_data.sql and
+answers the PostgREST query-builder subset the repos use:
+schema().table().select/eq/neq/gt/gte/lt/lte/in_/is_/not_/or_/order/limit/csv,
+insert/update/delete, plus rpc("aggregate_rows") and the operation.v_* views.
+
+Enable with env MARINE_DB_BACKEND=fake or ``backend = "fake"`` under [DB_ACCESS]
+in .streamlit/secrets.toml. MARINE_FAKE_SEED overrides the seeds (os.pathsep list of SQL
+files or Parquet directories, e.g. the output of ``python -m db.datagen``).
+"""
+from __future__ import annotations
+import csv
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+import httpx
+import pandas as pd
+from postgrest.exceptions import APIError
+
+logger = logging.getLogger(__name__)
+
+_SQL_DIR      = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "sql")
+SCHEMA_FILE   = os.path.join(_SQL_DIR, "table.sql")
+DEFAULT_SEED  = (os.path.join(_SQL_DIR, "dummy_data.sql"),)
+_BASE_URL     = "http://fake.supabase.local/rest/v1"
+_TS_FMT       = "%Y-%m-%dT%H:%M:%S.%f"
+
+_KINDS = {
+    "serial": "int", "serial4": "int", "serial8": "int", "int": "int", "int2": "int", "int4": "int",
+    "int8": "int", "integer": "int", "smallint": "int", "bigint": "int",
+    "float4": "float", "float8": "float", "double": "float", "real": "float", "numeric": "float",
+    "decimal": "float", "bool": "bool", "boolean": "bool", "timestamp": "ts", "timestamptz": "ts",
+    "date": "date", "time": "time", "json": "json", "jsonb": "json",
+}
+_AFFINITY = {"int": "INTEGER", "bool": "INTEGER", "float": "REAL"}
+_CMP      = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+_AGG      = {"count": "count({})", "count_distinct": "count(DISTINCT {})", "sum": "sum({})",
+             "avg": "avg({})", "min": "min({})", "max": "max({})"}
+_TRUNC    = {
+    "day":   "substr({0}, 1, 10) || 'T00:00:00'",
+    "week":  "date(substr({0}, 1, 10), '-6 days', 'weekday 1') || 'T00:00:00'",
+    "month": "substr({0}, 1, 7) || '-01T00:00:00'",
+    "year":  "substr({0}, 1, 4) || '-01-01T00:00:00'",
+}
+# relations operation.aggregate_rows accepts (same list as in table.sql)
+_AGGREGATABLE = frozenset({
+    ("operation", "clients"), ("operation", "orders"), ("operation", "payments"),
+    ("operation", "v_payment_industries"), ("operation", "v_vessel_latest_activity"),
+})
+_NOW = object()   # DEFAULT NOW()
+
+# SQLite has no DISTINCT ON / LATERAL: same rows as the views in table.sql.
+# Each view lists every base table it selects from (column kinds come from the first that has the column).
+_VIEWS = {
+    ("operation", "v_vessel_latest_activity"): ("""
+        SELECT id_vessel, seq_activity, status FROM (
+            SELECT id_vessel, seq_activity, status,
+                   row_number() OVER (PARTITION BY id_vessel ORDER BY seq_activity DESC) AS rn
+            FROM vessel_activities) WHERE rn = 1""", ("vessel_activities",)),
+    ("operation", "v_vessel_latest_position"): ("""
+        SELECT id, id_vessel, id_activity, latitude, longitude, speed, heading, created_at FROM (
+            SELECT p.*, row_number() OVER (PARTITION BY p.id_vessel ORDER BY p.created_at DESC) AS rn
+            FROM vessel_positions p JOIN vessels v ON v.code_vessel = p.id_vessel) WHERE rn = 1""",
+        ("vessel_positions", "vessels")),
+    ("operation", "v_payment_industries"): ("""
+        SELECT p.id_order, p.total_amount, p.payment_date, p.status, c.industry
+        FROM payments p
+        JOIN orders  o ON o.code_order  = p.id_order
+        JOIN clients c ON c.code_client = o.id_client""", ("payments", "orders", "clients")),
+}
+
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _utcnow() -> datetime:
+    # Postgres `timestamp` columns hold UTC wall time without an offset
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# ── Value coercion (Python / PostgREST strings ⇄ SQLite storage) ────────────
+def _to_ts(v) -> datetime:
+    if isinstance(v, datetime):
+        ts = v
+    elif isinstance(v, date):
+        ts = datetime.combine(v, time())
+    else:
+        ts = datetime.fromisoformat(str(v).strip().replace(" ", "T", 1))
+    return ts.replace(tzinfo=None)   # a literal cast to `timestamp` drops the offset
+
+
+def _to_db(kind: str, v):
+    if v is None:
+        return None
+    if kind == "ts":
+        return _to_ts(v).strftime(_TS_FMT)
+    if kind == "date":
+        return _to_ts(v).date().isoformat()
+    if kind == "time":
+        return v.isoformat() if isinstance(v, time) else str(v)
+    if kind == "bool":
+        return int(v if isinstance(v, (bool, int)) else str(v).lower() in ("true", "t", "1"))
+    if kind == "int":
+        return v if isinstance(v, int) else int(float(v))
+    if kind == "float":
+        return float(v)
+    if kind == "json":
+        return v if isinstance(v, str) else json.dumps(v)
+    return v if isinstance(v, str) else str(v)
+
+
+def _to_db_series(kind: str, s: pd.Series) -> pd.Series:
+    """Vectorised _to_db for bulk loads; NaN/NaT become None."""
+    if kind in ("ts", "date"):
+        ts = pd.to_datetime(s, format="mixed")
+        if ts.dt.tz is not None:
+            ts = ts.dt.tz_localize(None)
+        out = ts.dt.strftime(_TS_FMT if kind == "ts" else "%Y-%m-%d")
+    elif kind == "int":
+        out = pd.to_numeric(s).astype("Int64")
+    elif kind == "float":
+        out = pd.to_numeric(s).astype(float)
+    elif kind == "bool":
+        out = s.map(lambda v: _to_db("bool", v))
+    elif kind == "json":
+        out = s.map(lambda v: _to_db("json", v))
+    else:
+        out = s.astype(str)
+    return out.astype(object).where(s.notna(), None)
+
+
+def _from_db(kind: str, v):
+    if v is None:
+        return None
+    if kind == "bool":
+        return bool(v)
+    if kind == "json":
+        try:
+            return json.loads(v)
+        except ValueError:
+            return v
+    return v
+
+
+def _infer_kind(v) -> str:
+    if isinstance(v, bool):
+        return "bool"
+    if isinstance(v, int):
+        return "int"
+    if isinstance(v, float):
+        return "float"
+    if isinstance(v, (dict, list)):
+        return "json"
+    if isinstance(v, datetime):
+        return "ts"
+    return "text"
+
+
+# ── DDL parsing (assets/sql/table.sql) ───────────────────────────────────────
+@dataclass
+class _Table:
+    schema: str
+    name: str
+    kinds: dict[str, str]
+    defaults: dict[str, object] = field(default_factory=dict)
+    serial: list[str] = field(default_factory=list)
+    code: tuple[str, str] | None = None     # (column, prefix) from generate_code_auto
+    counters: dict[str, int] = field(default_factory=dict)
+    view: bool = False
+
+
+_CREATE_RE    = re.compile(r'CREATE TABLE\s+(\w+)\."?(\w+)"?\s*\((.*?)\n\s*\)', re.S | re.I)
+_PARTITION_RE = re.compile(r'CREATE TABLE\s+(\w+)\."?(\w+)"?\s+PARTITION OF\s+(\w+)\."?(\w+)"?', re.I)
+_INDEX_RE     = re.compile(r'CREATE (UNIQUE )?INDEX\s+(\w+)\s+ON\s+(\w+)\."?(\w+)"?\s+USING btree\s*\(([^)]*)\)', re.I)
+_PREFIX_RE    = re.compile(r"TG_TABLE_NAME = '(\w+)' THEN prefix := '(\w+)'")
+_TRIGGER_RE   = re.compile(r"BEFORE INSERT ON (\w+)\.(\w+) .*?WHEN \(NEW\.(\w+) IS NULL\)")
+_COLUMN_RE    = re.compile(r'"?(\w+)"?\s+(\w+)')
+_DEFAULT_RE   = re.compile(r"DEFAULT\s+('(?:[^']|'')*'|[\w.\-]+(?:\(\))?)", re.I)
+_SKIP_WORDS   = ("CONSTRAINT", "PRIMARY", "UNIQUE", "FOREIGN", "CHECK")
+
+
+def _parse_default(raw: str):
+    if raw.upper() in ("NOW()", "CURRENT_TIMESTAMP"):
+        return _NOW
+    if raw.startswith("'"):
+        return raw[1:-1].replace("''", "'")
+    if raw.lower() in ("true", "false"):
+        return raw.lower() == "true"
+    try:
+        return float(raw) if "." in raw else int(raw)
+    except ValueError:
+        return None
+
+
+def _parse_ddl(sql: str) -> tuple[dict, dict, list]:
+    """Tables, partition aliases and indexes declared in a DDL script."""
+    tables: dict[tuple[str, str], _Table] = {}
+    for schema, name, body in _CREATE_RE.findall(sql):
+        t = _Table(schema, name, {})
+        for line in body.splitlines():
+            line = line.split("--", 1)[0].strip().rstrip(",")
+            if not line or line.upper().startswith(_SKIP_WORDS):
+                continue
+            m = _COLUMN_RE.match(line)
+            if not m:
+                continue
+            col, typ = m.group(1), m.group(2).lower()
+            t.kinds[col] = _KINDS.get(typ, "text")
+            if typ.startswith("serial"):
+                t.serial.append(col)
+            d = _DEFAULT_RE.search(line)
+            if d:
+                t.defaults[col] = _parse_default(d.group(1))
+        tables[(schema, name)] = t
+
+    prefixes = dict(_PREFIX_RE.findall(sql))
+    for schema, name, col in _TRIGGER_RE.findall(sql):
+        if (schema, name) in tables and name in prefixes:
+            tables[(schema, name)].code = (col, prefixes[name])
+
+    aliases = {(s, n): (ps, pn) for s, n, ps, pn in _PARTITION_RE.findall(sql)}
+    indexes = [(uniq, idx, s, n, cols) for uniq, idx, s, n, cols in _INDEX_RE.findall(sql)]
+    return tables, aliases, indexes
+
+
+# ── Seed parsing (INSERT … VALUES with NOW()/CURRENT_DATE ± INTERVAL) ─────────
+_TOKEN_RE = re.compile(r"""\s*(?:--[^\n]*\n\s*)*(?:
+      (?P<str>'(?:[^']|'')*')
+    | (?P<interval>INTERVAL\s*'[^']*')
+    | (?P<num>\d+(?:\.\d+)?)
+    | (?P<word>[A-Za-z_][\w.]*(?:\(\))?)
+    | (?P<op>[-+(),;])
+)""", re.X | re.I)
+_INSERT_RE   = re.compile(r'^\s*INSERT INTO\s+(\w+)\."?(\w+)"?\s*\(([^)]*)\)\s*VALUES', re.M | re.I)
+_INTERVAL_RE = re.compile(r"(-?\d+)\s*(\w+)")
+_COPY_RE     = re.compile(r'^COPY\s+(\w+)\."?(\w+)"?\s*\(([^)]*)\)\s+FROM stdin;\n(.*?)^\\\.$', re.M | re.S)
+
+
+@dataclass
+class _Interval:
+    months: int = 0
+    delta: timedelta = timedelta()
+
+    def apply(self, base, sign: int):
+        ts = base if isinstance(base, datetime) else datetime.combine(base, time())
+        if self.months:
+            ts = (pd.Timestamp(ts) + pd.DateOffset(months=sign * self.months)).to_pydatetime()
+        return ts + sign * self.delta
+
+
+def _parse_interval(text: str) -> _Interval:
+    body = text[text.index("'") + 1:-1].strip()
+    if ":" in body:
+        parts = [int(p) for p in body.split(":")] + [0]
+        return _Interval(delta=timedelta(hours=parts[0], minutes=parts[1], seconds=parts[2]))
+    iv = _Interval()
+    for n, unit in _INTERVAL_RE.findall(body):
+        n, unit = int(n), unit.lower().rstrip("s")
+        if unit in ("month", "mon"):
+            iv.months += n
+        elif unit == "year":
+            iv.months += 12 * n
+        else:
+            iv.delta += timedelta(**{unit + "s": n})
+    return iv
+
+
+class _Tokens:
+    def __init__(self, text: str, pos: int):
+        self.text, self.pos = text, pos
+
+    def next(self) -> tuple[str, str]:
+        m = _TOKEN_RE.match(self.text, self.pos)
+        if not m or m.end() == self.pos:
+            raise ValueError(f"seed: token tak dikenal di posisi {self.pos}")
+        self.pos = m.end()
+        return m.lastgroup, m.group(m.lastgroup)
+
+    def peek(self) -> tuple[str, str]:
+        pos = self.pos
+        try:
+            return self.next()
+        finally:
+            self.pos = pos
+
+
+def _primary(tok: _Tokens, now: datetime):
+    kind, text = tok.next()
+    if kind == "str":
+        return text[1:-1].replace("''", "'")
+    if kind == "num":
+        return float(text) if "." in text else int(text)
+    if kind == "interval":
+        return _parse_interval(text)
+    if kind == "op" and text == "-":
+        return -_primary(tok, now)
+    if kind == "op" and text == "(":
+        value = _expr(tok, now)
+        tok.next()   # ")"
+        return value
+    word = text.upper()
+    if word in ("NOW()", "CURRENT_TIMESTAMP"):
+        return now
+    if word == "CURRENT_DATE":
+        return now.date()
+    if word in ("TRUE", "FALSE"):
+        return word == "TRUE"
+    if word == "NULL":
+        return None
+    raise ValueError(f"seed: ekspresi tidak didukung: {text}")
+
+
+def _expr(tok: _Tokens, now: datetime):
+    value = _primary(tok, now)
+    while tok.peek() in (("op", "+"), ("op", "-")):
+        sign = 1 if tok.next()[1] == "+" else -1
+        rhs  = _primary(tok, now)
+        if isinstance(rhs, _Interval):
+            value = rhs.apply(value, sign)
+        else:
+            value = value + sign * rhs
+    return value
+
+
+def _parse_inserts(sql: str, now: datetime):
+    """Yield (schema, table, columns, rows) for every INSERT … VALUES statement."""
+    pos = 0
+    while True:
+        m = _INSERT_RE.search(sql, pos)
+        if not m:
+            return
+        schema, table = m.group(1), m.group(2)
+        columns = [c.strip().strip('"') for c in m.group(3).split(",")]
+        tok, rows = _Tokens(sql, m.end()), []
+        while True:
+            tok.next()                     # "("
+            row = [_expr(tok, now)]
+            while tok.next()[1] == ",":
+                row.append(_expr(tok, now))
+            rows.append(row)               # consumed ")"
+            if tok.next()[1] == ";":
+                break
+        pos = tok.pos
+        yield schema, table, columns, rows
+
+
+# ── Database ─────────────────────────────────────────────────────────────────
+def _copy_unescape(m: re.Match) -> str:
+    return {"t": "\t", "n": "\n", "r": "\r"}.get(m.group(1), m.group(1))
+
+
+class FakeDatabase:
+    """One shared SQLite connection (one attached database per Postgres schema)."""
+
+    def __init__(self, schema_sql: str):
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.tables, self.aliases, indexes = _parse_ddl(schema_sql)
+        self.schemas = {s for s, _ in self.tables} | {s for s, _ in _VIEWS}
+        for schema in sorted(self.schemas):
+            self.conn.execute(f"ATTACH DATABASE ':memory:' AS {_q(schema)}")
+        for t in self.tables.values():
+            self._create(t)
+        for uniq, idx, schema, name, cols in indexes:
+            if (schema, name) in self.tables:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {_q(schema)}.{_q(idx)} "
+                                  f"ON {_q(name)} ({cols})")
+        for (schema, name), (sql, bases) in _VIEWS.items():
+            self.conn.execute(f"CREATE VIEW {_q(schema)}.{_q(name)} AS {sql}")
+            cols  = [r[1] for r in self.conn.execute(f"PRAGMA {_q(schema)}.table_info({_q(name)})")]
+            kinds = {}
+            for base in bases:
+                kinds = {**self.tables[(schema, base)].kinds, **kinds}
+            self.tables[(schema, name)] = _Table(schema, name, {c: kinds.get(c, "text") for c in cols},
+                                                 view=True)
+
+    def _create(self, t: _Table):
+        cols = ", ".join(f"{_q(c)} {_AFFINITY.get(k, 'TEXT')}" for c, k in t.kinds.items())
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {_q(t.schema)}.{_q(t.name)} ({cols})")
+
+    def resolve(self, schema: str, name: str, create_from: list[dict] | None = None) -> _Table | None:
+        """Table meta; unknown tables are created on first insert (lenient, like a fresh migration)."""
+        key = self.aliases.get((schema, name), (schema, name))
+        t = self.tables.get(key)
+        if t is None and create_from:
+            kinds = {"id": "int"}
+            for row in create_from:
+                for c, v in row.items():
+                    if v is not None:
+                        kinds.setdefault(c, _infer_kind(v))
+                    else:
+                        kinds.setdefault(c, "text")
+            kinds.setdefault("created_at", "ts")
+            t = self.tables[key] = _Table(*key, kinds, defaults={"created_at": _NOW}, serial=["id"])
+            if key[0] not in self.schemas:
+                self.conn.execute(f"ATTACH DATABASE ':memory:' AS {_q(key[0])}")
+                self.schemas.add(key[0])
+            self._create(t)
+            logger.info("fake: tabel %s.%s dibuat dari insert", *key)
+        return t
+
+    def insert(self, t: _Table, rows: list[dict], now: datetime | None = None) -> list[dict]:
+        now = now or _utcnow()
+        out = []
+        with self.lock:
+            for col in t.serial + ([t.code[0]] if t.code else []):
+                if col not in t.counters:
+                    t.counters[col] = self._max_counter(t, col)
+            for row in rows:
+                full = {}
+                for col, kind in t.kinds.items():
+                    if col in row:
+                        value = row[col]
+                    elif col in t.serial:
+                        t.counters[col] += 1
+                        value = t.counters[col]
+                    else:
+                        value = t.defaults.get(col)
+                        value = now if value is _NOW else value
+                    full[col] = value
+                if t.code and full.get(t.code[0]) is None:
+                    col, prefix = t.code
+                    t.counters[col] += 1
+                    full[col] = f"{prefix}{t.counters[col]:03d}"
+                for col in t.serial:
+                    if isinstance(full[col], int):
+                        t.counters[col] = max(t.counters[col], full[col])
+                if t.code:
+                    col, prefix = t.code
+                    suffix = str(full[col])[len(prefix):]
+                    if str(full[col]).startswith(prefix) and suffix.isdigit():
+                        t.counters[col] = max(t.counters[col], int(suffix))
+                unknown = set(row) - set(t.kinds)
+                if unknown:
+                    raise APIError({"message": f"Could not find the '{sorted(unknown)[0]}' column "
+                                               f"of '{t.name}' in the schema cache", "code": "PGRST204"})
+                out.append({c: _to_db(t.kinds[c], v) for c, v in full.items()})
+            cols = list(t.kinds)
+            self.conn.executemany(
+                f"INSERT INTO {_q(t.schema)}.{_q(t.name)} ({', '.join(map(_q, cols))}) "
+                f"VALUES ({', '.join('?' * len(cols))})",
+                [tuple(r[c] for c in cols) for r in out])
+        return [{c: _from_db(t.kinds[c], v) for c, v in r.items()} for r in out]
+
+    def _max_counter(self, t: _Table, col: str) -> int:
+        expr = _q(col) if col in t.serial else f"CAST(substr({_q(col)}, {len(t.code[1]) + 1}) AS INTEGER)"
+        where = "" if col in t.serial else f" WHERE {_q(col)} LIKE '{t.code[1]}%'"
+        value = self.conn.execute(f"SELECT max({expr}) FROM {_q(t.schema)}.{_q(t.name)}{where}").fetchone()[0]
+        return int(value or 0)
+
+    def query(self, sql: str, params=()) -> tuple[list[str], list[tuple]]:
+        with self.lock:
+            cur  = self.conn.execute(sql, params)
+            rows = cur.fetchall()
+            cols = [d[0] for d in cur.description] if cur.description else []
+        return cols, rows
+
+    def load_frame(self, schema: str, name: str, df: pd.DataFrame) -> int:
+        """Bulk-load a DataFrame (COPY / Parquet seeds): vectorised coercion, no per-row dicts."""
+        t = self.resolve(schema, name, create_from=df.head(1).to_dict("records"))
+        unknown = set(df.columns) - set(t.kinds)
+        if unknown:
+            raise ValueError(f"seed: kolom {sorted(unknown)} tidak ada di {schema}.{name}")
+        df, n = df.copy(), len(df)
+        if not n:
+            return 0
+        with self.lock:
+            for col in t.serial:
+                start = self._max_counter(t, col)
+                if col not in df:
+                    df[col] = range(start + 1, start + n + 1)
+                t.counters[col] = max(start, int(pd.to_numeric(df[col]).max() or 0))
+            if t.code:
+                col, prefix = t.code
+                start = self._max_counter(t, col)
+                if col not in df:
+                    df[col] = [f"{prefix}{i:03d}" for i in range(start + 1, start + n + 1)]
+                suffix = pd.to_numeric(df[col].astype(str).str[len(prefix):], errors="coerce")
+                t.counters[col] = max(start, int(suffix.max()) if suffix.notna().any() else 0)
+            now = _utcnow()
+            for col, default in t.defaults.items():
+                if col not in df:
+                    df[col] = now if default is _NOW else default
+            cols = [c for c in t.kinds if c in df]
+            out  = pd.DataFrame({c: _to_db_series(t.kinds[c], df[c]) for c in cols})
+            self.conn.executemany(
+                f"INSERT INTO {_q(t.schema)}.{_q(t.name)} ({', '.join(map(_q, cols))}) "
+                f"VALUES ({', '.join('?' * len(cols))})",
+                out.itertuples(index=False, name=None))
+        return n
+
+    def load_sql(self, sql: str) -> int:
+        """Run the INSERT and COPY … FROM stdin blocks of a seed script; returns rows loaded."""
+        now, total = _utcnow(), 0
+        for schema, name, columns, values in _parse_inserts(sql, now):
+            rows = [dict(zip(columns, v)) for v in values]
+            t = self.resolve(schema, name, create_from=rows)
+            total += len(self.insert(t, rows, now=now))
+        for schema, name, columns, block in _COPY_RE.findall(sql):
+            df = pd.read_csv(io.StringIO(block), sep="\t", header=None, dtype=str,
+                             names=[c.strip().strip('"') for c in columns.split(",")],
+                             na_values=["\\N"], keep_default_na=False, quoting=csv.QUOTE_NONE)
+            df = df.apply(lambda c: c.str.replace(r"\\(.)", _copy_unescape, regex=True))
+            total += self.load_frame(schema, name, df)
+        return total
+
+    def load_parquet(self, directory: str) -> int:
+        """Load every <schema>.<table>.parquet file in a directory (db/datagen.py output)."""
+        total = 0
+        for fname in sorted(os.listdir(directory)):
+            if fname.endswith(".parquet") and fname.count(".") == 2:
+                schema, name, _ = fname.split(".")
+                total += self.load_frame(schema, name, pd.read_parquet(os.path.join(directory, fname)))
+        return total
+
+
+# ── Query builder ────────────────────────────────────────────────────────────
+@dataclass
+class FakeResponse:
+    data: object
+    count: int | None = None
+
+
+def _split_top(text: str) -> list[str]:
+    """Split a PostgREST logic string on top-level commas (respecting quotes and parens)."""
+    parts, depth, quoted, cur = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and ch == "," and depth == 0:
+            parts.append("".join(cur))
+            cur = []
+            continue
+        cur.append(ch)
+    parts.append("".join(cur))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _unquote(v: str) -> str:
+    return v[1:-1] if len(v) >= 2 and v[0] == v[-1] == '"' else v
+
+
+def _parse_logic(text: str) -> list[tuple]:
+    nodes = []
+    for part in _split_top(text):
+        negate = part.startswith("not.")
+        part   = part[4:] if negate else part
+        for op in ("and", "or"):
+            if part.startswith(op + "("):
+                nodes.append((op, _parse_logic(part[len(op) + 1:-1]), negate))
+                break
+        else:
+            col, rest = part.split(".", 1)
+            if rest.startswith("not."):
+                negate, rest = not negate, rest[4:]
+            op, value = rest.split(".", 1)
+            if op == "in":
+                nodes.append(("in", col, [_unquote(v) for v in _split_top(value[1:-1])], negate))
+            elif op == "is":
+                nodes.append(("is", col, value, negate))
+            else:
+                nodes.append(("cmp", col, op, _unquote(value), negate))
+    return nodes
+
+
+class FakeQuery:
+    """Mirror of postgrest's SyncRequestBuilder chain, executed against SQLite."""
+
+    def __init__(self, client: "FakeSchemaClient", table: str):
+        self._client  = client
+        self._db      = client.db
+        self._schema  = client.schema_name
+        self._table   = table
+        self._method  = "GET"
+        self._select  = "*"
+        self._payload = None
+        self._nodes: list[tuple] = []
+        self._order: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+        self._negate  = False
+        self._csv     = False
+        self._params: list[tuple[str, str]] = []
+
+    # builders
+    def select(self, *columns: str, count=None):
+        self._select = ",".join(columns) or "*"
+        self._params.append(("select", self._select))
+        return self
+
+    def insert(self, json, **kwargs):
+        self._method, self._payload = "POST", json if isinstance(json, list) else [json]
+        return self
+
+    def update(self, json, **kwargs):
+        self._method, self._payload = "PATCH", json
+        return self
+
+    def delete(self, **kwargs):
+        self._method = "DELETE"
+        return self
+
+    @property
+    def not_(self):
+        self._negate = True
+        return self
+
+    def _add(self, node: tuple, param: tuple[str, str]):
+        negate, self._negate = self._negate, False
+        self._nodes.append((*node, negate))
+        self._params.append((param[0], ("not." if negate else "") + param[1]))
+        return self
+
+    def eq(self, column, value):  return self._add(("cmp", column, "eq", value), (column, f"eq.{value}"))
+    def neq(self, column, value): return self._add(("cmp", column, "neq", value), (column, f"neq.{value}"))
+    def gt(self, column, value):  return self._add(("cmp", column, "gt", value), (column, f"gt.{value}"))
+    def gte(self, column, value): return self._add(("cmp", column, "gte", value), (column, f"gte.{value}"))
+    def lt(self, column, value):  return self._add(("cmp", column, "lt", value), (column, f"lt.{value}"))
+    def lte(self, column, value): return self._add(("cmp", column, "lte", value), (column, f"lte.{value}"))
+
+    def in_(self, column, values):
+        values = list(values)
+        return self._add(("in", column, values), (column, f"in.({','.join(map(str, values))})"))
+
+    def is_(self, column, value):
+        value = "null" if value is None else str(value).lower()
+        return self._add(("is", column, value), (column, f"is.{value}"))
+
+    def or_(self, filters: str, reference_table=None):
+        return self._add(("or", _parse_logic(filters)), ("or", f"({filters})"))
+
+    def order(self, column, *, desc: bool = False, nullsfirst=None, foreign_table=None):
+        self._order.append((column, desc, nullsfirst))
+        self._params.append(("order", f"{column}.{'desc' if desc else 'asc'}"))
+        return self
+
+    def limit(self, size: int, *, foreign_table=None):
+        self._limit = int(size)
+        self._params.append(("limit", str(size)))
+        return self
+
+    def csv(self):
+        self._csv = True
+        return self
+
+    # compile
+    def _column(self, t: _Table, col: str) -> str:
+        if col not in t.kinds:
+            raise APIError({"message": f"column {t.name}.{col} does not exist", "code": "42703"})
+        return _q(col)
+
+    def _compile(self, t: _Table, node: tuple) -> tuple[str, list]:
+        kind, negate = node[0], node[-1]
+        if kind in ("and", "or"):
+            parts  = [self._compile(t, n) for n in node[1]]
+            sql    = f" {kind.upper()} ".join(f"({p})" for p, _ in parts) or "1"
+            params = [v for _, ps in parts for v in ps]
+        elif kind == "in":
+            col, values = node[1], node[2]
+            sql    = f"{self._column(t, col)} IN ({', '.join('?' * len(values))})" if values else "0"
+            params = [_to_db(t.kinds[col], v) for v in values]
+        elif kind == "is":
+            col, value = node[1], node[2]
+            sql    = f"{self._column(t, col)} IS " + {"null": "NULL", "true": "1", "false": "0"}[value]
+            params = []
+        else:
+            col, op, value = node[1], node[2], node[3]
+            if op not in _CMP:
+                raise APIError({"message": f"operator {op} tidak didukung fake backend", "code": "PGRST100"})
+            sql    = f"{self._column(t, col)} {_CMP[op]} ?"
+            params = [_to_db(t.kinds[col], value)]
+        return (f"NOT ({sql})" if negate else sql), params
+
+    def _where(self, t: _Table) -> tuple[str, list]:
+        if not self._nodes:
+            return "", []
+        parts = [self._compile(t, n) for n in self._nodes]
+        return " WHERE " + " AND ".join(p for p, _ in parts), [v for _, ps in parts for v in ps]
+
+    def _columns(self, t: _Table) -> list[str]:
+        if self._select.strip() == "*":
+            return list(t.kinds)
+        cols = [c.strip() for c in self._select.split(",") if c.strip()]
+        for c in cols:
+            self._column(t, c)
+        return cols
+
+    def _run(self) -> list[dict]:
+        t = self._db.resolve(self._schema, self._table,
+                             create_from=self._payload if self._method == "POST" else None)
+        if t is None:
+            return []                                   # unknown table: empty, like a fresh schema
+        if t.view and self._method != "GET":
+            raise APIError({"message": f'cannot modify view "{t.name}"', "code": "55000"})
+        if self._method == "POST":
+            return self._db.insert(t, self._payload)
+        target = f"{_q(t.schema)}.{_q(t.name)}"
+        where, params = self._where(t)
+        if self._method == "PATCH":
+            sets = {}
+            for c, v in self._payload.items():
+                self._column(t, c)
+                sets[c] = _to_db(t.kinds[c], v)
+            sql  = (f"UPDATE {target} SET {', '.join(f'{_q(c)} = ?' for c in sets)}{where} RETURNING *")
+            params = [*sets.values(), *params]
+            cols = list(t.kinds)
+        elif self._method == "DELETE":
+            sql, cols = f"DELETE FROM {target}{where} RETURNING *", list(t.kinds)
+        else:
+            cols = self._columns(t)
+            order = []
+            for col, desc, nullsfirst in self._order:
+                c = self._column(t, col)
+                term = f"{c} {'DESC' if desc else 'ASC'}"
+                # Postgres puts NULLs last on ASC, SQLite first; the extra sort key defeats the
+                # index, so only add it when the column actually holds NULLs.
+                if self._db.query(f"SELECT 1 FROM {target} WHERE {c} IS NULL LIMIT 1")[1]:
+                    first = desc if nullsfirst is None else nullsfirst
+                    term  = f"{c} IS NULL {'DESC' if first else 'ASC'}, {term}"
+                order.append(term)
+            sql = (f"SELECT {', '.join(map(_q, cols))} FROM {target}{where}"
+                   + (f" ORDER BY {', '.join(order)}" if order else "")
+                   + (f" LIMIT {self._limit}" if self._limit is not None else ""))
+        names, rows = self._db.query(sql, params)
+        return [{c: _from_db(t.kinds.get(c, "text"), v) for c, v in zip(names, r)} for r in rows]
+
+    def execute(self) -> FakeResponse:
+        return self._client._call(self._method, self._table, self._params, self._run,
+                                  as_csv=self._csv and self._method == "GET")
+
+
+def _to_csv(rows: list[dict]) -> str:
+    if not rows:
+        return ""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(rows[0].keys())
+    for r in rows:
+        writer.writerow(["" if v is None else ("true" if v is True else "false" if v is False
+                         else json.dumps(v) if isinstance(v, (dict, list)) else v) for v in r.values()])
+    return buf.getvalue()
+
+
+# ── RPC ──────────────────────────────────────────────────────────────────────
+def _aggregate_rows(db: FakeDatabase, params: dict) -> list[dict]:
+    """SQLite port of operation.aggregate_rows (same whitelist, same JSON shape)."""
+    if (params["p_schema"], params["p_table"]) not in _AGGREGATABLE:
+        raise APIError({"message": f'aggregate_rows: relation {params["p_schema"]}.{params["p_table"]} '
+                                   f'is not aggregatable', "code": "P0001"})
+    t = db.resolve(params["p_schema"], params["p_table"])
+    if t is None:
+        raise APIError({"message": f'relation "{params["p_schema"]}.{params["p_table"]}" does not exist',
+                        "code": "42P01"})
+
+    def col(name):
+        if name not in t.kinds:
+            raise APIError({"message": f'column "{name}" does not exist', "code": "42703"})
+        return _q(name)
+
+    select, group, where, args, out_kinds = [], [], [], [], {}
+    for item in params.get("p_group_by") or []:
+        if isinstance(item, str):
+            key, expr = item, col(item)
+            out_kinds[key] = t.kinds[item]
+        else:
+            if item.get("trunc") not in _TRUNC:
+                raise APIError({"message": f"aggregate_rows: unsupported trunc {item.get('trunc')}", "code": "P0001"})
+            key  = item.get("as") or item["col"]
+            expr = _TRUNC[item["trunc"]].format(col(item["col"]))
+        select.append(f"{expr} AS {_q(key)}")
+        group.append(expr)
+    for key, (fn, name) in (params.get("p_metrics") or {}).items():
+        if fn not in _AGG:
+            raise APIError({"message": f"aggregate_rows: unsupported aggregate {fn}", "code": "P0001"})
+        expr = "count(*)" if fn == "count" and name is None else _AGG[fn].format(col(name))
+        select.append(f"{expr} AS {_q(key)}")
+    if not select:
+        raise APIError({"message": "aggregate_rows: nothing to select", "code": "P0001"})
+    for name, op, value in params.get("p_filters") or []:
+        if op == "in":
+            where.append(f"{col(name)} IN ({', '.join('?' * len(value))})" if value else "0")
+            args += [_to_db(t.kinds[name], v) for v in value]
+        elif op in _CMP:
+            where.append(f"{col(name)} {_CMP[op]} ?")
+            args.append(_to_db(t.kinds[name], value))
+        else:
+            raise APIError({"message": f"aggregate_rows: unsupported operator {op}", "code": "P0001"})
+
+    sql = (f"SELECT {', '.join(select)} FROM {_q(t.schema)}.{_q(t.name)}"
+           + (f" WHERE {' AND '.join(where)}" if where else "")
+           + (f" GROUP BY {', '.join(group)}" if group else ""))
+    names, rows = db.query(sql, args)
+    return [{c: _from_db(out_kinds.get(c, "text"), v) for c, v in zip(names, r)} for r in rows]
+
+
+_RPCS = {("operation", "aggregate_rows"): _aggregate_rows}
+
+
+class FakeRPC:
+    def __init__(self, client: "FakeSchemaClient", fn: str, params: dict):
+        self._client, self._fn, self._params = client, fn, params
+
+    def execute(self) -> FakeResponse:
+        impl = _RPCS.get((self._client.schema_name, self._fn))
+        if impl is None:
+            raise APIError({"message": f"Could not find the function {self._client.schema_name}.{self._fn}",
+                            "code": "PGRST202"})
+        return self._client._call("POST", f"rpc/{self._fn}", [],
+                                  lambda: impl(self._client.db, self._params))
+
+
+# ── Clients ──────────────────────────────────────────────────────────────────
+class _Session:
+    """Stand-in for the PostgREST httpx session: only event_hooks, fired per fake request."""
+
+    def __init__(self):
+        self.event_hooks: dict[str, list] = {"request": [], "response": []}
+
+
+class FakeSchemaClient:
+    def __init__(self, db: FakeDatabase, schema: str):
+        self.db, self.schema_name, self.session = db, schema, _Session()
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: dict | None = None, **kwargs) -> FakeRPC:
+        return FakeRPC(self, fn, params or {})
+
+    def _call(self, method: str, path: str, params: list, run, as_csv: bool = False) -> FakeResponse:
+        """Run one request, firing the session's httpx hooks as a real round-trip would."""
+        hooks = self.session.event_hooks
+        request = None
+        if hooks["request"] or hooks["response"]:
+            request = httpx.Request(method, f"{_BASE_URL}/{path}", params=params,
+                                    headers={"accept-profile": self.schema_name})
+            for hook in hooks["request"]:
+                hook(request)
+        status, data, error = 200, None, None
+        try:
+            data = run()
+        except APIError as e:
+            status, error = 400, e
+        except (sqlite3.Error, ValueError, KeyError, TypeError) as e:
+            status, error = 400, APIError({"message": str(e), "code": "PGRST000"})
+        payload = _to_csv(data) if as_csv and error is None else data
+        if request is not None:
+            body = (payload.encode() if isinstance(payload, str)
+                    else json.dumps(error.message if error else payload, default=str).encode())
+            n = len(data) if isinstance(data, list) else 0
+            response = httpx.Response(status, content=body, request=request,
+                                      headers={"content-range": f"0-{n - 1}/*" if n else "*/0"})
+            for hook in hooks["response"]:
+                hook(response)
+        if error is not None:
+            raise error
+        return FakeResponse(payload)
+
+
+class FakeClient:
+    """Drop-in for supabase.Client as far as db/connection.py uses it."""
+
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+
+    def schema(self, name: str) -> FakeSchemaClient:
+        # a fresh client per call, like supabase.Client.schema()
+        return FakeSchemaClient(self.db, name)
+
+    def table(self, name: str) -> FakeQuery:
+        return self.schema("public").table(name)
+
+
+def create_fake_client(seed_files=None) -> FakeClient:
+    """Fresh in-memory database from table.sql plus the seeds (default dummy_data.sql).
+
+    A seed is an SQL script (INSERT and/or COPY … FROM stdin) or a directory of Parquet files.
+    """
+    if seed_files is None:
+        env = os.environ.get("MARINE_FAKE_SEED")
+        seed_files = env.split(os.pathsep) if env else DEFAULT_SEED
+    with open(SCHEMA_FILE, encoding="utf-8-sig") as f:
+        db = FakeDatabase(f.read())
+    for path in seed_files:
+        if os.path.isdir(path):
+            n = db.load_parquet(path)
+        else:
+            with open(path, encoding="utf-8-sig") as f:
+                n = db.load_sql(f.read())
+        logger.info("fake: %d baris dimuat dari %s", n, os.path.basename(path))
+    return FakeClient(db)
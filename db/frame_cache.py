@@ -0,0 +1,148 @@
+"""db/frame_cache.py — process-wide read-only DataFrame cache shared by all sessions"""
+from __future__ import annotations
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+import numpy as np
+import pandas as pd
+import streamlit as st
+from db.invalidation import generation
+
+_BUDGET_MB = float(os.environ.get("MARINE_FRAME_CACHE_MB", 256))
+
+
+@dataclass
+class FrameCacheStats:
+    entries: int = 0
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class _Entry:
+    __slots__ = ("frame", "nbytes", "expires")
+
+    def __init__(self, frame: pd.DataFrame, nbytes: int, expires: float):
+        self.frame   = frame
+        self.nbytes  = nbytes
+        self.expires = expires
+
+
+def freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy df once into one block per column with every buffer marked read-only."""
+    cols = {}
+    for name in df.columns:
+        values = df[name].array
+        if isinstance(values, pd.arrays.NumpyExtensionArray):
+            values = np.array(values.to_numpy(), copy=True)
+            values.flags.writeable = False
+        else:
+            values = values.copy()
+            backing = getattr(values, "_ndarray", None)     # datetime / categorical codes
+            if isinstance(backing, np.ndarray):
+                backing.flags.writeable = False
+        cols[name] = values
+    # copy=False keeps the per-column arrays as they are (no consolidation into 2D blocks)
+    return pd.DataFrame(cols, index=df.index, columns=df.columns, copy=False)
+
+
+def view(df: pd.DataFrame) -> pd.DataFrame:
+    """Zero-copy view for one caller: new columns/renames stay local, in-place writes raise."""
+    return df.copy(deep=False)
+
+
+class FrameCache:
+    """LRU of frozen frames bounded by a memory budget; each entry carries its own TTL."""
+
+    def __init__(self, budget_bytes: int):
+        self.budget  = budget_bytes
+        self._lock   = threading.Lock()
+        self._data: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._stats  = FrameCacheStats()
+
+    def get(self, key: tuple) -> pd.DataFrame | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry.expires <= time.monotonic():
+                self._stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+            return entry.frame
+
+    def put(self, key: tuple, frame: pd.DataFrame, ttl: float) -> pd.DataFrame:
+        nbytes = int(frame.memory_usage(index=True, deep=True).sum())   # cython can't read frozen objects
+        frozen = freeze(frame)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._stats.bytes -= old.nbytes
+            if nbytes <= self.budget:
+                self._data[key] = _Entry(frozen, nbytes, time.monotonic() + ttl)
+                self._stats.bytes += nbytes
+            while self._stats.bytes > self.budget and self._data:
+                _, evicted = self._data.popitem(last=False)
+                self._stats.bytes -= evicted.nbytes
+                self._stats.evictions += 1
+            self._stats.entries = len(self._data)
+        return frozen
+
+    def drop(self, name: str) -> None:
+        """Forget every entry of one function."""
+        with self._lock:
+            for key in [k for k in self._data if k[0] == name]:
+                self._stats.bytes -= self._data.pop(key).nbytes
+            self._stats.entries = len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return asdict(self._stats)
+
+    def usage(self) -> list[dict]:
+        """Per-function entry count and bytes, largest first."""
+        per: dict[str, dict] = {}
+        with self._lock:
+            for (name, *_), e in self._data.items():
+                row = per.setdefault(name, {"function": name, "entries": 0, "bytes": 0})
+                row["entries"] += 1
+                row["bytes"]   += e.nbytes
+        return sorted(per.values(), key=lambda r: r["bytes"], reverse=True)
+
+
+@st.cache_resource
+def get_frame_cache() -> FrameCache:
+    """Return the process-wide FrameCache (budget: $MARINE_FRAME_CACHE_MB, default 256)."""
+    return FrameCache(int(_BUDGET_MB * 2**20))
+
+
+def shared_frame(ttl: float):
+    """Cache a DataFrame-returning repo function once per process instead of per session.
+
+    Unlike @st.cache_data there is no pickling: every caller gets a zero-copy view of
+    one frozen frame. Callers may add or replace columns on their view but must not
+    write into existing ones (the buffers are read-only). Combine with ``@coalesce``
+    above it to keep concurrent misses to a single fetch.
+    """
+    def decorator(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = get_frame_cache()
+            key   = (name, args, tuple(sorted(kwargs.items())))
+            frame = cache.get(key)
+            if frame is None:
+                gen   = generation(name)
+                frame = fn(*args, **kwargs)
+                if generation(name) != gen:       # a write landed mid-fetch: serve, don't cache
+                    return frame
+                frame = cache.put(key, frame, ttl)
+            return view(frame)
+
+        wrapper.clear = lambda: get_frame_cache().drop(name)
+        return wrapper
+    return decorator
@@ -0,0 +1,154 @@
+"""db/invalidation.py — table-scoped cache invalidation for repo functions
+
+Read functions declare the tables they read with ``@reads`` (outermost, above the
+cache decorator); write helpers declare the tables they touch with ``@writes``. A
+write bumps the version of each touched table and clears only the caches that read
+it, instead of ``st.cache_data.clear()`` wiping every query for every session.
+Tables are named ``"schema.table"``; views count as the base tables they select from.
+"""
+from __future__ import annotations
+import functools
+import logging
+import threading
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+_lock     = threading.Lock()
+_versions: dict[str, int] = defaultdict(int)
+_readers:  dict[str, dict[str, object]] = defaultdict(dict)   # table → {qualname: cached fn}
+_tables:   dict[str, tuple[str, ...]] = {}                    # qualname → tables it reads
+_listeners: list = []                                         # callback(tables), see on_invalidate
+_requested: dict[tuple, float] = {}                           # _request_key(...) → last call outside warm-up
+
+
+def _name(fn) -> str:
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+def _layers(fn) -> list:
+    """The .clear of every cache layer stacked on fn (L1 decorators, the L2 disk cache)."""
+    clears = []
+    while fn is not None:
+        for attr in ("clear", "clear_l2"):
+            clear = getattr(fn, attr, None)
+            if clear is not None and clear not in clears:
+                clears.append(clear)
+        fn = getattr(fn, "__wrapped__", None)
+    return clears
+
+
+def _request_key(name: str, args: tuple, kwargs: dict) -> tuple:
+    """Key of one call in _requested; shared by the reads wrapper and last_requested."""
+    return (name, args, *sorted(kwargs.items()))
+
+
+def reads(*tables: str):
+    """Register a cached repo function as dependent on the given tables.
+
+    Invalidation clears every layer of the decorator stack: ``.clear()`` of
+    st.cache_data, shared_frame, swr and coalesce, ``.clear_l2()`` of the on-disk
+    persist layer; the wrapper's own ``.clear()`` does the same for one function. It
+    also notes when each (function, args) key was last requested outside the warm-up
+    threads (last_requested), so the scheduled warm-up only refreshes keys somebody
+    is reading.
+    """
+    def decorator(fn):
+        name = _name(fn)
+
+        @functools.wraps(fn)                   # copies helper attributes such as swr's .as_of
+        def wrapper(*args, **kwargs):
+            if not threading.current_thread().name.startswith("warmup"):
+                try:
+                    _requested[_request_key(name, args, kwargs)] = time.monotonic()
+                except TypeError:              # unhashable argument: not tracked
+                    pass
+            return fn(*args, **kwargs)
+
+        def clear() -> None:
+            for layer_clear in _layers(fn):
+                layer_clear()
+
+        # wraps() copies __dict__ only: st.cache_data's bound .clear would be lost
+        wrapper.clear = clear
+        with _lock:
+            _tables[name] = tables
+            for table in tables:
+                _readers[table][name] = fn
+        return wrapper
+    return decorator
+
+
+def last_requested(name: str, args: tuple = (), kwargs: dict | None = None) -> float | None:
+    """time.monotonic() of the last name(*args, **kwargs) call outside the warm-up threads, None if never."""
+    try:
+        return _requested.get(_request_key(name, args, kwargs or {}))
+    except TypeError:
+        return None
+
+
+def writes(*tables: str):
+    """Invalidate the given tables after the write helper returns, whatever the outcome.
+
+    Failed writes invalidate too: several helpers write more than one table and a
+    half-applied write must not stay hidden behind a cache.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                invalidate(*tables)
+        return wrapper
+    return decorator
+
+
+def invalidate(*tables: str) -> list[str]:
+    """Bump the version of each table and clear its readers; returns the cleared names."""
+    with _lock:
+        targets: dict[str, object] = {}
+        for table in tables:
+            _versions[table] += 1
+            targets.update(_readers.get(table, {}))
+    for listener in list(_listeners):
+        try:
+            listener(tables)
+        except Exception as e:
+            logger.error("listener invalidate %s gagal: %s", ", ".join(tables), e)
+    for name, fn in targets.items():
+        for clear in _layers(fn):
+            try:
+                clear()
+            except Exception as e:
+                logger.error("invalidate %s gagal: %s", name, e)
+    logger.info("invalidate %s → %d cache", ", ".join(tables), len(targets))
+    return list(targets)
+
+
+def on_invalidate(callback) -> None:
+    """Call callback(tables) on every invalidate(), before any cache is cleared."""
+    with _lock:
+        _listeners.append(callback)
+
+
+def tables_read(name: str) -> tuple[str, ...]:
+    """Tables a registered function reads (empty when it has no @reads)."""
+    with _lock:
+        return _tables.get(name, ())
+
+
+def generation(name: str) -> int:
+    """Sum of the versions of every table the function reads (changes on any write)."""
+    with _lock:
+        return sum(_versions[t] for t in _tables.get(name, ()))
+
+
+def dependency_stats() -> list[dict]:
+    """Per table: version (number of writes since start) and the functions reading it."""
+    with _lock:
+        return [{"table":   table,
+                 "version": _versions[table],
+                 "readers": ", ".join(n.rsplit(".", 1)[-1] for n in _readers.get(table, {}))}
+                for table in sorted(set(_readers) | set(_versions))]
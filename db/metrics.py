@@ -0,0 +1,128 @@
+"""db/metrics.py — per-request instrumentation for Supabase/PostgREST calls"""
+from __future__ import annotations
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_RING_SIZE  = 2_000
+_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, float("inf"))
+_SINK_PATH  = os.environ.get("QUERY_LOG_PATH")          # optional JSONL sink
+_SKIP_MODS  = ("db.connection", "db.metrics", "db.singleflight", "db.swr", "db.fake")
+
+_lock = threading.Lock()
+_ring: deque = deque(maxlen=_RING_SIZE)
+_hist: dict[str, list[int]] = {}
+_total = 0                                              # requests since start, never trimmed
+
+
+def _caller() -> str:
+    """First db.* / core.* frame outside the plumbing modules, as module.function."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        mod = frame.f_globals.get("__name__", "")
+        if mod.startswith(("db.", "core.")) and not mod.startswith(_SKIP_MODS):
+            return f"{mod}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+
+def _rows(response) -> int | None:
+    # PostgREST: Content-Range: 0-24/* (or */0 when empty)
+    rng = response.headers.get("content-range", "")
+    head = rng.split("/", 1)[0]
+    if head == "*":
+        return 0
+    if "-" in head:
+        lo, hi = head.split("-", 1)
+        return int(hi) - int(lo) + 1
+    return None
+
+
+def on_request(request) -> None:
+    request.extensions["t0"] = time.perf_counter()
+
+
+def on_response(response) -> None:
+    """httpx response hook: measure and record one PostgREST request."""
+    request = response.request
+    response.read()
+    latency = (time.perf_counter() - request.extensions.get("t0", time.perf_counter())) * 1000
+    path    = request.url.path.split("/rest/v1/", 1)[-1]
+    schema  = request.headers.get("accept-profile") or request.headers.get("content-profile") or ""
+    # value-free shape only ("id_user=eq&password=eq"): filter values can be credentials
+    shape   = "&".join(sorted(f"{k}={v.split('.', 1)[0]}" for k, v in request.url.params.multi_items()
+                              if k != "select"))
+    record = {
+        "ts":         datetime.now(timezone.utc).isoformat(),
+        "method":     request.method,
+        "table":      f"{schema}.{path}" if schema else path,
+        "shape":      shape,
+        "status":     response.status_code,
+        "latency_ms": round(latency, 2),
+        "rows":       _rows(response),
+        "bytes":      len(response.content),
+        "caller":     _caller(),
+    }
+    bucket = next(i for i, b in enumerate(_BUCKETS_MS) if latency <= b)
+    global _total
+    with _lock:
+        _total += 1
+        _ring.append(record)
+        _hist.setdefault(record["table"], [0] * len(_BUCKETS_MS))[bucket] += 1
+    if _SINK_PATH:                              # file I/O outside the lock
+        line = json.dumps(record, default=str) + "\n"
+        try:
+            with open(_SINK_PATH, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            logger.error("Gagal menulis query log: %s", e)
+
+
+def attach(session) -> None:
+    """Register the hooks on an httpx.Client (a PostgREST session)."""
+    session.event_hooks["request"].append(on_request)
+    session.event_hooks["response"].append(on_response)
+
+
+# ── Read side ────────────────────────────────────────────────────────────────
+def request_count() -> int:
+    """Requests recorded since process start; diff two readings to count a span."""
+    with _lock:
+        return _total
+
+
+def recent_queries() -> pd.DataFrame:
+    with _lock:
+        return pd.DataFrame(list(_ring))
+
+
+def top_queries(by: str = "latency_ms", n: int = 15) -> pd.DataFrame:
+    """Aggregate the ring buffer per (caller, table, shape), sorted by total `by`."""
+    df = recent_queries()
+    if df.empty:
+        return df
+    agg = df.groupby(["caller", "table", "shape"], dropna=False).agg(
+        calls=("latency_ms", "count"),
+        total_ms=("latency_ms", "sum"),
+        p95_ms=("latency_ms", lambda s: s.quantile(0.95)),
+        total_bytes=("bytes", "sum"),
+        rows=("rows", "sum"),
+    ).reset_index()
+    col = "total_bytes" if by == "bytes" else "total_ms"
+    return agg.sort_values(col, ascending=False).head(n).reset_index(drop=True)
+
+
+def latency_histogram() -> pd.DataFrame:
+    """Request counts per table and latency bucket (upper bound in ms)."""
+    labels = [f"≤{int(b)}" if b != float("inf") else f">{int(_BUCKETS_MS[-2])}" for b in _BUCKETS_MS]
+    with _lock:
+        data = {t: list(c) for t, c in _hist.items()}
+    return pd.DataFrame.from_dict(data, orient="index", columns=labels)
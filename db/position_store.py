@@ -0,0 +1,116 @@
+"""db/position_store.py — process-wide incremental store for operation.vessel_positions"""
+from __future__ import annotations
+import threading
+from collections import deque
+import pandas as pd
+import streamlit as st
+from db.connection import sb_table, keyset_pages
+
+_COLUMNS   = "id, id_vessel, latitude, longitude, speed, heading, created_at"
+_PAGE      = 1_000   # rows per keyset page of an incremental fetch
+_PATH_LEN  = 500     # per-vessel buffer length (get_path_vessel window)
+_OVERLAP   = pd.Timedelta(minutes=5)   # re-read window below the watermark for late-arriving rows
+
+
+def _ts(value) -> pd.Timestamp:
+    return pd.Timestamp(value)
+
+
+class PositionStore:
+    """Buffer posisi per kapal; setiap refresh hanya menarik baris di atas watermark (minus _OVERLAP)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()          # guards the buffers; never held across a fetch
+        self._sync_lock = threading.Lock()     # one sync in flight per process
+        self._buffers: dict[str, deque] = {}
+        self._watermark: pd.Timestamp | None = None
+        self._recent: dict = {}                # id -> created_at of rows inside the overlap window
+        self._path_loaded: set[str] = set()
+
+    # ── Watermark sync ───────────────────────────────────────────────────────
+    def _merge(self, rows: list[dict]) -> int:
+        """Add rows not seen yet to the buffers (kept ascending) and move the watermark. Caller holds _lock."""
+        fresh = [(r, _ts(r["created_at"])) for r in rows if r["id"] not in self._recent]
+        late = set()
+        for r, ts in fresh:
+            buf = self._buffers.setdefault(r["id_vessel"], deque(maxlen=_PATH_LEN))
+            if buf and ts < _ts(buf[-1]["created_at"]):
+                late.add(r["id_vessel"])
+            buf.append(r)
+            self._recent[r["id"]] = ts
+        for vessel_id in late:                 # a row older than the buffer tail arrived late
+            self._buffers[vessel_id] = deque(sorted(self._buffers[vessel_id], key=lambda r: _ts(r["created_at"])),
+                                             maxlen=_PATH_LEN)
+        if fresh:
+            newest = max(ts for _, ts in fresh)
+            if self._watermark is None or newest > self._watermark:
+                self._watermark = newest
+            cutoff = self._watermark - _OVERLAP
+            self._recent = {i: ts for i, ts in self._recent.items() if ts >= cutoff}
+        return len(fresh)
+
+    def sync(self) -> None:
+        """Fetch new rows outside _lock, then merge them; readers never wait on the network.
+
+        Rows are paged by the (created_at, id) keyset, so any number of rows sharing one
+        created_at is read through. Each sync starts _OVERLAP below the watermark to pick
+        up rows committed late with an older created_at; ids already merged are skipped.
+        """
+        if self._watermark is None:
+            with self._sync_lock:              # cold store: every caller waits for the seed
+                if self._watermark is None:
+                    # Seed from the latest-position view (one row per vessel); every
+                    # row newer than the max of those is picked up by the next sync.
+                    rows = sb_table("operation", "v_vessel_latest_position").select(_COLUMNS)\
+                        .order("created_at").execute().data or []
+                    with self._lock:
+                        self._merge(rows)
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return                             # another session is syncing: serve the current buffers
+        try:
+            since = (self._watermark - _OVERLAP).isoformat()
+            rows  = [r for page in keyset_pages("operation", "vessel_positions", _COLUMNS,
+                                                [("created_at", "gte", since)], _PAGE, "created_at")
+                     for r in page]
+            with self._lock:
+                self._merge(rows)
+        finally:
+            self._sync_lock.release()
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+    def latest(self) -> list[dict]:
+        """Posisi terakhir setiap kapal yang ada di buffer."""
+        self.sync()
+        with self._lock:
+            return [buf[-1] for buf in self._buffers.values() if buf]
+
+    def path(self, vessel_id: str) -> list[dict]:
+        """Riwayat posisi satu kapal (ascending), maksimal _PATH_LEN baris."""
+        self.sync()
+        if vessel_id not in self._path_loaded:
+            rows = sb_table("operation", "vessel_positions").select(_COLUMNS)\
+                .eq("id_vessel", vessel_id).order("created_at", desc=True)\
+                .limit(_PATH_LEN).execute().data or []
+            with self._lock:
+                if vessel_id not in self._path_loaded:
+                    # Rows past the watermark arrive through sync(); keep only the backfill.
+                    wm    = self._watermark
+                    buf   = self._buffers.get(vessel_id, ())
+                    known = {r["id"] for r in buf}
+                    older = [r for r in rows
+                             if r["id"] not in known and (wm is None or _ts(r["created_at"]) <= wm)]
+                    merged = sorted([*older, *buf], key=lambda r: _ts(r["created_at"]))
+                    self._buffers[vessel_id] = deque(merged, maxlen=_PATH_LEN)
+                    if wm is not None:         # backfilled rows inside the overlap window count as merged
+                        self._recent.update((r["id"], _ts(r["created_at"])) for r in older
+                                            if _ts(r["created_at"]) >= wm - _OVERLAP)
+                    self._path_loaded.add(vessel_id)
+        with self._lock:
+            return list(self._buffers.get(vessel_id, ()))
+
+
+@st.cache_resource
+def get_position_store() -> PositionStore:
+    """Return the process-wide PositionStore (shared across sessions)."""
+    return PositionStore()
@@ -2,30 +2,41 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timezone, timedelta
-from db.connection import sb_table
+from db.connection import sb_table, sb_aggregate
+from db.singleflight import coalesce
+from db.swr import swr
+from db.repos.dims import get_clients
+from db.schemas import typed
+from db.invalidation import reads
+from db.disk_cache import persist
 
 _EMPTY = pd.DataFrame()
 
 
+@reads("operation.clients")
 @st.cache_data(ttl=300)
+@persist(ttl=300)
 def get_client_stats() -> dict:
-    rows = sb_table("operation", "clients").select("status, created_at").execute().data
-    if not rows:
+    by_status = sb_aggregate("operation", "clients", {"n": ("count",)}, group_by=["status"])
+    if not by_status:
         return {"total_clients": 0, "new_clients": 0, "deactive_clients": 0}
-    df = pd.DataFrame(rows)
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-    cutoff = datetime.now(timezone.utc) - timedelta(days=21)
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=21)).isoformat()
+    new = sb_aggregate("operation", "clients", {"n": ("count",)},
+        filters=[("status", "eq", "Active"), ("created_at", "lte", cutoff)])
     return {
-        "total_clients":    len(df),
-        "new_clients":      int(((df["created_at"] <= cutoff) & (df["status"] == "Active")).sum()),
-        "deactive_clients": int((df["status"] != "Active").sum()),
+        "total_clients":    sum(int(r["n"]) for r in by_status),
+        "new_clients":      int(new[0]["n"]) if new else 0,
+        "deactive_clients": sum(int(r["n"]) for r in by_status if r["status"] != "Active"),
     }
 
 
+@reads("operation.clients", "operation.orders", "operation.payments")
+@coalesce
 @st.cache_data(ttl=300)
+@persist(ttl=300)
+@typed
 def get_clients_summary() -> pd.DataFrame:
-    clients = pd.DataFrame(sb_table("operation", "clients")
-        .select("code_client, name, industry, region, status").execute().data)
+    clients = get_clients().reset_index()
     if clients.empty:
         return _EMPTY
     orders   = pd.DataFrame(sb_table("operation", "orders")
@@ -48,10 +59,12 @@ def get_clients_summary() -> pd.DataFrame:
     return clients.sort_values("ltv", ascending=False)
 
 
-@st.cache_data(ttl=3600)
+@reads("operation.clients", "operation.orders", "operation.payments")
+@swr(ttl=3600, max_stale=6 * 3600)
+@persist(ttl=3600)
+@typed
 def get_client_reliability_scoring() -> pd.DataFrame:
-    clients  = pd.DataFrame(sb_table("operation", "clients")
-        .select("code_client, name").execute().data)
+    clients  = get_clients()["name"].reset_index()
     orders   = pd.DataFrame(sb_table("operation", "orders")
         .select("code_order, id_client, order_date").execute().data)
     payments = pd.DataFrame(sb_table("operation", "payments")
@@ -1,7 +1,9 @@
 """db/repos/cost.py — Repo untuk data biaya operasional voyage"""
 import pandas as pd
 from typing import Dict, List, Any
+from db.schemas import typed
 
+@typed
 def get_voyage_costs() -> pd.DataFrame:
     """Mock operational cost data for dredging vessels."""
     data: List[Dict[str, Any]] = [
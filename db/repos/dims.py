@@ -0,0 +1,100 @@
+"""db/repos/dims.py — shared dimension cache; frames are indexed by code for O(1) .map() lookups
+
+Names, coordinates and other reference columns are cached for _DIM_TTL; the status
+column is re-read every _STATUS_TTL, since the map split and the anomaly rules depend on it.
+"""
+import streamlit as st
+import pandas as pd
+from db.connection import sb_table
+from db.schemas import typed
+from db.invalidation import reads
+from db.disk_cache import persist
+
+_DIM_TTL    = 6 * 3600   # names, codes, coordinates: rarely edited
+_STATUS_TTL = 60         # status is edited outside the app too; show it within a minute
+
+
+@typed
+def _dim(schema: str, table: str, key: str, columns: str) -> pd.DataFrame:
+    df = pd.DataFrame(sb_table(schema, table).select(f"{key}, {columns}").execute().data)
+    if df.empty:
+        return pd.DataFrame(columns=[c.strip() for c in columns.split(",")],
+                            index=pd.Index([], name=key))
+    return df.set_index(key)
+
+
+def _with_status(static: pd.DataFrame, schema: str, table: str, key: str) -> pd.DataFrame:
+    """The long-lived columns plus a fresh status column (rows added since keep status only)."""
+    return static.join(_dim(schema, table, key, "status"), how="outer")
+
+
+# ── Static columns (_DIM_TTL) ─────────────────────────────────────────────────
+@reads("operation.vessels")
+@st.cache_data(ttl=_DIM_TTL)
+@persist(ttl=_DIM_TTL)
+def _vessel_attrs() -> pd.DataFrame:
+    return _dim("operation", "vessels", "code_vessel", "name")
+
+
+@reads("operation.sites")
+@st.cache_data(ttl=_DIM_TTL)
+@persist(ttl=_DIM_TTL)
+def _site_attrs() -> pd.DataFrame:
+    return _dim("operation", "sites", "code_site", "location, latitude, longitude")
+
+
+@reads("ocean.buoys")
+@st.cache_data(ttl=_DIM_TTL)
+@persist(ttl=_DIM_TTL)
+def _buoy_attrs() -> pd.DataFrame:
+    return _dim("ocean", "buoys", "code_buoy", "id_site")
+
+
+@reads("operation.users")
+@st.cache_data(ttl=_DIM_TTL)
+@persist(ttl=_DIM_TTL)
+def _user_attrs() -> pd.DataFrame:
+    return _dim("operation", "users", "code_user", "name, role")
+
+
+@reads("operation.clients")
+@st.cache_data(ttl=_DIM_TTL)
+@persist(ttl=_DIM_TTL)
+def _client_attrs() -> pd.DataFrame:
+    return _dim("operation", "clients", "code_client", "name, industry, region")
+
+
+# ── Public dims: static columns + status (_STATUS_TTL) ────────────────────────
+@reads("operation.vessels")
+@st.cache_data(ttl=_STATUS_TTL)
+@persist(ttl=_STATUS_TTL)
+def get_vessels() -> pd.DataFrame:
+    return _with_status(_vessel_attrs(), "operation", "vessels", "code_vessel")
+
+
+@reads("operation.sites")
+@st.cache_data(ttl=_STATUS_TTL)
+@persist(ttl=_STATUS_TTL)
+def get_sites() -> pd.DataFrame:
+    return _with_status(_site_attrs(), "operation", "sites", "code_site")
+
+
+@reads("ocean.buoys")
+@st.cache_data(ttl=_STATUS_TTL)
+@persist(ttl=_STATUS_TTL)
+def get_buoys() -> pd.DataFrame:
+    return _with_status(_buoy_attrs(), "ocean", "buoys", "code_buoy")
+
+
+@reads("operation.users")
+@st.cache_data(ttl=_STATUS_TTL)
+@persist(ttl=_STATUS_TTL)
+def get_users() -> pd.DataFrame:
+    return _with_status(_user_attrs(), "operation", "users", "code_user")
+
+
+@reads("operation.clients")
+@st.cache_data(ttl=_STATUS_TTL)
+@persist(ttl=_STATUS_TTL)
+def get_clients() -> pd.DataFrame:
+    return _with_status(_client_attrs(), "operation", "clients", "code_client")
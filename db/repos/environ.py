@@ -3,42 +3,67 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, timezone, timedelta
-from db.connection import sb_table
+from db.connection import sb_table, sb_stream, sb_csv
+from db.singleflight import coalesce
+from db.frame_cache import shared_frame
+from db.repos.dims import get_buoys, get_sites
+from db.schemas import typed
+from db.invalidation import reads
+from db.disk_cache import persist
 
 _EMPTY    = pd.DataFrame()
 _MAX_ROWS = 5_000
 
 
-@st.cache_data(ttl=60)
+@reads("ocean.buoy_sensor_histories", "ocean.buoys", "operation.sites")
+@coalesce
+@shared_frame(ttl=60)
+@persist(ttl=60)
+@typed
 def get_data_water() -> pd.DataFrame:
-    bsh = pd.DataFrame(sb_table("ocean", "buoy_sensor_histories")
+    bsh = sb_csv(sb_table("ocean", "buoy_sensor_histories")
         .select("id_buoy, salinitas, turbidity, current, oxygen, tide, density, created_at")
-        .order("created_at", desc=True).limit(_MAX_ROWS).execute().data)
+        .order("created_at", desc=True).limit(_MAX_ROWS), "ocean.buoy_sensor_histories")
     if bsh.empty:
         return _EMPTY
-    buoys = pd.DataFrame(sb_table("ocean", "buoys").select("code_buoy, id_site").execute().data)
-    sites = pd.DataFrame(sb_table("operation", "sites").select("code_site, latitude, longitude").execute().data)
-    df = bsh.merge(buoys, left_on="id_buoy", right_on="code_buoy", how="left")\
-            .merge(sites, left_on="id_site",  right_on="code_site",  how="left")\
-            .rename(columns={"created_at": "latest_timestamp"})
+    sites   = get_sites()
+    id_site = bsh["id_buoy"].map(get_buoys()["id_site"]).astype(object)
+    df = bsh.rename(columns={"created_at": "latest_timestamp"})
+    df["latitude"]  = id_site.map(sites["latitude"]).astype("float64")
+    df["longitude"] = id_site.map(sites["longitude"]).astype("float64")
     return df[["id_buoy", "latitude", "longitude", "salinitas", "turbidity",
                "current", "oxygen", "tide", "density", "latest_timestamp"]]
 
 
-@st.cache_data(ttl=60)
+@reads("ocean.buoy_sensor_histories")
+@st.cache_data(ttl=300)
+@persist(ttl=300)
+@typed
 def get_environmental_anomalies() -> pd.DataFrame:
-    cutoff_30 = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
-    cutoff_7  = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-    hist = pd.DataFrame(sb_table("ocean", "buoy_sensor_histories")
-        .select("id_buoy, salinitas, turbidity, created_at")
-        .gte("created_at", cutoff_30).limit(_MAX_ROWS).execute().data)
-    if hist.empty:
+    now       = datetime.now(timezone.utc)
+    cutoff_7  = pd.Timestamp(now - timedelta(days=7))
+    moments, recent = [], []
+    for chunk in sb_stream("ocean", "buoy_sensor_histories",
+                           "id_buoy, salinitas, turbidity, created_at",
+                           start=now - timedelta(days=30), end=now, parallel=4):
+        # Per-buoy n / Σx / Σx² so the 30-day stats never need the full window in memory.
+        sq = chunk[["salinitas", "turbidity"]].pow(2).add_suffix("_sq")
+        moments.append(pd.concat([chunk, sq], axis=1).groupby("id_buoy").agg(
+            n_sal=("salinitas", "count"), s_sal=("salinitas", "sum"), q_sal=("salinitas_sq", "sum"),
+            n_tur=("turbidity", "count"), s_tur=("turbidity", "sum"), q_tur=("turbidity_sq", "sum"),
+        ))
+        ts = pd.to_datetime(chunk["created_at"], utc=True)
+        recent.append(chunk[ts >= cutoff_7])
+    if not moments:
         return _EMPTY
-    stats = hist.groupby("id_buoy").agg(
-        avg_sal=("salinitas", "mean"), std_sal=("salinitas", "std"),
-        avg_tur=("turbidity", "mean"), std_tur=("turbidity", "std"),
-    ).reset_index()
-    recent = hist[hist["created_at"] >= cutoff_7].merge(stats, on="id_buoy", how="left")
+    m = pd.concat(moments).groupby(level=0).sum()
+    stats = pd.DataFrame({
+        "avg_sal": m["s_sal"] / m["n_sal"],
+        "std_sal": np.sqrt(((m["q_sal"] - m["s_sal"] ** 2 / m["n_sal"]) / (m["n_sal"] - 1)).clip(lower=0)),
+        "avg_tur": m["s_tur"] / m["n_tur"],
+        "std_tur": np.sqrt(((m["q_tur"] - m["s_tur"] ** 2 / m["n_tur"]) / (m["n_tur"] - 1)).clip(lower=0)),
+    }).reset_index()
+    recent = pd.concat(recent).merge(stats, on="id_buoy", how="left")
     recent["sal_z_score"] = (recent["salinitas"] - recent["avg_sal"]) / recent["std_sal"].replace(0, np.nan)
     recent["tur_z_score"] = (recent["turbidity"] - recent["avg_tur"]) / recent["std_tur"].replace(0, np.nan)
     return recent[
@@ -47,23 +72,29 @@ def get_environmental_anomalies() -> pd.DataFrame:
        "sal_z_score", "tur_z_score"]].sort_values("created_at", ascending=False)
 
 
+@reads("ocean.buoy_sensor_histories", "ocean.buoys", "operation.sites")
 @st.cache_data(ttl=57)
+@persist(ttl=57)
+@typed
 def get_buoy_fleet() -> pd.DataFrame:
-    buoys = pd.DataFrame(sb_table("ocean", "buoys").select("code_buoy, status, id_site").execute().data)
+    buoys = get_buoys().reset_index()
     if buoys.empty:
         return _EMPTY
-    sites      = pd.DataFrame(sb_table("operation", "sites").select("code_site, location").execute().data)
     last_reads = pd.DataFrame(sb_table("ocean", "buoy_sensor_histories")
         .select("id_buoy, created_at").order("created_at", desc=True).limit(500).execute().data)
     last_per_buoy = last_reads.groupby("id_buoy")["created_at"].first().reset_index()
     last_per_buoy.columns = ["code_buoy", "last_update"]
-    df = buoys.merge(sites, left_on="id_site", right_on="code_site", how="left")\
-              .merge(last_per_buoy, on="code_buoy", how="left")
+    buoys["location"] = buoys["id_site"].map(get_sites()["location"])
+    df = buoys.merge(last_per_buoy, on="code_buoy", how="left")
     df["battery"] = "85%"
     return df[["code_buoy", "status", "location", "battery", "last_update"]].sort_values("code_buoy")
 
 
-@st.cache_data(ttl=60)
+@reads("ocean.buoy_sensor_histories")
+@coalesce
+@shared_frame(ttl=60)
+@persist(ttl=60)
+@typed
 def get_buoy_history(buoy_id: str) -> pd.DataFrame:
     resp = sb_table("ocean", "buoy_sensor_histories")\
         .select("id_buoy, created_at, salinitas, turbidity, oxygen, density, current, tide")\
@@ -71,23 +102,27 @@ def get_buoy_history(buoy_id: str) -> pd.DataFrame:
     return pd.DataFrame(resp.data)
 
 
+@reads("ocean.buoy_sensor_histories")
 @st.cache_data(ttl=3600)
+@persist(ttl=3600)
+@typed
 def get_environmental_compliance_dashboard() -> pd.DataFrame:
-    cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
-    resp = sb_table("ocean", "buoy_sensor_histories")\
-        .select("turbidity, created_at").gte("created_at", cutoff)\
-        .limit(_MAX_ROWS).execute()
-    if not resp.data:
+    now   = datetime.now(timezone.utc)
+    daily = []
+    for chunk in sb_stream("ocean", "buoy_sensor_histories", "turbidity, created_at",
+                           start=now - timedelta(days=30), end=now, parallel=4):
+        chunk["monitor_date"] = pd.to_datetime(chunk["created_at"], utc=True).dt.floor("D")
+        chunk["high"] = chunk["turbidity"] > 50
+        daily.append(chunk.groupby("monitor_date").agg(
+            total_readings=("turbidity", "count"),
+            high_turbidity_events=("high", "sum"),
+            turbidity_sum=("turbidity", "sum"),
+        ))
+    if not daily:
         return _EMPTY
-    df = pd.DataFrame(resp.data)
-    df["created_at"]   = pd.to_datetime(df["created_at"], utc=True)
-    df["monitor_date"] = df["created_at"].dt.floor("D")
-    result = df.groupby("monitor_date").agg(
-        total_readings=("turbidity", "count"),
-        high_turbidity_events=("turbidity", lambda x: (x > 50).sum()),
-        avg_turbidity=("turbidity", "mean"),
-    ).reset_index()
+    result = pd.concat(daily).groupby(level=0).sum().reset_index()
+    result["avg_turbidity"] = result["turbidity_sum"] / result["total_readings"].replace(0, np.nan)
     result["compliance_score_pct"] = (
         100.0 - result["high_turbidity_events"] / result["total_readings"].replace(0, np.nan) * 100.0
     ).fillna(100.0)
-    return result.sort_values("monitor_date", ascending=False)
+    return result.drop(columns=["turbidity_sum"]).sort_values("monitor_date", ascending=False)
@@ -2,40 +2,33 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timezone, timedelta
-from db.connection import sb_table
+from db.connection import sb_table, sb_aggregate
+from db.swr import swr
+from db.schemas import typed
+from db.invalidation import reads
+from db.disk_cache import persist
 
 _EMPTY = pd.DataFrame()
 
 
-def _to_month(series: pd.Series) -> pd.Series:
-    dt = pd.to_datetime(series, utc=True).dt.tz_convert(None)
-    return dt.values.astype("datetime64[M]").astype("datetime64[ns]")
-
-
-def _monthly(df: pd.DataFrame, date_col: str, **agg_cols) -> pd.DataFrame:
-    df = df.copy()
-    df["_month"] = _to_month(df[date_col])
-    result = df.groupby("_month").agg(**agg_cols).reset_index()
-    result = result.rename(columns={"_month": "month"})
-    return result.sort_values("month").reset_index(drop=True)
-
-
+@reads("operation.payments")
 @st.cache_data(ttl=300)
+@persist(ttl=300)
 def get_financial_metrics() -> dict:
     cutoff = (datetime.now(timezone.utc) - timedelta(days=60)).isoformat()
-    payments = pd.DataFrame(sb_table("operation", "payments")
-        .select("id_order, total_amount, payment_date")
-        .eq("status", "Completed").gte("payment_date", cutoff).execute().data)
-    total_resp = sb_table("operation", "payments")\
-        .select("total_amount").eq("status", "Completed").execute()
-    total_revenue = float(sum(r["total_amount"] for r in (total_resp.data or [])))
-    if payments.empty:
+    completed = [("status", "eq", "Completed")]
+    total = sb_aggregate("operation", "payments",
+        {"revenue": ("sum", "total_amount")}, filters=completed)
+    total_revenue = float((total[0]["revenue"] if total else 0) or 0)
+    monthly = pd.DataFrame(sb_aggregate("operation", "payments",
+        {"revenue": ("sum", "total_amount"), "order_count": ("count_distinct", "id_order")},
+        group_by=[("month", "payment_date")],
+        filters=completed + [("payment_date", "gte", cutoff)]))
+    if monthly.empty:
         return {"total_revenue": total_revenue, "completed_orders": 0,
                 "delta_revenue": 0.0, "current_revenue": 0.0, "prev_revenue": 0.0}
-    monthly = _monthly(payments, "payment_date",
-        revenue=("total_amount", "sum"),
-        order_count=("id_order", "nunique"),
-    ).sort_values("month", ascending=False)
+    monthly["month"] = pd.to_datetime(monthly["month"])
+    monthly = monthly.sort_values("month", ascending=False)
     cur   = float(monthly.iloc[0]["revenue"])  if len(monthly) > 0 else 0.0
     prev  = float(monthly.iloc[1]["revenue"])  if len(monthly) > 1 else 0.0
     delta = round(((cur - prev) / prev * 100) if prev > 0 else 0.0, 2)
@@ -48,7 +41,10 @@ def get_financial_metrics() -> dict:
     }
 
 
+@reads("operation.payments")
 @st.cache_data(ttl=300)
+@persist(ttl=300)
+@typed
 def get_revenue_analysis() -> pd.DataFrame:
     rows = sb_table("operation", "payments")\
         .select("total_amount, payment_date").eq("status", "Completed").execute().data
@@ -62,41 +58,44 @@ def get_revenue_analysis() -> pd.DataFrame:
     return result.sort_values("month").reset_index(drop=True)
 
 
+@reads("operation.payments", "operation.orders", "operation.clients")
 @st.cache_data(ttl=300)
+@persist(ttl=300)
+@typed
 def get_revenue_by_service() -> pd.DataFrame:
-    payments = pd.DataFrame(sb_table("operation", "payments")
-        .select("id_order, total_amount").eq("status", "Completed").execute().data)
-    orders   = pd.DataFrame(sb_table("operation", "orders")
-        .select("code_order, id_client").execute().data)
-    clients  = pd.DataFrame(sb_table("operation", "clients")
-        .select("code_client, industry").execute().data)
-    if any(df.empty for df in [payments, orders, clients]):
+    df = pd.DataFrame(sb_aggregate("operation", "v_payment_industries",
+        {"Nilai": ("sum", "total_amount")}, group_by=["industry"],
+        filters=[("status", "eq", "Completed")]))
+    if df.empty:
         return _EMPTY
-    df = payments.merge(orders,  left_on="id_order",  right_on="code_order",  how="inner")\
-                 .merge(clients, left_on="id_client", right_on="code_client", how="inner")
-    return df.groupby("industry")["total_amount"].sum().reset_index()\
-             .rename(columns={"industry": "Layanan", "total_amount": "Nilai"})\
-             .sort_values("Nilai", ascending=False).reset_index(drop=True)
+    df["Nilai"] = df["Nilai"].astype(float)
+    return df.dropna(subset=["industry"]).rename(columns={"industry": "Layanan"})\
+             [["Layanan", "Nilai"]].sort_values("Nilai", ascending=False).reset_index(drop=True)
 
 
+@reads("operation.orders")
 @st.cache_data(ttl=300)
+@persist(ttl=300)
 def get_order_stats() -> dict:
-    rows = sb_table("operation", "orders").select("status").execute().data
+    rows = sb_aggregate("operation", "orders", {"n": ("count",)}, group_by=["status"])
     if not rows:
         return {"total_orders": 0, "completed": 0, "in_completed": 0,
                 "on_progress": 0, "failed": 0, "open": 0}
-    counts = pd.DataFrame(rows)["status"].value_counts().to_dict()
+    counts = {r["status"]: int(r["n"]) for r in rows}
     return {
-        "total_orders":  len(rows),
-        "completed":     int(counts.get("Completed", 0)),
-        "in_completed":  int(counts.get("In Completed", 0)),
-        "on_progress":   int(counts.get("On Progress", 0)),
-        "failed":        int(counts.get("Failed", 0)),
-        "open":          int(counts.get("Open", 0)),
+        "total_orders":  sum(counts.values()),
+        "completed":     counts.get("Completed", 0),
+        "in_completed":  counts.get("In Completed", 0),
+        "on_progress":   counts.get("On Progress", 0),
+        "failed":        counts.get("Failed", 0),
+        "open":          counts.get("Open", 0),
     }
 
 
-@st.cache_data(ttl=1800)
+@reads("operation.orders", "operation.payments")
+@swr(ttl=1800, max_stale=4 * 3600)
+@persist(ttl=1800)
+@typed
 def get_revenue_cycle_metrics() -> pd.DataFrame:
     cutoff = (datetime.now(timezone.utc) - timedelta(days=180)).isoformat()
     orders   = pd.DataFrame(sb_table("operation", "orders")
@@ -118,16 +117,18 @@ def get_revenue_cycle_metrics() -> pd.DataFrame:
     ).reset_index().sort_values("month", ascending=False).reset_index(drop=True)
 
 
+@reads("operation.clients")
 @st.cache_data(ttl=3600)
+@persist(ttl=3600)
 def get_client_stats() -> dict:
     cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
-    rows = sb_table("operation", "clients").select("status, created_at").execute().data
-    if not rows:
+    by_status = sb_aggregate("operation", "clients", {"n": ("count",)}, group_by=["status"])
+    if not by_status:
         return {"total_clients": 0, "new_clients": 0, "deactive_clients": 0}
-    df = pd.DataFrame(rows)
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
+    new = sb_aggregate("operation", "clients", {"n": ("count",)},
+        filters=[("status", "eq", "Active"), ("created_at", "gte", cutoff)])
     return {
-        "total_clients":    len(df),
-        "new_clients":      int(((df["created_at"] >= cutoff) & (df["status"] == "Active")).sum()),
-        "deactive_clients": int((df["status"] != "Active").sum()),
+        "total_clients":    sum(int(r["n"]) for r in by_status),
+        "new_clients":      int(new[0]["n"]) if new else 0,
+        "deactive_clients": sum(int(r["n"]) for r in by_status if r["status"] != "Active"),
     }
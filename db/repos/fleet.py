@@ -2,42 +2,54 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timezone, timedelta
-from db.connection import sb_table
+from db.connection import sb_table, sb_aggregate, sb_csv
+from db.singleflight import coalesce
+from db.frame_cache import shared_frame
+from db.position_store import get_position_store
+from db.repos.dims import get_vessels
+from db.schemas import typed
+from db.invalidation import reads
+from db.disk_cache import persist
 
 _EMPTY = pd.DataFrame()
 _POS_LIMIT = 1_000
 
 
+@reads("operation.vessel_activities")
 @st.cache_data(ttl=60)
+@persist(ttl=60)
 def get_fleet_status() -> dict:
-    rows = sb_table("operation", "vessel_activities")\
-        .select("id_vessel, seq_activity, status").execute().data
+    rows = sb_aggregate("operation", "v_vessel_latest_activity",
+        {"n": ("count",)}, group_by=["status"])
     if not rows:
         return {"total_vessels": 0, "operating": 0, "maintenance": 0, "idle": 0}
-    df = pd.DataFrame(rows).sort_values("seq_activity")\
-         .groupby("id_vessel").last().reset_index()
-    s = df["status"].str.lower()
+    counts: dict[str, int] = {}
+    for r in rows:
+        key = str(r["status"] or "").lower()
+        counts[key] = counts.get(key, 0) + int(r["n"])
     return {
-        "total_vessels": len(df),
-        "operating":     int(s.isin(["operating", "running", "on_duty"]).sum()),
-        "maintenance":   int(s.isin(["maintenance", "mtc", "repair"]).sum()),
-        "idle":          int(s.isin(["idle", "anchored", "berthed"]).sum()),
+        "total_vessels": sum(counts.values()),
+        "operating":     sum(counts.get(k, 0) for k in ("operating", "running", "on_duty")),
+        "maintenance":   sum(counts.get(k, 0) for k in ("maintenance", "mtc", "repair")),
+        "idle":          sum(counts.get(k, 0) for k in ("idle", "anchored", "berthed")),
     }
 
 
-@st.cache_data(ttl=30)
+@reads("operation.vessel_positions", "operation.vessels")
+@coalesce
+@shared_frame(ttl=30)
+@persist(ttl=30)
+@typed
 def get_vessel_position() -> pd.DataFrame:
-    positions = pd.DataFrame(sb_table("operation", "vessel_positions")
-        .select("id_vessel, latitude, longitude, speed, heading, created_at")
-        .order("created_at", desc=True).limit(_POS_LIMIT).execute().data)
-    if positions.empty:
+    rows = get_position_store().latest()
+    if not rows:
         return _EMPTY
-    vessels = pd.DataFrame(sb_table("operation", "vessels")
-        .select("code_vessel, name, status").execute().data)
-    positions["created_at"] = pd.to_datetime(positions["created_at"], utc=True)
-    latest = positions.drop_duplicates("id_vessel").merge(
-        vessels, left_on="id_vessel", right_on="code_vessel", how="left")\
-        .drop(columns=["code_vessel"])
+    latest  = pd.DataFrame(rows).drop(columns=["id"])
+    vessels = get_vessels()
+    latest["created_at"] = pd.to_datetime(latest["created_at"], utc=True)
+    latest = latest.sort_values("created_at", ascending=False).reset_index(drop=True)
+    latest["name"]    = latest["id_vessel"].map(vessels["name"])
+    latest["status"]  = latest["id_vessel"].map(vessels["status"])
     latest["speed"]   = latest["speed"].fillna(0)
     latest["heading"] = latest["heading"].fillna(0)
     return latest.rename(columns={
@@ -49,45 +61,53 @@ def get_vessel_position() -> pd.DataFrame:
         "longitude", "speed", "heading", "Last Update"]]
 
 
-@st.cache_data(ttl=30)
+@reads("operation.vessel_positions")
+@coalesce
+@shared_frame(ttl=30)
+@persist(ttl=30)
+@typed
 def get_path_vessel(vessel_id: str) -> pd.DataFrame:
-    rows = sb_table("operation", "vessel_positions")\
-        .select("latitude, longitude, heading, speed, created_at")\
-        .eq("id_vessel", vessel_id).order("created_at", desc=True).limit(500).execute().data
-    df = pd.DataFrame(rows)
-    if not df.empty:
-        df[["heading", "speed"]] = df[["heading", "speed"]].fillna(0)
-        df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
+    rows = get_position_store().path(vessel_id)
+    if not rows:
+        return _EMPTY
+    df = pd.DataFrame(rows[::-1])[["latitude", "longitude", "heading", "speed", "created_at"]]
+    df[["heading", "speed"]] = df[["heading", "speed"]].fillna(0)
     return df
 
 
+@reads("operation.vessels")
 @st.cache_data(ttl=3600)
+@persist(ttl=3600)
+@typed
 def get_vessel_list() -> pd.DataFrame:
-    return pd.DataFrame(sb_table("operation", "vessels")
-        .select("code_vessel, name").order("name").execute().data)
+    return get_vessels()["name"].reset_index().sort_values("name").reset_index(drop=True)
 
 
+@reads("operation.vessel_positions")
 @st.cache_data(ttl=300)
+@persist(ttl=300)
+@typed
 def get_fleet_daily_activity() -> pd.DataFrame:
     cutoff = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-    rows = sb_table("operation", "vessel_positions")\
-        .select("id_vessel, speed, created_at").gte("created_at", cutoff)\
-        .limit(_POS_LIMIT).execute().data
-    if not rows:
+    df = sb_csv(sb_table("operation", "vessel_positions")
+        .select("id_vessel, speed, created_at").gte("created_at", cutoff)
+        .limit(_POS_LIMIT), "operation.vessel_positions")
+    if df.empty:
         return _EMPTY
-    df = pd.DataFrame(rows)
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
     active = df[df["speed"] > 0.5].copy()
     active["day_num"]  = active["created_at"].dt.isocalendar().day
     active["day_name"] = active["created_at"].dt.strftime("%a")
     active["hour"]     = active["created_at"].dt.floor("h")
-    result = active.groupby(["id_vessel", "day_name", "day_num"])["hour"]\
+    result = active.groupby(["id_vessel", "day_name", "day_num"], observed=True)["hour"]\
         .nunique().reset_index()
     result.columns = ["code_vessel", "day_name", "day_num", "active_hours"]
     return result.sort_values("day_num")
 
 
+@reads("operation.vessel_activities", "operation.vessels")
 @st.cache_data(ttl=300)
+@persist(ttl=300)
+@typed
 def get_vessel_utilization_stats() -> pd.DataFrame:
     cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
     activities = pd.DataFrame(sb_table("operation", "vessel_activities")
@@ -95,8 +115,6 @@ def get_vessel_utilization_stats() -> pd.DataFrame:
         .gte("start_date", cutoff).execute().data)
     if activities.empty:
         return _EMPTY
-    vessels = pd.DataFrame(sb_table("operation", "vessels")
-        .select("code_vessel, name").execute().data)
     now = datetime.now(timezone.utc)
     activities["start_date"] = pd.to_datetime(activities["start_date"], utc=True)
     activities["end_date"]   = pd.to_datetime(activities["end_date"],   utc=True).fillna(now)
@@ -106,7 +124,8 @@ def get_vessel_utilization_stats() -> pd.DataFrame:
         lambda r: 0.0 if r["status"].lower() in idle_set else r["dur_h"], axis=1)
     df = activities.groupby("id_vessel").agg(
         total_hours=("dur_h", "sum"), productive_hours=("prod_h", "sum")
-    ).reset_index().merge(vessels, left_on="id_vessel", right_on="code_vessel", how="left")
+    ).reset_index()
+    df["name"] = df["id_vessel"].map(get_vessels()["name"])
     df["utilization_rate"] = (
         df["productive_hours"] / df["total_hours"].replace(0, pd.NA) * 100
     ).fillna(0).round(1)
@@ -114,7 +133,10 @@ def get_vessel_utilization_stats() -> pd.DataFrame:
              [["vessel_name", "total_hours", "productive_hours", "utilization_rate"]]
 
 
+@reads("operation.orders")
 @st.cache_data(ttl=300)
+@persist(ttl=300)
+@typed
 def get_logistics_performance() -> pd.DataFrame:
     rows = sb_table("operation", "orders")\
         .select("destination, actual_delivery_date, scheduled_delivery_date")\
@@ -134,28 +156,26 @@ def get_logistics_performance() -> pd.DataFrame:
     ).reset_index().sort_values("avg_delay_hours", ascending=False)
 
 
+@reads("operation.vessel_positions", "operation.vessels")
 @st.cache_data(ttl=60)
+@persist(ttl=60)
+@typed
 def get_operational_anomalies() -> pd.DataFrame:
     cutoff = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
-    positions = pd.DataFrame(sb_table("operation", "vessel_positions")
+    positions = pd.DataFrame(sb_table("operation", "v_vessel_latest_position")
         .select("id_vessel, speed, latitude, longitude, created_at")
-        .gte("created_at", cutoff).order("created_at", desc=True).limit(200).execute().data)
+        .gte("created_at", cutoff).order("created_at", desc=True).execute().data)
     if positions.empty:
         return _EMPTY
-    vessels = pd.DataFrame(sb_table("operation", "vessels")
-        .select("code_vessel, name, status").execute().data)
-    df = positions.drop_duplicates("id_vessel").merge(
-        vessels, left_on="id_vessel", right_on="code_vessel", how="inner")
+    vessels = get_vessels()
+    df = positions[positions["id_vessel"].isin(vessels.index)].copy()
+    df["name"]   = df["id_vessel"].map(vessels["name"])
+    df["status"] = df["id_vessel"].map(vessels["status"])
     s = df["status"].str.lower()
-    mask = (
-        (s.isin(["operating", "running"]) & (df["speed"] < 0.5)) |
-        (s.isin(["idle", "maintenance", "docking"]) & (df["speed"] > 2.0))
-    )
-    df = df[mask].copy()
-    df["anomaly_type"] = df.apply(
-        lambda r: "Ghost Operation"
-        if r["status"].lower() in {"operating", "running"} and r["speed"] < 0.5
-        else "Pergerakan Tidak Sah", axis=1)
+    ghost = s.isin(["operating", "running"]) & (df["speed"] < 0.5)
+    mask  = ghost | (s.isin(["idle", "maintenance", "docking"]) & (df["speed"] > 2.0))
+    df["anomaly_type"] = ghost.map({True: "Ghost Operation", False: "Pergerakan Tidak Sah"})
+    df = df[mask]
     return df.rename(columns={"name": "vessel_name", "status": "reported_status"})\
              [["id_vessel", "vessel_name", "reported_status", "speed",
                "latitude", "longitude", "created_at", "anomaly_type"]].head(20)
@@ -5,11 +5,17 @@ import logging
 import streamlit as st
 import pandas as pd
 from db.connection import sb_table
+from db.schemas import typed
+from db.invalidation import reads, writes
+from db.disk_cache import persist
 
 logger = logging.getLogger(__name__)
 
 
+@reads("operation.vessel_maintenance")
 @st.cache_data(ttl=120)
+@persist(ttl=120)
+@typed
 def get_all_maintenance() -> pd.DataFrame:
     try:
         res = sb_table("operation", "vessel_maintenance").select("*").order("scheduled_date").execute()
@@ -21,7 +27,10 @@ def get_all_maintenance() -> pd.DataFrame:
         return pd.DataFrame()
 
 
+@reads("operation.vessel_maintenance")
 @st.cache_data(ttl=120)
+@persist(ttl=120)
+@typed
 def get_upcoming_maintenance(days_ahead: int = 30) -> pd.DataFrame:
     """Fetch maintenance scheduled within the next N days."""
     try:
@@ -43,21 +52,19 @@ def get_upcoming_maintenance(days_ahead: int = 30) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+@writes("operation.vessel_maintenance")
 def create_maintenance(data: dict) -> tuple[bool, str]:
     try:
         sb_table("operation", "vessel_maintenance").insert(data).execute()
-        get_all_maintenance.clear()
-        get_upcoming_maintenance.clear()
         return True, "Jadwal maintenance berhasil ditambahkan."
     except Exception as e:
         return False, f"Gagal menambahkan maintenance: {e}"
 
 
+@writes("operation.vessel_maintenance")
 def update_maintenance_status(record_id: str | int, new_status: str) -> tuple[bool, str]:
     try:
         sb_table("operation", "vessel_maintenance").update({"status": new_status}).eq("id", record_id).execute()
-        get_all_maintenance.clear()
-        get_upcoming_maintenance.clear()
         return True, f"Status diperbarui ke '{new_status}'."
     except Exception as e:
         return False, f"Gagal memperbarui: {e}"
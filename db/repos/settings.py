@@ -3,9 +3,14 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timezone, timedelta
 from db.connection import sb_table
+from db.schemas import typed
+from db.invalidation import reads, writes
+from db.disk_cache import persist
 
 
+@reads("operation.system_settings")
 @st.cache_data(ttl=60)
+@persist(ttl=60)
 def get_system_settings() -> dict:
     try:
         rows = sb_table("operation", "system_settings")\
@@ -17,19 +22,22 @@ def get_system_settings() -> dict:
         return {}
 
 
+@writes("operation.system_settings")
 def update_system_setting(key: str, value) -> bool:
     try:
         sb_table("operation", "system_settings")\
             .update({"value": str(value),
                      "updated_at": datetime.now(timezone.utc).isoformat()})\
             .eq("key", key).execute()
-        st.cache_data.clear()
         return True
     except Exception:
         return False
 
 
+@reads("audit.audit_logs")
 @st.cache_data(ttl=60)
+@persist(ttl=60)
+@typed
 def get_logs() -> pd.DataFrame:
     cutoff = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
     rows = sb_table("audit", "audit_logs")\
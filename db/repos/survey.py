@@ -2,27 +2,31 @@
 import streamlit as st
 import pandas as pd
 from db.connection import sb_table
+from db.repos.dims import get_sites, get_vessels, get_users
+from db.schemas import typed
+from db.invalidation import reads, writes
+from db.disk_cache import persist
 
 
+@reads("survey.daily_report_survey_activity", "operation.sites", "operation.vessels", "operation.users")
 @st.cache_data(ttl=60)
+@persist(ttl=60)
+@typed
 def get_all_surveys() -> pd.DataFrame:
     surveys = pd.DataFrame(sb_table("survey", "daily_report_survey_activity")
         .select("id, code_report, project_name, date_survey, id_site, id_vessel, id_user, comment")
         .order("date_survey", desc=True).execute().data)
     if surveys.empty:
         return pd.DataFrame()
-    sites   = pd.DataFrame(sb_table("operation", "sites").select("code_site").execute().data)
-    vessels = pd.DataFrame(sb_table("operation", "vessels").select("code_vessel, name").execute().data)
-    users   = pd.DataFrame(sb_table("operation", "users").select("code_user, name").execute().data)
-    df = surveys\
-        .merge(sites,   left_on="id_site",   right_on="code_site",   how="left")\
-        .merge(vessels, left_on="id_vessel", right_on="code_vessel", how="left")\
-        .merge(users,   left_on="id_user",   right_on="code_user",   how="left")\
-        .rename(columns={"code_site": "site_name", "name_x": "vessel_name", "name_y": "surveyor_name"})
+    df = surveys
+    df["site_name"]     = df["id_site"].where(df["id_site"].isin(get_sites().index))
+    df["vessel_name"]   = df["id_vessel"].map(get_vessels()["name"])
+    df["surveyor_name"] = df["id_user"].map(get_users()["name"])
     return df[["id", "code_report", "project_name", "date_survey",
                "site_name", "vessel_name", "surveyor_name", "comment"]]
 
 
+@writes("survey.daily_report_survey_activity")
 def create_survey_report(data: dict) -> tuple[bool, str]:
     try:
         sb_table("survey", "daily_report_survey_activity").insert({
@@ -4,6 +4,8 @@ import hashlib
 import pandas as pd
 from datetime import datetime, timezone
 from db.connection import sb_table
+from db.schemas import typed
+from db.invalidation import writes
 
 _MAX_LEN = 64
 
@@ -16,6 +18,7 @@ def _clean(value: str) -> str:
     return str(value).strip()[:_MAX_LEN]
 
 
+@typed
 def get_all_users() -> pd.DataFrame:
     users = pd.DataFrame(sb_table("operation", "users")
         .select("code_user, role, status").order("code_user").execute().data)
@@ -28,6 +31,7 @@ def get_all_users() -> pd.DataFrame:
         [["code_user", "username", "role", "user_status", "account_status", "last_login"]]
 
 
+@writes("operation.users", "operation.user_managements")
 def create_new_user(username: str, password: str, role: str) -> tuple[bool, str]:
     username = _clean(username)
     password = _clean(password)
@@ -44,6 +48,7 @@ def create_new_user(username: str, password: str, role: str) -> tuple[bool, str]
         return False, str(e)
 
 
+@writes("operation.users", "operation.user_managements")
 def update_user_status(username: str, new_status: str) -> bool:
     try:
         username = _clean(username)
@@ -56,6 +61,7 @@ def update_user_status(username: str, new_status: str) -> bool:
         return False
 
 
+@writes("operation.users")
 def update_user_role(username: str, new_role: str) -> bool:
     try:
         sb_table("operation", "users").update({"role": new_role})\
@@ -65,6 +71,7 @@ def update_user_role(username: str, new_role: str) -> bool:
         return False
 
 
+@writes("operation.users", "operation.user_managements")
 def delete_user(username: str) -> bool:
     try:
         username = _clean(username)
@@ -75,6 +82,7 @@ def delete_user(username: str) -> bool:
         return False
 
 
+@writes("operation.user_managements")
 def update_last_login_optimized(username: str, password: str) -> bool:
     try:
         sb_table("operation", "user_managements")\
@@ -85,6 +93,7 @@ def update_last_login_optimized(username: str, password: str) -> bool:
         return False
 
 
+@writes("operation.user_managements")
 def update_password(username: str, old_pass: str, new_pass: str) -> tuple[bool, str]:
     old_pass = _clean(old_pass)
     new_pass = _clean(new_pass)
@@ -4,13 +4,19 @@ import logging
 import streamlit as st
 import pandas as pd
 from db.connection import sb_table
+from db.schemas import typed
+from db.invalidation import reads, writes
+from db.disk_cache import persist
 
 logger = logging.getLogger(__name__)
 
 _VOYAGE_STATUS = ["Planned", "Underway", "Arrived", "Completed", "Cancelled"]
 
 
+@reads("operation.voyages")
 @st.cache_data(ttl=60)
+@persist(ttl=60)
+@typed
 def get_all_voyages() -> pd.DataFrame:
     """Fetch all voyages from the database."""
     try:
@@ -23,7 +29,10 @@ def get_all_voyages() -> pd.DataFrame:
         return pd.DataFrame()
 
 
+@reads("operation.voyages")
 @st.cache_data(ttl=60)
+@persist(ttl=60)
+@typed
 def get_active_voyages() -> pd.DataFrame:
     """Fetch only active (Planned + Underway) voyages."""
     try:
@@ -42,33 +51,30 @@ def get_active_voyages() -> pd.DataFrame:
         return pd.DataFrame()
 
 
+@writes("operation.voyages")
 def create_voyage(data: dict) -> tuple[bool, str]:
     """Insert a new voyage record."""
     try:
         sb_table("operation", "voyages").insert(data).execute()
-        get_all_voyages.clear()
-        get_active_voyages.clear()
         return True, "Voyage berhasil ditambahkan."
     except Exception as e:
         return False, f"Gagal menambahkan voyage: {e}"
 
 
+@writes("operation.voyages")
 def update_voyage_status(voyage_id: str | int, new_status: str) -> tuple[bool, str]:
     """Update the status of an existing voyage."""
     try:
         sb_table("operation", "voyages").update({"status": new_status}).eq("id", voyage_id).execute()
-        get_all_voyages.clear()
-        get_active_voyages.clear()
         return True, f"Status berhasil diperbarui ke '{new_status}'."
     except Exception as e:
         return False, f"Gagal memperbarui status: {e}"
 
 
+@writes("operation.voyages")
 def delete_voyage(voyage_id: str | int) -> tuple[bool, str]:
     try:
         sb_table("operation", "voyages").delete().eq("id", voyage_id).execute()
-        get_all_voyages.clear()
-        get_active_voyages.clear()
         return True, "Voyage berhasil dihapus."
     except Exception as e:
         return False, f"Gagal menghapus voyage: {e}"
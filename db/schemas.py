@@ -0,0 +1,108 @@
+"""db/schemas.py — wire schemas for typed CSV ingestion and dtypes of every repo output"""
+import functools
+import pandas as pd
+import pyarrow as pa
+
+_CODE = pa.dictionary(pa.int32(), pa.string())   # codes arrive as pandas categoricals
+_UTC  = pa.timestamp("ns", tz="UTC")
+
+ARROW_TYPES: dict[str, dict[str, pa.DataType]] = {
+    "operation.vessel_positions": {
+        "id":          pa.int64(),
+        "id_vessel":   _CODE,
+        "id_activity": _CODE,
+        "latitude":    pa.float64(),
+        "longitude":   pa.float64(),
+        "speed":       pa.float64(),
+        "heading":     pa.float64(),
+        "created_at":  _UTC,
+    },
+    "ocean.buoy_sensor_histories": {
+        "id":          pa.int64(),
+        "id_buoy":     _CODE,
+        "salinitas":   pa.float64(),
+        "turbidity":   pa.float64(),
+        "current":     pa.float64(),
+        "oxygen":      pa.float64(),
+        "tide":        pa.float64(),
+        "density":     pa.float64(),
+        "created_at":  _UTC,
+    },
+}
+
+
+# ── Repo output dtypes ───────────────────────────────────────────────────────
+# Every DataFrame leaving db.repos goes through @typed, so caches hold the compact
+# form and views never re-parse. Keyed by column name: one name, one dtype.
+CATEGORY = "category"
+FLOAT32  = "float32"
+UTC      = "datetime64[ns, UTC]"
+
+COLUMN_DTYPES: dict[str, str] = {
+    # codes and low-cardinality labels
+    "id_vessel":      CATEGORY,
+    "code_vessel":    CATEGORY,
+    "id_buoy":        CATEGORY,
+    "code_buoy":      CATEGORY,
+    "id_site":        CATEGORY,
+    "status":         CATEGORY,
+    "Status":         CATEGORY,
+    "reported_status": CATEGORY,
+    "user_status":    CATEGORY,
+    "account_status": CATEGORY,
+    "role":           CATEGORY,
+    "industry":       CATEGORY,
+    "region":         CATEGORY,
+    "anomaly_type":   CATEGORY,
+    # sensor readings (wire stays float64 so aggregates inside the repos keep precision)
+    "salinitas":      FLOAT32,
+    "turbidity":      FLOAT32,
+    "current":        FLOAT32,
+    "oxygen":         FLOAT32,
+    "tide":           FLOAT32,
+    "density":        FLOAT32,
+    # timestamps, parsed once here
+    "created_at":       UTC,
+    "latest_timestamp": UTC,
+    "last_update":      UTC,
+    "Last Update":      UTC,
+    "last_login":       UTC,
+    "changed_at":       UTC,
+}
+
+
+def _coerce(s: pd.Series, dtype: str) -> pd.Series:
+    if dtype == CATEGORY:
+        # always cast: a declared column has one dtype whatever the data (.cat, concat)
+        return s if isinstance(s.dtype, pd.CategoricalDtype) else s.astype(CATEGORY)
+    if dtype == UTC:
+        if isinstance(s.dtype, pd.DatetimeTZDtype):
+            return s if str(s.dtype.tz) == "UTC" else s.dt.tz_convert("UTC")
+        return pd.to_datetime(s, utc=True, errors="coerce", format="ISO8601")
+    return pd.to_numeric(s, errors="coerce").astype(dtype) if s.dtype != dtype else s
+
+
+def enforce(df: pd.DataFrame, dtypes: dict[str, str] | None = None) -> pd.DataFrame:
+    """Cast the columns of df that COLUMN_DTYPES (plus per-call overrides) knows about.
+
+    The registry is authoritative: a declared column always leaves with its dtype.
+    """
+    schema = {**COLUMN_DTYPES, **(dtypes or {})}
+    cols = {c: _coerce(df[c], schema[c]) for c in df.columns if c in schema}
+    return df.assign(**cols) if cols else df
+
+
+def typed(fn=None, **dtypes):
+    """Apply enforce() to a repo function's DataFrame result.
+
+    Sits directly on the function, under any cache decorator, so the cached value is
+    the typed one: ``@st.cache_data(...)`` / ``@typed`` / ``def get_x()``.
+    Keyword arguments add or override column dtypes for this function only.
+    """
+    def decorator(f):
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            out = f(*args, **kwargs)
+            return enforce(out, dtypes) if isinstance(out, pd.DataFrame) else out
+        return wrapper
+    return decorator(fn) if fn is not None else decorator
@@ -0,0 +1,67 @@
+"""db/singleflight.py — single-flight coalescing for cached repo functions"""
+from __future__ import annotations
+import functools
+import threading
+import time
+from dataclasses import dataclass, asdict
+
+_WAIT_TIMEOUT = 30.0   # followers stop waiting on a stuck leader after this many seconds
+
+
+@dataclass
+class FlightStats:
+    calls: int = 0
+    leaders: int = 0        # calls that actually ran the function
+    coalesced: int = 0      # calls that waited on an in-flight leader instead
+    wait_ms: float = 0.0    # total time followers spent waiting
+
+
+_lock = threading.Lock()
+_inflight: dict[str, threading.Event] = {}
+_stats: dict[str, FlightStats] = {}
+
+
+def coalesce(fn):
+    """Wrap an @st.cache_data function so only one call per cache key is in flight.
+
+    Followers wait for the leader, then read its freshly cached value (a cache hit).
+    Apply outside the cache decorator: ``@coalesce`` above ``@st.cache_data``.
+    """
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn, updated=())
+    def wrapper(*args, **kwargs):
+        key = name if not (args or kwargs) else f"{name}{args!r}{sorted(kwargs.items())!r}"
+        with _lock:
+            stats = _stats.setdefault(key, FlightStats())
+            stats.calls += 1
+            event  = _inflight.get(key)
+            leader = event is None
+            if leader:
+                event = _inflight[key] = threading.Event()
+                stats.leaders += 1
+            else:
+                stats.coalesced += 1
+        if leader:
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with _lock:
+                    _inflight.pop(key, None)
+                event.set()
+        t0 = time.perf_counter()
+        event.wait(_WAIT_TIMEOUT)
+        with _lock:
+            stats.wait_ms += (time.perf_counter() - t0) * 1000
+        return fn(*args, **kwargs)
+
+    if hasattr(fn, "clear"):
+        wrapper.clear = fn.clear
+    return wrapper
+
+
+def flight_stats() -> list[dict]:
+    """Per-key coalescing counters, busiest first."""
+    with _lock:
+        rows = [{"key": k, **asdict(v)} for k, v in _stats.items()]
+    return sorted(rows, key=lambda r: r["calls"], reverse=True)
@@ -0,0 +1,79 @@
+"""db/swr.py — stale-while-revalidate cache for slow repo queries"""
+from __future__ import annotations
+import copy
+import functools
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from db.invalidation import generation
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "refreshing")
+
+    def __init__(self, value, fetched_at: float):
+        self.value      = value
+        self.fetched_at = fetched_at
+        self.refreshing = False
+
+
+def swr(ttl: float, max_stale: float):
+    """Serve the last good value after soft expiry (ttl) and refresh it in the background.
+
+    Past max_stale seconds the value is too old to serve and the caller waits for a
+    fresh fetch. Callers get a copy; ``fn.as_of(*args)`` returns the UTC fetch time.
+    """
+    def decorator(fn):
+        entries: dict[tuple, _Entry] = {}
+        lock = threading.Lock()
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        def _key(args, kwargs) -> tuple:
+            return args, tuple(sorted(kwargs.items()))
+
+        def _fetch(key, args, kwargs):
+            gen   = generation(name)
+            value = fn(*args, **kwargs)
+            with lock:
+                if generation(name) == gen:       # else a write landed mid-fetch; don't keep it
+                    entries[key] = _Entry(value, time.time())
+            return value
+
+        def _refresh(key, args, kwargs):
+            try:
+                _fetch(key, args, kwargs)
+            except Exception as e:
+                logger.error("swr refresh %s gagal: %s", fn.__qualname__, e)
+                with lock:
+                    if key in entries:
+                        entries[key].refreshing = False
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = _key(args, kwargs)
+            with lock:
+                entry = entries.get(key)
+                age   = time.time() - entry.fetched_at if entry else None
+                if entry is not None and ttl <= age < max_stale and not entry.refreshing:
+                    entry.refreshing = True
+                    threading.Thread(target=_refresh, args=(key, args, kwargs),
+                                     name=f"swr-{fn.__name__}", daemon=True).start()
+            if entry is None or age >= max_stale:
+                return copy.deepcopy(_fetch(key, args, kwargs))
+            return copy.deepcopy(entry.value)
+
+        def as_of(*args, **kwargs) -> datetime | None:
+            entry = entries.get(_key(args, kwargs))
+            return datetime.fromtimestamp(entry.fetched_at, timezone.utc) if entry else None
+
+        def clear():
+            with lock:
+                entries.clear()
+
+        wrapper.as_of = as_of
+        wrapper.clear = clear
+        return wrapper
+    return decorator
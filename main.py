@@ -20,21 +20,12 @@ st.set_page_config(
 )
 
 # ── Imports ───────────────────────────────────────────────────────────────────
+# Views are not imported here: core.pages loads each one on its first visit.
 from core.views.auth        import render_login_page
-from core.views.monitoring  import render_monitoring_view
-from core.views.analytics   import render_analytics_page
-from core.views.clients     import render_clients_page
-from core.views.admin       import render_admin_page
-from core.views.client_portal import render_client_portal
-from core.views.environment import render_environment_page
-from core.views.survey      import render_survey_page
-from core.views.alerts      import render_alerts_page
-from core.views.voyage      import render_voyage_page
-from core.views.maintenance import render_maintenance_page
-from core.views.kpi_dashboard import render_kpi_dashboard
-from core.ui.maps           import render_map_content
+from core.pages             import render_page
 from core.config            import inject_custom_css
 from core.ui.layout         import sidebar_nav, transition_loader, close_loader
+from core.services.warmup   import start_warmer
 
 # ── Inject global CSS ─────────────────────────────────────────────────────────
 try:
@@ -42,6 +33,9 @@ try:
 except Exception as e:
     logger.error("Gagal memuat gaya: %s", e)
 
+# ── Cache warm-up (once per process, background threads) ─────────────────────
+start_warmer()
+
 # ── Session state defaults ────────────────────────────────────────────────────
 _DEFAULTS = {
     "logged_in":    False,
@@ -61,18 +55,7 @@ def main_app():
     page = st.session_state.current_page
     loader_placeholder, should_show_loader = transition_loader(page)
     try:
-        if   page == "🏠 Monitoring":   render_monitoring_view()
-        elif page == "🌊 Lingkungan":   render_environment_page()
-        elif page == "🗺️ Peta Kapal":  render_map_content()
-        elif page == "📈 Analitik":     render_analytics_page()
-        elif page == "👥 Klien":        render_clients_page()
-        elif page == "👨‍💼 Admin":      render_admin_page()
-        elif page == "📋 Survey":       render_survey_page()
-        elif page == "🔔 Alert":        render_alerts_page()
-        elif page == "🗓️ Voyage":      render_voyage_page()
-        elif page == "🛠️ Maintenance": render_maintenance_page()
-        elif page == "📊 KPI":          render_kpi_dashboard()
-        elif page == "🌐 Portal Klien": render_client_portal()
+        render_page(page)
     except Exception as e:
         logger.error(f"Halaman gagal dimuat", exc_info=e)
         st.error("⚠️ Maaf, halaman tidak dapat dimuat saat ini. Sila coba lagi nanti atau hubungi dukungan teknis.", icon="🚨")
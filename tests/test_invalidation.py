@@ -0,0 +1,28 @@
+"""tests/test_invalidation.py — reads() registry and demand tracking"""
+from db.invalidation import invalidate, last_requested, reads
+
+
+def test_kwarg_call_is_seen_by_last_requested():
+    @reads("test.kwarg_table")
+    def fetch(days, limit=10):
+        return days * limit
+
+    name = f"{fetch.__module__}.{fetch.__qualname__}"
+    assert fetch(7, limit=5) == 35
+    assert last_requested(name, (7,), {"limit": 5}) is not None
+    assert last_requested(name, (7,), {"limit": 6}) is None
+
+
+def test_clear_reaches_the_cache_layers():
+    calls = []
+
+    def inner(x):
+        calls.append(x)
+        return x
+    inner.clear = lambda: calls.append("cleared")
+
+    fetch = reads("test.clear_table")(inner)
+    fetch.clear()
+    assert calls == ["cleared"]
+    assert invalidate("test.clear_table") == [f"{inner.__module__}.{inner.__qualname__}"]
+    assert calls == ["cleared", "cleared"]
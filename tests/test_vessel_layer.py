@@ -0,0 +1,25 @@
+"""tests/test_vessel_layer.py — GeoJSON vessel layer of the bathymetric map"""
+import pandas as pd
+from core.services.weather import fleet_weather
+from core.ui.vessel_layer import vessel_features, vessel_layer
+
+
+def test_no_valid_position_gives_empty_collection():
+    df = pd.DataFrame({"code_vessel": ["KM-01", "KM-02"], "latitude": [None, None],
+                       "longitude": [None, None], "heading": [90, None]})
+    assert vessel_features(df) == {"type": "FeatureCollection", "features": []}
+    vessel_layer(df, "⛏️ Kapal Keruk (Dredger)")           # builds without raising
+
+
+def test_fleet_weather_without_cells_keeps_columns():
+    wx = fleet_weather(pd.Series([], dtype="float64"), pd.Series([], dtype="float64"))
+    assert wx.empty and {"icon", "condition", "temperature", "wave_height", "wind_speed"} <= set(wx.columns)
+
+
+def test_rows_without_position_are_left_out():
+    df = pd.DataFrame({"code_vessel": ["KM-01", "KM-02"], "latitude": [-1.5, None],
+                       "longitude": [108.8, 108.9], "heading": [370, 45]})
+    features = vessel_features(df)["features"]
+    assert [f["properties"]["id"] for f in features] == ["KM-01"]
+    assert features[0]["properties"]["hdg"] == 10
+    assert features[0]["geometry"]["coordinates"] == [108.8, -1.5]